@@ -0,0 +1,162 @@
+"""Local fixture web server for the crawl benchmarks.
+
+Serves small synthetic sites that exercise every crawl path, generated in
+memory so the benchmark needs no network access and no checked-in HTML:
+
+* ``/static/``      — server-rendered docs site (index + 12 linked pages)
+* ``/spa/``         — empty ``<div id="root">`` shell rendered by JavaScript
+* ``/lazy/``        — infinite scroll: content is appended as the page scrolls
+* ``/slow/``        — responds after a 2 s delay
+* ``/never-idle/``  — polls the server every 200 ms, so ``networkidle`` never settles
+* ``/large/``       — ~1.5 MB of text
+* ``/dup/a``, ``/dup/b``, ``/dup/print`` — the same article under three URLs
+
+Example:
+    >>> with FixtureServer() as server:
+    ...     print(server.url("/static/"))
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+__all__ = ["FixtureServer", "SCENARIOS"]
+
+_WORDS = [
+    "crawler", "browser", "markdown", "latency", "throughput", "network", "cache",
+    "request", "page", "document", "content", "server", "client", "async", "event",
+    "loop", "memory", "process", "thread", "parser", "token", "budget", "summary",
+    "chunk", "index", "sitemap", "frontier", "scheduler",
+]
+
+
+def _paragraphs(seed: int, count: int, words: int = 80) -> str:
+    rng = random.Random(seed)
+    return "\n".join(
+        f"<p>{' '.join(rng.choice(_WORDS) for _ in range(words))}.</p>" for _ in range(count)
+    )
+
+
+def _page(title: str, body: str, head: str = "") -> bytes:
+    return (
+        f"<!doctype html><html><head><title>{title}</title>{head}</head>"
+        f"<body><nav><a href='/static/'>Home</a></nav><main><h1>{title}</h1>{body}</main>"
+        f"<footer>Fixture site footer</footer></body></html>"
+    ).encode()
+
+
+_STATIC_PAGES = 12
+_ARTICLE = _paragraphs(99, 12)
+
+
+def _static(path: str) -> bytes | None:
+    if path in ("/static/", "/static/index.html"):
+        links = "".join(
+            f"<li><a href='/static/page-{i}.html'>Page {i}</a></li>" for i in range(_STATIC_PAGES)
+        )
+        return _page("Static docs", f"{_paragraphs(0, 3)}<ul>{links}</ul>")
+    for i in range(_STATIC_PAGES):
+        if path == f"/static/page-{i}.html":
+            return _page(f"Page {i}", _paragraphs(i + 1, 10))
+    return None
+
+
+_SPA = _page("SPA", "<div id='root'></div>", head=f"""<script>
+document.addEventListener('DOMContentLoaded', () => {{
+  setTimeout(() => {{
+    document.getElementById('root').innerHTML = {_paragraphs(7, 10)!r};
+  }}, 300);
+}});
+</script>""")
+
+_LAZY = _page("Lazy", "<div id='feed'></div>", head="""<script>
+let n = 0;
+function more() {
+  if (n >= 20) return;
+  const p = document.createElement('p');
+  p.textContent = 'Lazy item ' + (n++) + ': ' + 'scroll loaded content '.repeat(20);
+  document.getElementById('feed').appendChild(p);
+}
+document.addEventListener('DOMContentLoaded', () => { for (let i = 0; i < 3; i++) more(); });
+window.addEventListener('scroll', () => { for (let i = 0; i < 3; i++) more(); });
+</script>""")
+
+_NEVER_IDLE = _page("Never idle", _paragraphs(11, 8), head="""<script>
+setInterval(() => fetch('/ping?' + Date.now()), 200);
+</script>""")
+
+_LARGE = _page("Large", _paragraphs(13, 2_500))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args) -> None:  # keep benchmark output clean
+        pass
+
+    def do_GET(self) -> None:
+        path = self.path.split("?", 1)[0]
+        body: bytes | None
+        if path.startswith("/static/"):
+            body = _static(path)
+        elif path == "/spa/":
+            body = _SPA
+        elif path == "/lazy/":
+            body = _LAZY
+        elif path == "/slow/":
+            time.sleep(2)
+            body = _page("Slow", _paragraphs(17, 8))
+        elif path == "/never-idle/":
+            body = _NEVER_IDLE
+        elif path == "/ping":
+            body = b"ok"
+        elif path == "/large/":
+            body = _LARGE
+        elif path in ("/dup/a", "/dup/b", "/dup/print"):
+            body = _page("Syndicated article", _ARTICLE)
+        else:
+            body = None
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FixtureServer:
+    """Threaded HTTP server for the fixtures, bound to a free localhost port."""
+
+    def __init__(self) -> None:
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}{path}"
+
+    def __enter__(self) -> FixtureServer:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+#: Scenario name → paths fetched by ``scrape_many`` (``static_site`` is a deep crawl).
+SCENARIOS: dict[str, list[str]] = {
+    "static_site": ["/static/"],
+    "spa": ["/spa/"],
+    "lazy_scroll": ["/lazy/"],
+    "slow": ["/slow/"],
+    "never_idle": ["/never-idle/"],
+    "large": ["/large/"],
+    "duplicates": ["/dup/a", "/dup/b?ref=feed", "/dup/print"],
+    "mixed_batch": [
+        *(f"/static/page-{i}.html" for i in range(_STATIC_PAGES)),
+        "/spa/", "/lazy/", "/large/", "/dup/a", "/dup/b",
+    ],
+}
@@ -0,0 +1,256 @@
+"""Offline crawl benchmark — reproducible numbers against local fixture sites.
+
+Starts :class:`fixtures.FixtureServer` on localhost and crawls every scenario
+with the public API, with the crawl cache and LLM compression disabled so
+only fetching and extraction are measured.  For each scenario it records:
+
+* ``pages`` / ``pages_per_sec`` — pages returned and throughput;
+* ``latency_ms`` — p50 / p95 / p99 of single-page ``scrape_many`` calls;
+* ``browser_rss_mb`` — peak resident memory of the Chromium processes;
+* ``output_chars`` — size of the returned document.
+
+Results are written as JSON (with package version, git commit and machine
+info) so two releases can be diffed::
+
+    python benchmarks/run.py                     # → benchmarks/results/<version>-<commit>.json
+    python benchmarks/run.py --compare benchmarks/results/a.json benchmarks/results/b.json
+
+Options:
+    --repeat N      single-page latency samples per URL (default 3)
+    --only NAME     run one scenario (repeatable)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Measure crawling only: no on-disk caches, no LLM calls.
+os.environ["WEBSEARCH_CACHE"] = "0"
+os.environ["WEBSEARCH_LLM_CACHE"] = "0"
+os.environ["WEBSEARCH_COMPRESS_MODE"] = "extractive"
+os.environ.pop("WEBSEARCH_LLM_MODEL", None)
+
+_HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(_HERE.parent))
+
+from fixtures import SCENARIOS, FixtureServer  # noqa: E402
+
+import websearch_bot  # noqa: E402
+from websearch_bot import _crawl, _github, _llm  # noqa: E402
+from websearch_bot._crawl import scrape_many, scrape_website  # noqa: E402
+from websearch_bot._models import PROVIDER_ENV  # noqa: E402
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - psutil ships with crawl4ai
+    psutil = None
+
+# Large enough that nothing is ever compressed.
+_NO_COMPRESSION = 10**9
+
+
+async def _no_llm(*args, **kwargs) -> tuple[None, None]:
+    return None, None
+
+
+# Importing the package loads ``.env``, so keys are cleared only now; the
+# overview call sites are stubbed as well, in case a key comes back.
+for _key in ("GROQ_API_KEY", *PROVIDER_ENV.values()):
+    os.environ.pop(_key, None)
+for _module in (_llm, _crawl, _github):
+    _module.acall_llm = _no_llm  # type: ignore[attr-defined]
+
+
+# ---------------------------------------------------------------------------
+# Measurement helpers
+# ---------------------------------------------------------------------------
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def _browser_rss_mb() -> float:
+    """Resident memory of every Chromium process under this one, in MB."""
+    if psutil is None:
+        return 0.0
+    total = 0
+    for child in psutil.Process().children(recursive=True):
+        try:
+            if "chrom" in child.name().lower():
+                total += child.memory_info().rss
+        except psutil.Error:
+            continue
+    return total / 1024 / 1024
+
+
+class _RssSampler:
+    """Samples browser RSS every 250 ms in the background; keeps the peak."""
+
+    def __init__(self) -> None:
+        self.peak = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, _browser_rss_mb())
+            self._stop.wait(0.25)
+
+    def __enter__(self) -> _RssSampler:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def _count_pages(doc: str) -> int:
+    """Pages in *doc*: batch sources, or fixture page titles for a deep crawl."""
+    sources = doc.count("## Source:")
+    if sources:
+        return sources
+    return len(re.findall(r"^# (?:Static docs|Page \d+)\s*$", doc, re.MULTILINE))
+
+
+# ---------------------------------------------------------------------------
+# Scenarios
+# ---------------------------------------------------------------------------
+
+
+def run_scenario(server: FixtureServer, name: str, paths: list[str], repeat: int) -> dict:
+    urls = [server.url(p) for p in paths]
+    with _RssSampler() as rss:
+        start = time.perf_counter()
+        if name == "static_site":
+            doc = scrape_website(urls[0], max_pages=10, max_chars=_NO_COMPRESSION)
+        else:
+            doc = scrape_many(urls, max_chars=_NO_COMPRESSION)
+        pages = _count_pages(doc)
+        elapsed = time.perf_counter() - start
+
+        latencies: list[float] = []
+        for _ in range(repeat):
+            for url in urls:
+                t = time.perf_counter()
+                scrape_many([url], max_chars=_NO_COMPRESSION)
+                latencies.append((time.perf_counter() - t) * 1000)
+
+    return {
+        "urls": len(urls),
+        "pages": pages,
+        "seconds": round(elapsed, 3),
+        "pages_per_sec": round(pages / elapsed, 3) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50), 1),
+            "p95": round(_percentile(latencies, 95), 1),
+            "p99": round(_percentile(latencies, 99), 1),
+        },
+        "browser_rss_mb": round(rss.peak, 1),
+        "output_chars": len(doc),
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=_HERE,
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def run(only: list[str] | None, repeat: int) -> dict:
+    results: dict = {
+        "version": websearch_bot.__version__,
+        "commit": _git_commit(),
+        "date": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "scenarios": {},
+    }
+    with FixtureServer() as server:
+        for name, paths in SCENARIOS.items():
+            if only and name not in only:
+                continue
+            print(f"{name:<14}", end=" ", flush=True)
+            r = run_scenario(server, name, paths, repeat)
+            results["scenarios"][name] = r
+            print(
+                f"{r['pages']:>3} pages  {r['pages_per_sec']:>7.2f} p/s  "
+                f"p50 {r['latency_ms']['p50']:>7.0f} ms  p95 {r['latency_ms']['p95']:>7.0f} ms  "
+                f"rss {r['browser_rss_mb']:>6.0f} MB  {r['output_chars']:>9,} chars"
+            )
+    websearch_bot.close()
+    results["tier_stats"] = websearch_bot.fetch_tier_stats()
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Comparison
+# ---------------------------------------------------------------------------
+
+
+def compare(old_path: str, new_path: str) -> None:
+    """Print per-scenario deltas between two result files."""
+    old = json.loads(Path(old_path).read_text())
+    new = json.loads(Path(new_path).read_text())
+    print(f"{old['version']} ({old['commit']}) → {new['version']} ({new['commit']})")
+    metrics = (
+        ("pages_per_sec", lambda r: r["pages_per_sec"]),
+        ("p50_ms", lambda r: r["latency_ms"]["p50"]),
+        ("p95_ms", lambda r: r["latency_ms"]["p95"]),
+        ("rss_mb", lambda r: r["browser_rss_mb"]),
+        ("chars", lambda r: r["output_chars"]),
+    )
+    for name in new["scenarios"]:
+        if name not in old["scenarios"]:
+            continue
+        a, b = old["scenarios"][name], new["scenarios"][name]
+        cells = []
+        for label, get in metrics:
+            before, after = get(a), get(b)
+            change = f"{(after - before) / before * 100:+.0f}%" if before else "n/a"
+            cells.append(f"{label} {before}→{after} ({change})")
+        print(f"{name:<14} " + "  ".join(cells))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", help="write JSON results to this path")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", action="append")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+    results = run(args.only, args.repeat)
+    default = _HERE / "results" / f"{results['version']}-{results['commit']}.json"
+    out = Path(args.out) if args.out else default
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"results → {out}")
+
+
+if __name__ == "__main__":
+    main()
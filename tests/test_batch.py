@@ -0,0 +1,125 @@
+"""Tests for per-URL browser routing, retries and the per-source outcome table."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from crawl4ai import CrawlerRunConfig
+
+from websearch_bot import _crawl
+from websearch_bot._crawl import _async_crawl_many, _Crawl, _sources
+from websearch_bot._profiles import DomainProfile
+from websearch_bot._scrape import _BATCH
+
+GOOD, THIN, GONE = (f"https://{host}.example/page" for host in ("good", "thin", "gone"))
+_TEXT = "The scheduler keeps a per-host limit and adapts the global one. " * 6
+
+
+def _result(url: str, markdown: str = "", status: int = 200, error: str = "") -> SimpleNamespace:
+    return SimpleNamespace(
+        url=url, redirected_url=url, success=not error, status_code=status,
+        html=f"<html><body><p>{markdown}</p></body></html>", response_headers={},
+        markdown=SimpleNamespace(
+            fit_markdown=markdown, markdown_with_citations=markdown, raw_markdown=markdown
+        ),
+        error_message=error,
+    )
+
+
+class _Crawler:
+    """Serves canned results per ``(url, wait_until)``; ``http`` for the HTTP tier."""
+
+    def __init__(self, results: dict[tuple[str, str], SimpleNamespace], tier: str = "") -> None:
+        self.results = results
+        self.tier = tier
+        self.calls: list[tuple[str, str]] = []
+
+    async def arun(self, url: str, config: CrawlerRunConfig) -> SimpleNamespace:
+        key = (url, self.tier or config.wait_until)
+        self.calls.append(key)
+        return self.results[key]
+
+
+@pytest.fixture
+def crawlers(monkeypatch: pytest.MonkeyPatch) -> tuple[_Crawler, _Crawler, list[tuple]]:
+    results = {
+        (GOOD, "http"): _result(GOOD, _TEXT),
+        (THIN, "http"): _result(THIN, "Loading…"),
+        (THIN, "networkidle"): _result(THIN, error="timeout"),
+        (THIN, "domcontentloaded"): _result(THIN, _TEXT),
+        (GONE, "http"): _result(GONE, status=404),
+        (GONE, "networkidle"): _result(GONE, error="net::ERR_FAILED"),
+        (GONE, "domcontentloaded"): _result(GONE, error="net::ERR_ABORTED"),
+    }
+    http, browser = _Crawler(results, "http"), _Crawler(results)
+    attempts: list[tuple] = []
+
+    @asynccontextmanager
+    async def acquire():
+        yield browser
+
+    async def get_http() -> _Crawler:
+        return http
+
+    async def get_profile(url: str) -> DomainProfile:
+        return DomainProfile(url)
+
+    async def record(url: str, strategy: str, ok: bool, elapsed: float) -> None:
+        attempts.append((url, strategy, ok))
+
+    pool = SimpleNamespace(http=get_http, acquire=acquire)
+    monkeypatch.setattr(_crawl, "get_pool", lambda: pool)
+    monkeypatch.setattr(_crawl, "get_profile", get_profile)
+    monkeypatch.setattr(_crawl, "record_attempt", record)
+    monkeypatch.setattr(_crawl, "EXTRACT_WORKERS", 0)
+    return http, browser, attempts
+
+
+def _crawl_all() -> _Crawl:
+    return asyncio.run(_async_crawl_many([GOOD, THIN, GONE], CrawlerRunConfig(**_BATCH)))
+
+
+def test_only_escalated_pages_reach_the_browser(crawlers) -> None:
+    http, browser, _ = crawlers
+    crawl = _crawl_all()
+    assert sorted(http.calls) == sorted((u, "http") for u in (GOOD, THIN, GONE))
+    assert all(url != GOOD for url, _ in browser.calls)
+    assert [url for url, _ in crawl.pages] == [GOOD, THIN]
+
+
+def test_failed_route_is_retried_once_on_the_other(crawlers) -> None:
+    _, browser, attempts = crawlers
+    _crawl_all()
+    assert sorted(browser.calls) == sorted(
+        (u, route) for u in (THIN, GONE) for route in ("networkidle", "domcontentloaded")
+    )
+    assert (THIN, "networkidle", False) in attempts
+    assert (THIN, "domcontentloaded", True) in attempts
+
+
+def test_outcome_table(crawlers) -> None:
+    crawl = _crawl_all()
+    rows = {row["url"]: row for row in _sources([GOOD, THIN, GONE], crawl, set())}
+    assert {k: rows[GOOD][k] for k in ("status", "tier", "attempts", "code")} == {
+        "status": "ok", "tier": "http", "attempts": 1, "code": 200,
+    }
+    assert {k: rows[THIN][k] for k in ("status", "tier", "attempts")} == {
+        "status": "ok", "tier": "domcontentloaded", "attempts": 3,
+    }
+    assert {k: rows[GONE][k] for k in ("status", "tier", "attempts", "error")} == {
+        "status": "failed", "tier": "domcontentloaded", "attempts": 3,
+        "error": "net::ERR_ABORTED",
+    }
+
+
+def test_sources_marks_duplicates_and_filters_failures(crawlers) -> None:
+    crawl = _crawl_all()
+    missing = "https://never.example/"
+    rows = _sources([GOOD, THIN, GONE, missing], crawl, {THIN})
+    assert [row["status"] for row in rows] == ["ok", "duplicate", "failed", "failed"]
+    assert rows[-1]["error"] == "not fetched"
+    failures = _sources([GOOD, THIN, GONE, missing], crawl, {THIN}, failures_only=True)
+    assert [row["url"] for row in failures] == [GONE, missing]
@@ -0,0 +1,195 @@
+"""Tests for the on-disk crawl and LLM response caches."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from collections import Counter
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from websearch_bot import _cache, _llm
+from websearch_bot._cache import _CrawlCache, _LLMCache, _Store, model_family
+
+URL = "https://docs.example/guide"
+PAGES = [(URL, "# Guide\n\nInstall with pip.")]
+HEADERS = {URL: {"ETag": '"v1"', "Last-Modified": "Mon, 05 Oct 2026 10:00:00 GMT"}}
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> list[float]:
+    """Point the cache at a temp database and drive its clock by hand."""
+    now = [1_000_000.0]
+    monkeypatch.setattr(_cache, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(_cache, "_DB_PATH", tmp_path / "cache.sqlite3")
+    monkeypatch.setattr(_cache, "time", SimpleNamespace(time=lambda: now[0]))
+    monkeypatch.setattr(_cache, "ENABLED", True)
+    monkeypatch.setattr(_cache, "DEFAULT_TTL", 60.0)
+    monkeypatch.setattr(_cache, "_DOMAIN_TTLS", {})
+    monkeypatch.setattr(_cache, "_not_modified", lambda url, validators: False)
+    return now
+
+
+@pytest.fixture
+def cache(clock: list[float]) -> _CrawlCache:
+    return _CrawlCache(_Store("crawl", 1 << 20))
+
+
+def _get(cache: _CrawlCache, url: str = URL, options: dict | None = None) -> tuple:
+    counts: Counter[str] = Counter()
+    pages = asyncio.run(cache.aget(url, options or {}, counts))
+    return pages, dict(counts)
+
+
+def _put(cache: _CrawlCache, headers: dict | None = None) -> None:
+    asyncio.run(cache.aput(URL, {}, PAGES, HEADERS if headers is None else headers))
+
+
+def test_key_normalizes_url_and_tracks_options() -> None:
+    key = _CrawlCache.key
+    assert key("HTTPS://Docs.Example:443/guide?utm_source=x#top", {}) == key(URL, {})
+    assert key(URL, {"css_selector": "main"}) != key(URL, {})
+    assert key(URL, {"css_selector": None}) == key(URL, {})
+
+
+def test_fresh_entry_is_a_hit(cache: _CrawlCache, clock: list[float]) -> None:
+    assert _get(cache) == (None, {"misses": 1})
+    _put(cache)
+    clock[0] += 59
+    assert _get(cache) == (PAGES, {"hits": 1})
+    assert _get(cache, options={"css_selector": "main"})[0] is None
+
+
+def test_domain_ttl_overrides_default(cache: _CrawlCache, clock: list[float]) -> None:
+    _cache.set_domain_ttl("example", 600)
+    _put(cache)
+    clock[0] += 300
+    assert _get(cache)[1] == {"hits": 1}
+    clock[0] += 400
+    assert _get(cache)[1] == {"misses": 1}
+
+
+def test_stale_entry_revalidated_when_not_modified(
+    cache: _CrawlCache, clock: list[float], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    sent: list[dict] = []
+    monkeypatch.setattr(_cache, "_not_modified", lambda url, v: sent.append(v) or True)
+    _put(cache)
+    clock[0] += 120
+    assert _get(cache) == (PAGES, {"revalidated": 1})
+    assert sent == [{"etag": '"v1"', "last_modified": "Mon, 05 Oct 2026 10:00:00 GMT"}]
+    # Revalidation restarts the freshness clock.
+    clock[0] += 30
+    assert _get(cache)[1] == {"hits": 1}
+
+
+def test_stale_entry_missed_when_modified(cache: _CrawlCache, clock: list[float]) -> None:
+    _put(cache)
+    clock[0] += 120
+    assert _get(cache) == (None, {"misses": 1})
+
+
+def test_stale_entry_without_validators_is_a_miss(
+    cache: _CrawlCache, clock: list[float], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def fail(url: str, validators: dict) -> bool:
+        raise AssertionError("no validators, nothing to revalidate")
+
+    monkeypatch.setattr(_cache, "_not_modified", fail)
+    _put(cache, headers={})
+    clock[0] += 120
+    assert _get(cache) == (None, {"misses": 1})
+
+
+def test_store_evicts_least_recently_used(clock: list[float]) -> None:
+    store = _Store("lru", max_bytes=100)
+    store.put("a", "x" * 40)
+    clock[0] += 1
+    store.put("b", "x" * 40)
+    clock[0] += 1
+    assert store.get("a") is not None  # "b" is now the least recently used
+    clock[0] += 1
+    store.put("c", "x" * 40)
+    assert store.get("b") is None
+    assert store.get("a") is not None and store.get("c") is not None
+
+
+KIMI = "groq/moonshotai/kimi-k2-instruct-0905"
+LLAMA = "groq/llama-3.3-70b-versatile"
+
+
+@pytest.fixture
+def llm_cache(clock: list[float], monkeypatch: pytest.MonkeyPatch) -> _LLMCache:
+    monkeypatch.setattr(_cache, "LLM_ENABLED", True)
+    monkeypatch.setattr(_cache, "LLM_TTL", 3600.0)
+    return _LLMCache(_Store("llm", 1 << 20))
+
+
+def _ask(cache: _LLMCache, families: list[str], user: str = "Summarize this.") -> tuple | None:
+    return asyncio.run(cache.aget("system", user, 256, families))
+
+
+def test_model_family_drops_version_tags() -> None:
+    assert model_family(KIMI) == "groq/moonshotai/kimi-k2-instruct"
+    assert model_family("anthropic/claude-haiku-4-5-20251001") == "anthropic/claude-haiku-4-5"
+    assert model_family(LLAMA) == LLAMA
+
+
+def test_llm_key_covers_prompt_tokens_and_family() -> None:
+    key = _LLMCache.key("system", "user", 256, "groq/a")
+    assert key == _LLMCache.key("system", "user", 256, "groq/a")
+    others = [("other", "user", 256, "groq/a"), ("system", "other", 256, "groq/a"),
+              ("system", "user", 512, "groq/a"), ("system", "user", 256, "groq/b")]
+    assert all(_LLMCache.key(*args) != key for args in others)
+
+
+def test_llm_answer_found_under_its_family(llm_cache: _LLMCache) -> None:
+    asyncio.run(llm_cache.aput(
+        "system", "Summarize this.", 256, model_family(KIMI), "Summary.", KIMI
+    ))
+    families = [model_family(LLAMA), model_family(KIMI)]
+    assert _ask(llm_cache, families) == ("Summary.", KIMI)
+    assert _ask(llm_cache, [model_family(LLAMA)]) is None
+    assert _ask(llm_cache, families, user="Something else.") is None
+    assert dict(llm_cache.stats) == {"hits": 1, "misses": 2, "saved_chars": 15}
+
+
+def test_llm_answer_expires(llm_cache: _LLMCache, clock: list[float]) -> None:
+    asyncio.run(llm_cache.aput("system", "Summarize this.", 256, LLAMA, "Summary.", LLAMA))
+    clock[0] += 3599
+    assert _ask(llm_cache, [LLAMA]) is not None
+    clock[0] += 2
+    assert _ask(llm_cache, [LLAMA]) is None
+
+
+def test_llm_cache_evicts_oldest_answers(clock: list[float], monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_cache, "LLM_ENABLED", True)
+    cache = _LLMCache(_Store("llm_small", max_bytes=100))
+    for i in range(3):
+        clock[0] += 1
+        asyncio.run(cache.aput("system", f"chunk {i}", 256, LLAMA, "x" * 40, LLAMA))
+    assert _ask(cache, [LLAMA], user="chunk 0") is None
+    assert _ask(cache, [LLAMA], user="chunk 2") is not None
+
+
+def test_llm_cache_stats_hit_rate(llm_cache: _LLMCache, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_cache, "LLM_CACHE", llm_cache)
+    assert _cache.llm_cache_stats() == {"hit_rate": 0.0}
+    asyncio.run(llm_cache.aput("system", "Summarize this.", 256, LLAMA, "Summary.", LLAMA))
+    for _ in range(3):
+        _ask(llm_cache, [LLAMA])
+    _ask(llm_cache, [LLAMA], user="Something else.")
+    assert _cache.llm_cache_stats()["hit_rate"] == 0.75
+
+
+def test_cached_answer_skips_the_network(
+    llm_cache: _LLMCache, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(_llm, "LLM_CACHE", llm_cache)
+    monkeypatch.setattr(_llm, "_candidate_models", lambda: [LLAMA])
+    asyncio.run(llm_cache.aput("system", "Summarize this.", 256, LLAMA, "Summary.", LLAMA))
+    monkeypatch.setitem(sys.modules, "litellm", None)  # any network path fails to import
+    answer = asyncio.run(_llm.acall_llm("system", "Summarize this.", max_tokens=256))
+    assert answer == ("Summary.", LLAMA)
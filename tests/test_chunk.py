@@ -0,0 +1,46 @@
+"""Tests for structure-aware Markdown chunking."""
+
+from __future__ import annotations
+
+import re
+
+from websearch_bot._chunk import count_tokens, headings, split_markdown
+
+_FENCE_RE = re.compile(r"^\s{0,3}(`{3,}|~{3,})", re.MULTILINE)
+
+
+def _doc(sections: int) -> str:
+    prose = "The crawler fetches pages over HTTP first and escalates when needed. " * 15
+    return "".join(f"## Section {i}\n\n{prose}\n\n" for i in range(sections))
+
+
+def test_chunks_fit_and_rejoin() -> None:
+    text = _doc(20)
+    chunks = split_markdown(text, 400)
+    assert len(chunks) > 1
+    assert all(count_tokens(c) <= 400 for c in chunks)
+    assert "".join(chunks) == text
+
+
+def test_splits_at_headings() -> None:
+    chunks = split_markdown(_doc(20), 400)
+    assert all(c.startswith("## Section") for c in chunks)
+
+
+def test_oversized_code_block_is_reopened() -> None:
+    code = "```python\n" + "".join(f"value_{i} = {i}\n" for i in range(400)) + "```\n"
+    chunks = split_markdown(f"Intro.\n\n{code}", 300)
+    assert len(chunks) > 2
+    for chunk in chunks:
+        assert len(_FENCE_RE.findall(chunk)) % 2 == 0
+    assert all(c.lstrip().startswith(("Intro", "```python")) for c in chunks)
+
+
+def test_headings_skip_code() -> None:
+    text = "# Title\n\ntext\n\n```\n# not a heading\n```\n\n## Sub\n"
+    assert headings(text) == ["# Title", "## Sub"]
+
+
+def test_empty_text() -> None:
+    assert split_markdown("", 100) == []
+    assert split_markdown("   \n\n", 100) == []
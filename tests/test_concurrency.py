@@ -0,0 +1,54 @@
+"""Tests for sizing LLM fan-out from the models' rate limits and latency."""
+
+from __future__ import annotations
+
+import pytest
+
+from websearch_bot import _llm
+from websearch_bot._health import HealthRegistry
+from websearch_bot._llm import llm_concurrency
+from websearch_bot._ratelimit import RateLimiter
+
+SLOW = "groq/llama-3.3-70b-versatile"   # 30 RPM
+FAST = "groq/llama-3.1-8b-instant"      # 60 RPM, 60 K TPM
+PAID = "anthropic/claude-haiku-4-5"     # no published limits
+
+
+@pytest.fixture
+def health(monkeypatch: pytest.MonkeyPatch) -> HealthRegistry:
+    fresh = HealthRegistry()
+    monkeypatch.setattr(_llm, "HEALTH", fresh)
+    monkeypatch.setattr(_llm, "LIMITER", RateLimiter({
+        SLOW: {"rpm": 30, "tpm": 1_000_000},
+        FAST: {"rpm": 60, "tpm": 60_000},
+    }))
+    monkeypatch.setattr(_llm, "MAX_CONCURRENCY", 16)
+    monkeypatch.setattr(_llm, "_candidate_models", lambda: [SLOW, FAST])
+    return fresh
+
+
+def test_sums_rate_times_latency(health: HealthRegistry) -> None:
+    # 30/min and 60/min at the default 5 s latency: 2.5 + 5 calls in flight.
+    assert llm_concurrency(1_000) == 7
+
+
+def test_token_budget_caps_large_calls(health: HealthRegistry) -> None:
+    # 6 K-token calls: FAST's 60 K TPM allows only 10/min (0.83 in flight).
+    assert llm_concurrency(6_000) == 3
+
+
+def test_uses_observed_latency(health: HealthRegistry) -> None:
+    health.record(FAST, True, 1.0)
+    assert llm_concurrency(1_000) == 3  # 2.5 + 60/min at 1 s
+
+
+def test_open_circuit_is_not_counted(health: HealthRegistry) -> None:
+    health.record(SLOW, False, 1.0, retry_after=60.0)
+    assert llm_concurrency(1_000) == 5  # FAST alone
+
+
+def test_clamped_to_bounds(health: HealthRegistry, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_llm, "_candidate_models", lambda: [SLOW, FAST, PAID, PAID + "-2"])
+    assert llm_concurrency(1_000) == 16  # 7.5 + two unlimited models × 8
+    monkeypatch.setattr(_llm, "_candidate_models", lambda: [SLOW])
+    assert llm_concurrency(100_000) == 2  # 10 calls/min at 5 s is under one
@@ -0,0 +1,94 @@
+"""Tests for near-duplicate elimination and boilerplate stripping."""
+
+from __future__ import annotations
+
+from websearch_bot._dedup import Deduper, simhash, strip_boilerplate
+
+
+def _article(topic: str) -> str:
+    return " ".join(
+        f"The {topic} guide explains step {i} of the setup and why it matters here."
+        for i in range(8)
+    )
+
+
+def test_simhash_is_stable_and_close_for_near_copies() -> None:
+    text = _article("install")
+    assert simhash(text) == simhash(text)
+    near = text.replace("step 7", "step seven")
+    assert bin(simhash(text) ^ simhash(near)).count("1") <= 3
+
+
+def test_drops_near_duplicate_page() -> None:
+    deduper = Deduper()
+    text = _article("install")
+    assert deduper.add(text) == text
+    assert deduper.add(text + " Updated.") is None
+    assert deduper.add(_article("deploy")) is not None
+    assert deduper.stats()["duplicates_removed"] == 1
+
+
+def test_removes_repeated_blocks_keeps_first() -> None:
+    shared = "Shared notice. " * 20
+    deduper = Deduper()
+    first = deduper.add(f"{_article('install')}\n\n{shared}\n")
+    second = deduper.add(f"{_article('monitor')}\n\n{shared}\n")
+    assert first is not None and shared in first
+    assert second is not None and shared not in second
+    assert deduper.stats()["dedup_saved_chars"] >= len(shared)
+
+
+def test_page_of_only_seen_blocks_is_duplicate() -> None:
+    block = "Repeated paragraph text. " * 10
+    deduper = Deduper()
+    deduper.add(f"Intro.\n\n{block}\n")
+    assert deduper.add(f"{block}\n") is None
+
+
+def test_short_pages_are_never_near_duplicates() -> None:
+    deduper = Deduper()
+    assert deduper.add("Hello there.") == "Hello there."
+    assert deduper.add("Hello there.") == "Hello there."
+
+
+def test_code_fence_kept_whole() -> None:
+    code = "```python\n" + "x = 1\n\n" * 40 + "```\n"
+    deduper = Deduper()
+    deduper.add(f"Intro one.\n\n{code}")
+    second = deduper.add(f"Intro two.\n\n{code}")
+    assert second is not None and second.count("```") in (0, 2)
+
+
+_SIDEBAR = "Docs home · Guides · API reference · Changelog · [Edit this page](https://x/edit/1)"
+
+
+def _site(n: int) -> list[tuple[str, str]]:
+    return [
+        (
+            f"https://docs.example/{i}",
+            f"# Page {i}\n\n{_article(f'topic{i}')}\n\n"
+            f"{_SIDEBAR.replace('/1)', f'/{i})')}\n\n"
+            "```\npip install example\n```\n",
+        )
+        for i in range(n)
+    ]
+
+
+def test_boilerplate_kept_on_first_page_only() -> None:
+    pages, saved = strip_boilerplate(_site(6))
+    assert len(pages) == 6
+    assert "Docs home" in pages[0][1]
+    assert all("Docs home" not in md for _, md in pages[1:])
+    assert saved > 0
+
+
+def test_boilerplate_never_strips_headings_or_code() -> None:
+    pages, _ = strip_boilerplate(_site(6))
+    for i, (_, md) in enumerate(pages):
+        assert f"# Page {i}" in md
+        assert "pip install example" in md
+
+
+def test_boilerplate_needs_enough_pages() -> None:
+    site = _site(4)
+    assert strip_boilerplate(site) == (site, 0)
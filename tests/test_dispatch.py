@@ -0,0 +1,50 @@
+"""Tests for spreading map-reduce calls across the model pool."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from websearch_bot import _dispatch
+from websearch_bot._dispatch import aassign, assign
+from websearch_bot._ratelimit import RateLimiter
+
+LLAMA = "groq/llama-3.3-70b-versatile"
+SCOUT = "groq/meta-llama/llama-4-scout-17b-16e-instruct"
+ALLAM = "groq/allam-2-7b"  # 4 K context, 6 K TPM
+
+
+@pytest.fixture(autouse=True)
+def limiter(monkeypatch: pytest.MonkeyPatch) -> RateLimiter:
+    fresh = RateLimiter({
+        LLAMA: {"rpm": 30, "tpm": 12_000},
+        SCOUT: {"rpm": 30, "tpm": 30_000},
+        ALLAM: {"rpm": 30, "tpm": 6_000},
+    })
+    monkeypatch.setattr(_dispatch, "LIMITER", fresh)
+    return fresh
+
+
+def test_prefers_chain_order_then_spreads() -> None:
+    assert assign([LLAMA, SCOUT], [5_000] * 4) == [LLAMA, LLAMA, SCOUT, SCOUT]
+
+
+def test_context_window_excludes_model() -> None:
+    # 5 K tokens fit allam's TPM but not its 4 K context window.
+    assert assign([ALLAM, LLAMA], [5_000]) == [LLAMA]
+    assert assign([ALLAM, LLAMA], [3_000]) == [ALLAM]
+
+
+def test_no_model_fits() -> None:
+    assert assign([ALLAM], [5_000]) == [None]
+
+
+def test_respects_current_levels(limiter: RateLimiter) -> None:
+    limiter.try_acquire([LLAMA], 11_000)
+    assert assign([LLAMA, SCOUT], [5_000]) == [SCOUT]
+
+
+def test_aassign_matches_assign() -> None:
+    requests = [5_000, 2_000, 8_000, 1_000]
+    assert asyncio.run(aassign([LLAMA, SCOUT], requests)) == assign([LLAMA, SCOUT], requests)
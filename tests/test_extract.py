@@ -0,0 +1,75 @@
+"""Worker-pool extraction must match crawl4ai's in-loop extraction."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from crawl4ai import CrawlerRunConfig
+
+from websearch_bot import _extract, _http
+from websearch_bot._crawl import _extract_markdown
+from websearch_bot._scrape import _BASE, _BATCH
+
+_PARAGRAPH = (
+    "<p>The scheduler keeps a per-host limit and adapts the global one to latency, "
+    "so slow hosts never hold back the rest of the batch. See the "
+    "<a href='/guide/limits.html'>limits guide</a> for details.</p>"
+)
+_HTML = (
+    "<!doctype html><html><head><title>Fixture</title></head><body>"
+    "<header><a href='/'>Home</a></header><nav><a href='/a'>A</a> <a href='/b'>B</a></nav>"
+    f"<main><h1>Scheduling</h1>{_PARAGRAPH * 6}<div class='note'>{_PARAGRAPH}</div>"
+    "<form><input name='q'></form></main>"
+    f"<aside>{_PARAGRAPH}</aside><footer>Footer text for the fixture page.</footer>"
+    "</body></html>"
+).encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:  # noqa: N802
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(_HTML)))
+        self.end_headers()
+        self.wfile.write(_HTML)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture(scope="module")
+def url() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/docs/page.html"
+    server.shutdown()
+    _extract.shutdown()
+
+
+async def _both(url: str, config: CrawlerRunConfig) -> tuple[str, str]:
+    crawler = _http.make_crawler()
+    await crawler.start()
+    try:
+        in_loop = await crawler.arun(url, config=config)
+        fetched = await crawler.arun(url, config=_extract.passthrough(config))
+    finally:
+        await crawler.close()
+    options = {**_extract.scrape_options(config), "redirected_url": fetched.redirected_url}
+    pooled, _ = await _extract.aextract(url, fetched.html or "", options)
+    return _extract_markdown(in_loop), pooled
+
+
+@pytest.mark.parametrize("overrides", [
+    {**_BATCH},
+    {**_BASE},
+    {**_BATCH, "css_selector": "main"},
+    {**_BASE, "excluded_tags": ["aside", "form"], "excluded_selector": ".note"},
+])
+def test_pool_matches_in_loop(url: str, overrides: dict) -> None:
+    in_loop, pooled = asyncio.run(_both(url, CrawlerRunConfig(**overrides)))
+    assert in_loop.strip()
+    assert pooled == in_loop
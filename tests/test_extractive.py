@@ -0,0 +1,67 @@
+"""Tests for the local extractive compressor."""
+
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from websearch_bot._extractive import extract, query_terms, relevance
+
+pytest.importorskip("numpy")  # without it extract() returns the text unchanged
+
+_FENCE_RE = re.compile(r"^\s{0,3}(`{3,}|~{3,})", re.MULTILINE)
+
+
+def _page(i: int) -> str:
+    prose = " ".join(
+        f"Sentence {i}.{k} explains the install step in detail. Another follows it here."
+        for k in range(6)
+    )
+    return (
+        f"## Section {i}\n\n{prose}\n\n"
+        f"Install it like this:\n```python\nx = 1. y = 2. z = 3.\nprint(x. y)\n```\n\n"
+        f"Then run it. It should work. Check the output.\n"
+        f"~~~\nlong = {i}. other = {i}.\n\nblank line inside. still code.\n~~~\n\n"
+    )
+
+
+def test_fences_stay_balanced() -> None:
+    text = "".join(_page(i) for i in range(40))
+    for budget in (len(text) // 2, len(text) // 5, len(text) // 20):
+        out = extract(text, budget)
+        assert len(_FENCE_RE.findall(out)) % 2 == 0
+
+
+def test_code_block_kept_whole() -> None:
+    text = "".join(_page(i) for i in range(40))
+    out = extract(text, len(text) // 3)
+    for block in re.findall(r"```python\n(.*?)```", out, re.DOTALL):
+        assert block == "x = 1. y = 2. z = 3.\nprint(x. y)\n"
+
+
+def test_fits_budget() -> None:
+    text = "".join(_page(i) for i in range(40))
+    assert len(extract(text, len(text) // 2)) <= len(text) // 2
+
+
+def test_short_text_unchanged() -> None:
+    assert extract("Short.\n", 100) == "Short.\n"
+
+
+def test_relevance_scores_matching_texts() -> None:
+    texts = [
+        "How to install crawl4ai with pip and run the installer.",
+        "The weather in Paris was mild this spring.",
+        "Installation notes: crawl4ai needs Playwright.",
+    ]
+    weights = relevance(texts, query_terms("install crawl4ai"))
+    assert max(weights) == 1.0
+    assert weights[1] == 0.0
+    assert weights[0] > 0 and weights[2] > 0
+
+
+def test_relevance_without_match_keeps_everything() -> None:
+    texts = ["Alpha beta gamma.", "Delta epsilon."]
+    assert relevance(texts, query_terms("install crawl4ai")) == [1.0, 1.0]
+    assert relevance(texts, []) == [1.0, 1.0]
@@ -0,0 +1,40 @@
+"""Tests for the LLM circuit breaker and health-aware ordering."""
+
+from __future__ import annotations
+
+from websearch_bot._health import HealthRegistry
+
+
+def test_opens_after_consecutive_failures() -> None:
+    health = HealthRegistry(cooldown=30)
+    for _ in range(2):
+        health.record("a", False, 1.0)
+    assert health.order(["a", "b"]) == ["b", "a"]  # degraded, still tried
+    health.record("a", False, 1.0)
+    assert health.order(["a", "b"]) == ["b"]
+    assert health.snapshot()["a"]["state"] == "open"
+
+
+def test_rate_limit_opens_at_once() -> None:
+    health = HealthRegistry()
+    health.record("a", False, 0.5, retry_after=10.0)
+    assert health.order(["a", "b"]) == ["b"]
+    assert 0 < health.snapshot()["a"]["retry_in_s"] <= 10
+
+
+def test_half_open_allows_one_probe() -> None:
+    health = HealthRegistry(cooldown=0)
+    health.record("a", False, 1.0, retry_after=0.0)  # opens, cooldown already over
+    assert health.order(["b", "a"]) == ["a", "b"]     # probe goes first
+    assert health.order(["b", "a"]) == ["b"]          # probe in flight
+    health.release(["a"])
+    assert health.order(["b", "a"]) == ["a", "b"]
+    health.record("a", True, 1.0)
+    assert health.snapshot()["a"]["state"] == "closed"
+
+
+def test_slow_model_is_tried_last() -> None:
+    health = HealthRegistry()
+    for model, latency in (("a", 10.0), ("b", 1.0), ("c", 1.2)):
+        health.record(model, True, latency)
+    assert health.order(["a", "b", "c"]) == ["b", "c", "a"]
@@ -0,0 +1,58 @@
+"""Tests for reduce-tree planning."""
+
+from __future__ import annotations
+
+from websearch_bot._plan import RATIO, fit_plan, plan_reduce
+
+
+def test_plan_levels() -> None:
+    plan = plan_reduce([6_000] * 66, budget_tokens=25_000, chunk_tokens=6_000)
+    assert [(level.nodes, level.target_tokens) for level in plan.levels] == [(66, 1500), (17, 1363)]
+    assert [level.final for level in plan.levels] == [False, True]
+    assert plan.calls == 83
+
+
+def test_gentle_single_pass() -> None:
+    # Twice the budget: one final level, not a full-ratio squeeze.
+    plan = plan_reduce([4_000] * 5, budget_tokens=10_000, chunk_tokens=4_000)
+    assert len(plan.levels) == 1 and plan.levels[0].final
+    assert plan.levels[0].target_tokens > 4_000 // RATIO
+
+
+def test_within_budget_needs_no_calls() -> None:
+    assert plan_reduce([1_000] * 3, budget_tokens=5_000, chunk_tokens=4_000).calls == 0
+
+
+def test_fit_plan_tries_larger_chunks() -> None:
+    tried: list[int] = []
+
+    def leaves(size: int) -> list[int]:
+        tried.append(size)
+        return [size] * (240_000 // size)
+
+    plan = fit_plan(leaves, 10_000, [2_000, 8_000], concurrency=4, latency=1.0, max_calls=60)
+    assert tried == [2_000, 8_000]
+    assert plan.chunk_tokens == 8_000 and not plan.degraded
+    assert plan.calls <= 60
+
+
+def test_fit_plan_degrades_then_refuses() -> None:
+    def leaves(size: int) -> list[int]:
+        return [size] * 100
+
+    degraded = fit_plan(leaves, 1_000, [4_000], concurrency=4, latency=1.0, max_calls=120)
+    assert degraded.degraded and not degraded.refused
+    assert degraded.calls <= 120 and degraded.levels
+
+    refused = fit_plan(leaves, 1_000, [4_000], concurrency=4, latency=1.0, max_calls=50)
+    assert refused.refused and not refused.levels
+
+
+def test_fit_plan_time_budget() -> None:
+    def leaves(size: int) -> list[int]:
+        return [size] * 40
+
+    plan = fit_plan(
+        leaves, 100_000, [4_000], concurrency=10, latency=2.0, max_calls=0, max_seconds=5.0
+    )
+    assert plan.refused  # 40 calls in waves of 10 take 8 s
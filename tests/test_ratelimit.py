@@ -0,0 +1,59 @@
+"""Tests for the token-bucket rate limiter."""
+
+from __future__ import annotations
+
+import asyncio
+
+from websearch_bot._ratelimit import RateLimiter
+
+_LIMITS = {
+    "small": {"rpm": 2, "tpm": 1_000},
+    "big": {"rpm": 30, "tpm": 10_000},
+}
+
+
+def test_takes_first_model_with_budget() -> None:
+    limiter = RateLimiter(_LIMITS)
+    assert limiter.try_acquire(["small", "big"], 400) == ("small", 0.0)
+    assert limiter.try_acquire(["small", "big"], 400) == ("small", 0.0)
+    # small's two requests per minute are spent: the call is rerouted.
+    assert limiter.try_acquire(["small", "big"], 100) == ("big", 0.0)
+    assert limiter.stats["rerouted"] == 1
+
+
+def test_reports_shortest_wait_when_exhausted() -> None:
+    limiter = RateLimiter(_LIMITS)
+    assert limiter.try_acquire(["small"], 1_000)[0] == "small"
+    model, wait = limiter.try_acquire(["small"], 500)
+    assert model is None
+    assert 25 < wait <= 30  # 500 of 1000 TPM refill in half a minute
+
+
+def test_unlimited_models_always_pass() -> None:
+    limiter = RateLimiter(_LIMITS)
+    for _ in range(100):
+        assert limiter.try_acquire(["other"], 10**6) == ("other", 0.0)
+
+
+def test_settle_returns_unused_tokens() -> None:
+    limiter = RateLimiter(_LIMITS)
+    limiter.try_acquire(["small"], 900)
+    limiter.settle("small", 900, 100)
+    assert limiter.remaining("small")["tpm"] >= 900
+    assert limiter.try_acquire(["small"], 800) == ("small", 0.0)
+
+
+def test_settle_without_usage_keeps_reservation() -> None:
+    limiter = RateLimiter(_LIMITS)
+    limiter.try_acquire(["small"], 900)
+    limiter.settle("small", 900, None)
+    assert limiter.remaining("small")["tpm"] < 200
+
+
+def test_throttled_blocks_model() -> None:
+    limiter = RateLimiter(_LIMITS)
+    asyncio.run(limiter.athrottled("small", 5.0))
+    model, wait = limiter.try_acquire(["small"], 10)
+    assert model is None and wait > 0
+    assert limiter.remaining("small")["rpm"] == 0.0
+    assert limiter.stats["throttled"] == 1
@@ -0,0 +1,62 @@
+"""Tests for query-focused map-reduce compression."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from websearch_bot import _llm
+
+pytest.importorskip("numpy")  # relevance() scores everything 1.0 without it
+
+_RELEVANT = "Install crawl4ai with pip, then run the setup command to fetch browsers. "
+_OFF_TOPIC = "The lighthouse keeper logged the tides and the passing ships each night. "
+
+
+def _document(relevant_repeats: int) -> str:
+    parts = [f"## Installing\n\n{_RELEVANT * relevant_repeats}\n\n"]
+    parts += [f"## Harbour {i}\n\n{_OFF_TOPIC * 300}\n\n" for i in range(10)]
+    return "".join(parts)
+
+
+@pytest.fixture
+def prompts(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    sent: list[str] = []
+
+    async def _fake_llm(system: str, user: str, max_tokens: int = 1024, prefer=None):
+        sent.append(user)
+        return "Summary: install crawl4ai with pip.", "fake/model"
+
+    monkeypatch.setattr(_llm, "acall_llm", _fake_llm)
+    # Chunk sizes follow the live model pool: pin it to one catalog model.
+    monkeypatch.setattr(_llm, "_live_models", lambda: ["groq/llama-3.3-70b-versatile"])
+    return sent
+
+
+def test_off_topic_dropped_when_rest_fits(prompts: list[str]) -> None:
+    text = _document(20)
+    report: dict = {}
+    out, calls, used = asyncio.run(
+        _llm._areduce(text, len(text) // 4, report, query="install crawl4ai")
+    )
+    assert calls == 0 and not used and not prompts
+    assert _RELEVANT * 20 in out
+    assert "lighthouse" not in out
+    assert all(f"## Harbour {i}" in out for i in range(10))
+    assert len(out) <= len(text) // 4
+    assert report["chunks_skipped"] >= 10
+
+
+def test_off_topic_never_sent(prompts: list[str]) -> None:
+    text = _document(600)
+    out, calls, _ = asyncio.run(_llm._areduce(text, 5_000, query="install crawl4ai"))
+    assert calls == len(prompts) > 0
+    assert not any("lighthouse" in p for p in prompts)
+    assert "lighthouse" not in out
+
+
+def test_without_query_everything_is_sent(prompts: list[str]) -> None:
+    text = _document(20)
+    asyncio.run(_llm._areduce(text, len(text) // 4))
+    assert any("lighthouse" in p for p in prompts)
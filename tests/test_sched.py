@@ -0,0 +1,44 @@
+"""Tests for the adaptive global concurrency limit."""
+
+from __future__ import annotations
+
+import asyncio
+
+from websearch_bot._sched import AdaptiveLimiter
+
+
+def test_raised_limit_admits_waiter() -> None:
+    async def run() -> tuple[int, bool]:
+        limiter = AdaptiveLimiter(initial=1, maximum=4)
+        admitted = asyncio.Event()
+
+        async def waiter() -> None:
+            async with limiter.slot():
+                admitted.set()
+
+        async with limiter.slot():
+            task = asyncio.create_task(waiter())
+            await asyncio.sleep(0)
+            assert not admitted.is_set()
+            for _ in range(4):
+                limiter.observe(0.1, ok=True)
+            await asyncio.wait_for(admitted.wait(), 1)
+        await task
+        await asyncio.sleep(0)
+        return limiter.limit, bool(limiter._wakers)
+
+    limit, pending = asyncio.run(run())
+    assert limit == 2
+    assert not pending
+
+
+def test_slow_window_halves_limit() -> None:
+    async def run() -> AdaptiveLimiter:
+        limiter = AdaptiveLimiter(initial=4, maximum=8)
+        for elapsed in (0.1, 1.0):
+            for _ in range(limiter.limit):  # one full window each
+                limiter.observe(elapsed, ok=True)
+        return limiter
+
+    limiter = asyncio.run(run())
+    assert limiter.limit == 5 // 2 and limiter.decreases == 1
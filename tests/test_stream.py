@@ -0,0 +1,34 @@
+"""Tests for merging finished documents into the per-source stream."""
+
+from __future__ import annotations
+
+import asyncio
+
+from websearch_bot._crawl import astream_many
+
+
+def test_extra_sources_get_equal_budget_lazily() -> None:
+    budgets: dict[str, int] = {}
+
+    def factory(url: str):
+        async def scrape(budget: int) -> str:
+            budgets[url] = budget
+            return f"doc for {url}"
+        return scrape
+
+    urls = ["https://github.com/a/b", "https://github.com/c/d"]
+
+    async def first() -> str:
+        stream = astream_many([], max_chars=1_000, extra={u: factory(u) for u in urls})
+        try:
+            return await anext(stream)
+        finally:
+            await stream.aclose()
+
+    stream = astream_many([], extra={u: factory(u) for u in urls})
+    assert not budgets  # nothing starts before the stream is consumed
+    asyncio.run(stream.aclose())
+    assert not budgets
+
+    assert asyncio.run(first()).startswith("doc for")
+    assert budgets == dict.fromkeys(urls, 500)
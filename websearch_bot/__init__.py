@@ -22,6 +22,15 @@ Quickstart::
     # List of URLs → parallel batch scrape
     text = search_web(["https://example.com", "https://github.com/owner/repo"])
 
+    # Native coroutines — run on the caller's event loop
+    text = await asearch_web("how to install crawl4ai")
+    await aclose()  # release this loop's warm browsers
+
+    # Streaming — one document per source as soon as it is crawled,
+    # followed by a summary record
+    for doc in search_web_stream("how to install crawl4ai"):
+        ...
+
 Environment variables::
 
     # Groq (free tier — default provider)
@@ -36,20 +45,85 @@ Environment variables::
     HUGGINGFACE_API_KEY   — HF Inference   (e.g. huggingface/meta-llama/Meta-Llama-3.1-8B-Instruct)
 
     GITHUB_TOKEN          — raises GitHub API rate limit from 60 → 5 000 req/hr
+
+    # Client-side LLM rate limiting (see llm_rate_limit_stats)
+    WEBSEARCH_RATE_LIMIT            — set to 0 to disable (default on)
+    WEBSEARCH_RATE_LIMIT_SHARED     — set to 1 to share budgets across processes
+    WEBSEARCH_LLM_MAX_WAIT          — max seconds a call waits for budget (default 30)
+    WEBSEARCH_LLM_COOLDOWN          — base circuit-breaker cooldown in seconds (default 30)
+    WEBSEARCH_LLM_MAX_CONCURRENCY   — max LLM calls in flight per fan-out (default 16)
+
+    # Map-reduce compression
+    WEBSEARCH_COMPRESS_MODE         — hybrid (default), extractive or llm
+    WEBSEARCH_COMPRESS_MAX_CALLS    — max LLM calls one compression may plan (default 200)
+    WEBSEARCH_COMPRESS_MAX_SECONDS  — max predicted compression seconds (default 0, off)
+
+    # On-disk crawl cache (see crawl_cache_stats / set_crawl_cache_ttl)
+    WEBSEARCH_CACHE                 — set to 0 to disable (default on)
+    WEBSEARCH_CACHE_DIR             — cache directory (default ~/.cache/websearch_bot)
+    WEBSEARCH_CACHE_MAX_MB          — LRU size bound (default 256)
+    WEBSEARCH_CACHE_TTL             — freshness lifetime in seconds (default 3600)
+    WEBSEARCH_CACHE_DOMAIN_TTL      — per-domain TTLs, e.g. "docs.python.org=86400"
+
+    # On-disk LLM response cache (see llm_cache_stats)
+    WEBSEARCH_LLM_CACHE             — set to 0 to disable (default on)
+    WEBSEARCH_LLM_CACHE_MAX_MB      — LRU size bound (default 64)
+    WEBSEARCH_LLM_CACHE_TTL         — response lifetime in seconds (default one week)
+
+    # Warm browser pool (see configure_browser_pool / close)
+    WEBSEARCH_BROWSER_POOL_SIZE     — max warm Chromium instances (default 2)
+    WEBSEARCH_BROWSER_IDLE_TIMEOUT  — seconds before an idle browser shuts down (default 300)
+    WEBSEARCH_BROWSER_MAX_USES      — crawls per browser before it is recycled (default 100)
+
+    # Browser request blocking (see BlockPolicy / set_block_policy)
+    WEBSEARCH_BLOCK                 — set to 0 to let pages load ads, trackers, media (default on)
+    WEBSEARCH_BLOCK_DOMAINS         — extra comma-separated domains to block
+
+    # Batch crawl scheduler (per-call override: max_concurrency / per_host)
+    WEBSEARCH_MAX_CONCURRENCY       — upper bound on pages in flight (default 4 × CPUs, max 32)
+    WEBSEARCH_PER_HOST              — max pages in flight per host (default 2)
+    WEBSEARCH_MEMORY_LIMIT          — memory use % above which concurrency is cut (default 85)
+
+    # Large batches spilled to disk
+    WEBSEARCH_SPILL_THRESHOLD       — URL count above which a batch spills (default 500)
+    WEBSEARCH_SPILL_WINDOW          — URLs crawled per window in spill mode (default 100)
+    WEBSEARCH_SPILL_DIR             — directory for spill files (default system temp)
 """
 
 from __future__ import annotations
 
+import asyncio
 import re
-from concurrent.futures import ThreadPoolExecutor
-
-from ._llm import MAX_CHARS
-from ._crawl import scrape_website as _scrape_one, scrape_many as _scrape_many
-from ._github import scrape_github as _scrape_github
-from ._search import _ddg_search
+from collections.abc import AsyncGenerator, Iterator
+
+from ._aio import iter_sync as _iter_sync, run_sync as _run_sync
+from ._block import BlockPolicy, set_block_policy
+from ._cache import (
+    cache_stats as crawl_cache_stats,
+    llm_cache_stats,
+    set_domain_ttl as set_crawl_cache_ttl,
+)
+from ._llm import MAX_CHARS, acompress_text
+from ._crawl import (
+    ascrape_website,
+    ascrape_many as _ascrape_many,
+    astream_many as _astream_many,
+)
+from ._github import ascrape_github
+from ._health import model_health as llm_model_health
+from ._http import tier_stats as fetch_tier_stats
+from ._pool import aclose, close, configure as configure_browser_pool
+from ._ratelimit import rate_limit_stats as llm_rate_limit_stats
+from ._search import _addg_search, _astream_ddg_search
 
 __version__ = "0.1.0"
-__all__ = ["search_web", "MAX_CHARS", "__version__"]
+__all__ = [
+    "search_web", "asearch_web", "search_web_stream", "asearch_web_stream",
+    "ascrape_website", "ascrape_github", "acompress_text",
+    "close", "aclose", "configure_browser_pool", "fetch_tier_stats",
+    "crawl_cache_stats", "set_crawl_cache_ttl", "BlockPolicy", "set_block_policy",
+    "llm_rate_limit_stats", "llm_model_health", "llm_cache_stats", "MAX_CHARS", "__version__",
+]
 
 _GITHUB_RE = re.compile(r"https?://github\.com/[^/]+/[^/?#]+(?:\.git)?/?$")
 
@@ -62,23 +136,80 @@ def _is_github(url: str) -> bool:
     return bool(_GITHUB_RE.match(url))
 
 
-def _scrape_list(urls: list[str], max_chars: int) -> str:
+async def _ascrape_list(
+    urls: list[str],
+    max_chars: int,
+    max_concurrency: int | None = None,
+    per_host: int | None = None,
+    incremental: bool = False,
+) -> str:
     github_urls = [u for u in urls if _is_github(u)]
     web_urls    = [u for u in urls if not _is_github(u)]
 
-    parts: list[str] = []
+    jobs = [ascrape_github(u, max_chars=max_chars) for u in github_urls]
+    if web_urls:
+        jobs.append(_ascrape_many(
+            web_urls,
+            max_chars=max_chars,
+            max_concurrency=max_concurrency,
+            per_host=per_host,
+            incremental=incremental,
+        ))
 
-    if github_urls:
-        with ThreadPoolExecutor(max_workers=len(github_urls)) as pool:
-            futures = [pool.submit(_scrape_github, u, max_chars=max_chars) for u in github_urls]
-            parts += [r for f in futures if (r := f.result())]
+    parts = await asyncio.gather(*jobs)
+    return "\n\n".join(p for p in parts if p)
 
-    if web_urls:
-        result = _scrape_many(web_urls, max_chars=max_chars)
-        if result:
-            parts.append(result)
 
-    return "\n\n".join(parts)
+async def asearch_web(
+    query: str | list[str],
+    max_results: int = 5,
+    max_pages: int = 5,
+    max_depth: int = 1,
+    keywords: list[str] | None = None,
+    max_chars: int = MAX_CHARS,
+    css_selector: str | None = None,
+    js_code: list[str] | None = None,
+    wait_for: str | None = None,
+    max_concurrency: int | None = None,
+    per_host: int | None = None,
+    use_sitemap: bool = False,
+    incremental: bool = False,
+) -> str:
+    """Coroutine version of :func:`search_web` — same arguments and return value.
+
+    Crawling, compression, and the AI overview all run on the caller's event
+    loop, so concurrent requests in an async server proceed in parallel.
+
+    Example:
+        >>> text = await asearch_web("python asyncio tutorial")
+        >>> text = await asearch_web(["https://a.com", "https://github.com/x/y"])
+    """
+    if isinstance(query, list):
+        return await _ascrape_list(query, max_chars, max_concurrency, per_host, incremental)
+
+    if _is_url(query):
+        if _is_github(query):
+            return await ascrape_github(query, max_chars=max_chars)
+        return await ascrape_website(
+            query,
+            max_pages=max_pages,
+            max_depth=max_depth,
+            keywords=keywords,
+            max_chars=max_chars,
+            css_selector=css_selector,
+            js_code=js_code,
+            wait_for=wait_for,
+            use_sitemap=use_sitemap,
+            incremental=incremental,
+        )
+
+    return await _addg_search(
+        query,
+        max_results=max_results,
+        max_chars=max_chars,
+        max_concurrency=max_concurrency,
+        per_host=per_host,
+    )
 
 
 def search_web(
@@ -91,6 +222,10 @@ def search_web(
     css_selector: str | None = None,
     js_code: list[str] | None = None,
     wait_for: str | None = None,
+    max_concurrency: int | None = None,
+    per_host: int | None = None,
+    use_sitemap: bool = False,
+    incremental: bool = False,
 ) -> str:
     """Search, scrape, or fetch — one function for everything.
 
@@ -99,7 +234,8 @@ def search_web(
     * **Plain text** (e.g. ``"python asyncio tutorial"``) → DuckDuckGo search,
       scrapes the top *max_results* pages and returns combined Markdown.
     * **Single URL** (starts with ``http://`` or ``https://``) → scrapes that
-      URL; GitHub repo URLs use the REST API, all others use the headless browser.
+      URL; GitHub repo URLs use the REST API, all others are fetched over plain
+      HTTP and escalated to the headless browser only when they need JavaScript.
     * **List of URLs** → scrapes all URLs in parallel, results combined.
 
     Args:
@@ -115,23 +251,97 @@ def search_web(
             or trigger lazy loading (single-URL web crawl only).
         wait_for: CSS (``"css:.loaded"``), XPath, or JS (``"js:()=>..."```)
             condition to wait for before capture (single-URL web crawl only).
+        max_concurrency: Upper bound on pages fetched at once (search results
+            and URL lists); the actual limit adapts to latency, errors and
+            memory below it.  Default ``WEBSEARCH_MAX_CONCURRENCY``.
+        per_host: Max pages fetched at once from a single host (default
+            ``WEBSEARCH_PER_HOST``, 2).
+        use_sitemap: Pick the pages of a single-URL crawl from the site's
+            ``robots.txt`` / ``sitemap.xml`` (ranked by *keywords*) instead of
+            following links from the seed.
+        incremental: For URLs and URL lists, condense page by page and reuse
+            the summaries stored by earlier runs for unchanged pages; the
+            frontmatter reports ``pages_changed`` / ``pages_reused``.
 
     Returns:
         Context-engineered Markdown document, or ``""`` on complete failure.
 
+    Use :func:`asearch_web` from async code — it runs end-to-end on the
+    caller's event loop instead of blocking it.
+
     Example:
         >>> text = search_web("python asyncio tutorial")
         >>> text = search_web("https://example.com")
         >>> text = search_web("https://example.com", css_selector="article")
         >>> text = search_web(["https://a.com", "https://github.com/x/y"])
     """
+    return _run_sync(asearch_web(
+        query,
+        max_results=max_results,
+        max_pages=max_pages,
+        max_depth=max_depth,
+        keywords=keywords,
+        max_chars=max_chars,
+        css_selector=css_selector,
+        js_code=js_code,
+        wait_for=wait_for,
+        max_concurrency=max_concurrency,
+        per_host=per_host,
+        use_sitemap=use_sitemap,
+        incremental=incremental,
+    ))
+
+
+async def asearch_web_stream(
+    query: str | list[str],
+    max_results: int = 5,
+    max_pages: int = 5,
+    max_depth: int = 1,
+    keywords: list[str] | None = None,
+    max_chars: int = MAX_CHARS,
+    css_selector: str | None = None,
+    js_code: list[str] | None = None,
+    wait_for: str | None = None,
+    max_concurrency: int | None = None,
+    per_host: int | None = None,
+    use_sitemap: bool = False,
+    incremental: bool = False,
+) -> AsyncGenerator[str, None]:
+    """Async-iterator version of :func:`search_web` that yields per source.
+
+    Search results and URL lists are fetched under the adaptive per-host
+    scheduler (HTTP tier first, the browser only when needed): each source
+    is yielded as a context-engineered document (``type: stream_source``,
+    compressed to an equal share of *max_chars*) the moment its page
+    completes, so an agent can start reasoning on the first result.  A
+    ``type: stream_summary`` record with an overview of all sources and any
+    failed URLs is always yielded last.  A single URL is one source and
+    yields its full :func:`search_web` document.
+
+    Example:
+        >>> async for doc in asearch_web_stream("python asyncio tutorial"):
+        ...     print(doc[:200])
+    """
     if isinstance(query, list):
-        return _scrape_list(query, max_chars)
+        github_urls = [u for u in query if _is_github(u)]
+        web_urls = [u for u in query if not _is_github(u)]
+        # Scrapes start only inside the stream, each at its per-source budget.
+        extra = {
+            u: lambda budget, u=u: ascrape_github(u, max_chars=budget) for u in github_urls
+        }
+        stream = _astream_many(
+            web_urls,
+            max_chars=max_chars,
+            extra=extra,
+            max_concurrency=max_concurrency,
+            per_host=per_host,
+        )
+        async for doc in stream:
+            yield doc
+        return
 
     if _is_url(query):
-        if _is_github(query):
-            return _scrape_github(query, max_chars=max_chars)
-        return _scrape_one(
+        doc = await asearch_web(
             query,
             max_pages=max_pages,
             max_depth=max_depth,
@@ -140,6 +350,57 @@ def search_web(
             css_selector=css_selector,
             js_code=js_code,
             wait_for=wait_for,
+            use_sitemap=use_sitemap,
+            incremental=incremental,
         )
+        if doc:
+            yield doc
+        return
+
+    stream = _astream_ddg_search(
+        query,
+        max_results=max_results,
+        max_chars=max_chars,
+        max_concurrency=max_concurrency,
+        per_host=per_host,
+    )
+    async for doc in stream:
+        yield doc
+
+
+def search_web_stream(
+    query: str | list[str],
+    max_results: int = 5,
+    max_pages: int = 5,
+    max_depth: int = 1,
+    keywords: list[str] | None = None,
+    max_chars: int = MAX_CHARS,
+    css_selector: str | None = None,
+    js_code: list[str] | None = None,
+    wait_for: str | None = None,
+    max_concurrency: int | None = None,
+    per_host: int | None = None,
+    use_sitemap: bool = False,
+    incremental: bool = False,
+) -> Iterator[str]:
+    """Iterator version of :func:`search_web` — see :func:`asearch_web_stream`.
 
-    return _ddg_search(query, max_results=max_results, max_chars=max_chars)
+    Example:
+        >>> for doc in search_web_stream(["https://a.com", "https://b.com"]):
+        ...     print(doc[:200])
+    """
+    return _iter_sync(asearch_web_stream(
+        query,
+        max_results=max_results,
+        max_pages=max_pages,
+        max_depth=max_depth,
+        keywords=keywords,
+        max_chars=max_chars,
+        css_selector=css_selector,
+        js_code=js_code,
+        wait_for=wait_for,
+        max_concurrency=max_concurrency,
+        per_host=per_host,
+        use_sitemap=use_sitemap,
+        incremental=incremental,
+    ))
@@ -0,0 +1,90 @@
+"""Event-loop plumbing — one long-lived background loop for the sync API.
+
+Playwright browsers are bound to the event loop that launched them, so the
+old ``asyncio.run`` per call tore every warm browser down with its loop.
+Synchronous entry points now submit their coroutine to a single daemon loop
+thread via :func:`run_sync`, which keeps :mod:`websearch_bot._pool` warm
+between calls and works the same whether or not the caller already has a
+running event loop (no ``nest_asyncio`` patching required).
+
+Example:
+    >>> from websearch_bot._aio import run_sync
+    >>> run_sync(asyncio.sleep(0, result=42))
+    42
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import AsyncGenerator, Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+__all__: list[str] = []
+
+_LOCK = threading.Lock()
+_LOOP: asyncio.AbstractEventLoop | None = None
+_THREAD: threading.Thread | None = None
+
+
+def background_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared background event loop, starting its thread on first use."""
+    global _LOOP, _THREAD
+    with _LOCK:
+        if _LOOP is None or _LOOP.is_closed() or not _THREAD or not _THREAD.is_alive():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name="websearch-bot-loop", daemon=True
+            )
+            thread.start()
+            _LOOP, _THREAD = loop, thread
+        return _LOOP
+
+
+async def _run_closing_pool(coro):
+    """Await *coro*, then close any browser pool it opened on this loop."""
+    from . import _pool  # _pool imports this module
+
+    try:
+        return await coro
+    finally:
+        await _pool.aclose()
+
+
+def run_sync(coro, timeout: float | None = None):
+    """Run *coro* on the background loop and block until it finishes.
+
+    Safe to call from plain scripts, worker threads, and code that is itself
+    running inside an event loop (e.g. Jupyter) — the caller's thread simply
+    waits for the result.
+
+    Args:
+        coro: Coroutine to execute.
+        timeout: Optional wall-clock limit in seconds.
+
+    Returns:
+        Whatever *coro* returns.
+    """
+    if threading.current_thread() is _THREAD:
+        # Re-entrant call from a coroutine already on the background loop:
+        # waiting on that same loop would deadlock, so use a throwaway loop.
+        # Browsers launched there die with it, so its pool is closed first.
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, _run_closing_pool(coro)).result(timeout)
+    return asyncio.run_coroutine_threadsafe(coro, background_loop()).result(timeout)
+
+
+def iter_sync(agen: AsyncGenerator) -> Iterator:
+    """Drive an async generator from sync code, one item per :func:`run_sync`.
+
+    The generator lives on the background loop; closing the returned
+    iterator early closes the generator there too.
+    """
+    try:
+        while True:
+            try:
+                yield run_sync(agen.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        run_sync(agen.aclose())
@@ -0,0 +1,200 @@
+"""Network-level resource blocking for browser crawls.
+
+``_BROWSER`` only stops Chromium from *rendering* images and remote fonts;
+the page still downloads video, ad scripts, analytics beacons and
+third-party iframes, and their long-polling traffic is what keeps
+``networkidle`` from ever settling.  Every pooled browser therefore gets an
+``on_page_context_created`` hook that routes each page request through the
+active :class:`BlockPolicy`:
+
+* **resource types** — ``media``, ``font``, ``image`` … aborted outright;
+* **domains** — third-party requests to ad / analytics / tracking hosts
+  (and their subdomains) are aborted;
+* **third-party frames** — iframes from another site are not loaded;
+* **max response size** — optional; subresources whose ``Content-Length``
+  exceeds the cap are answered with an empty body instead of being handed
+  to the page.  The driver still downloads them, so this spares the page
+  the parsing and execution, not the network transfer.
+
+The main document is never blocked.  Blocked requests (and the bytes of
+oversized responses withheld from the page) are counted per crawl via
+:func:`tracking`, and reported as ``blocked`` in the document frontmatter.
+
+Environment:
+    WEBSEARCH_BLOCK: Set to ``0`` to disable request blocking (default on).
+    WEBSEARCH_BLOCK_DOMAINS: Extra comma-separated domains to block.
+
+Example:
+    >>> from websearch_bot import BlockPolicy, set_block_policy
+    >>> set_block_policy(BlockPolicy(max_response_bytes=2_000_000))
+"""
+
+from __future__ import annotations
+
+import os
+from collections import Counter
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+__all__ = ["BlockPolicy", "set_block_policy", "get_block_policy", "install", "tracking"]
+
+#: Ad, analytics and tag-manager hosts that never carry page content.
+DEFAULT_DOMAINS: frozenset[str] = frozenset({
+    "doubleclick.net", "googlesyndication.com", "googleadservices.com",
+    "google-analytics.com", "googletagmanager.com", "googletagservices.com",
+    "adservice.google.com", "amazon-adsystem.com", "adnxs.com", "criteo.com",
+    "taboola.com", "outbrain.com", "scorecardresearch.com", "quantserve.com",
+    "facebook.net", "connect.facebook.net", "hotjar.com", "segment.io",
+    "segment.com", "mixpanel.com", "newrelic.com", "nr-data.net",
+    "fullstory.com", "optimizely.com", "clarity.ms", "bat.bing.com",
+    "ads-twitter.com", "analytics.twitter.com", "static.ads-twitter.com",
+    "pubmatic.com", "rubiconproject.com", "openx.net", "moatads.com",
+    "chartbeat.com", "mc.yandex.ru", "intercom.io",
+    "disqus.com", "addthis.com", "sharethis.com",
+})
+
+#: Resource types with no text content worth waiting for.
+DEFAULT_RESOURCE_TYPES: frozenset[str] = frozenset({
+    "image", "media", "font", "texttrack", "eventsource", "websocket", "manifest",
+    "other",  # pings / beacons
+})
+
+
+def _env_domains() -> frozenset[str]:
+    extra = os.getenv("WEBSEARCH_BLOCK_DOMAINS", "")
+    return DEFAULT_DOMAINS | {d.strip().lower() for d in extra.split(",") if d.strip()}
+
+
+@dataclass(frozen=True)
+class BlockPolicy:
+    """What the browser is allowed to download while rendering a page.
+
+    Args:
+        enabled: Master switch; ``False`` lets every request through.
+        resource_types: Playwright resource types to abort.
+        domains: Hosts to abort requests to (subdomains included) when
+            they are third-party to the page being crawled.
+        third_party_frames: Abort iframe documents from other sites.
+        max_response_bytes: Subresources with a larger ``Content-Length``
+            are replaced by an empty response (``None`` = no cap).  The
+            check needs the response headers, so such requests are fetched
+            in full by the driver rather than the page: it saves the page's
+            work on them, not bandwidth.  Leave it off unless large bundles
+            are a problem.
+    """
+    enabled: bool = True
+    resource_types: frozenset[str] = DEFAULT_RESOURCE_TYPES
+    domains: frozenset[str] = field(default_factory=_env_domains)
+    third_party_frames: bool = True
+    max_response_bytes: int | None = None
+
+    def _blocked_domain(self, host: str) -> bool:
+        parts = host.split(".")
+        return any(".".join(parts[i:]) in self.domains for i in range(len(parts) - 1))
+
+
+_POLICY = BlockPolicy(
+    enabled=os.getenv("WEBSEARCH_BLOCK", "1").lower() not in ("0", "false", "no", "off")
+)
+
+# Counter of the crawl currently running in this task (see :func:`tracking`).
+_CURRENT: ContextVar[Counter[str] | None] = ContextVar("websearch_block_stats", default=None)
+
+
+def set_block_policy(policy: BlockPolicy) -> None:
+    """Replace the process-wide block policy; applies to warm browsers too."""
+    global _POLICY
+    _POLICY = policy
+
+
+def get_block_policy() -> BlockPolicy:
+    """Return the active block policy."""
+    return _POLICY
+
+
+@contextmanager
+def tracking(stats: Counter[str]):
+    """Count requests blocked by pages opened inside the block into *stats*.
+
+    Tasks created inside the block (e.g. by the batch scheduler) inherit it.
+    """
+    token = _CURRENT.set(stats)
+    try:
+        yield stats
+    finally:
+        _CURRENT.reset(token)
+
+
+def _site(host: str) -> str:
+    """Crude registrable domain: the last two labels of *host*."""
+    return ".".join(host.split(".")[-2:])
+
+
+def _reason(policy: BlockPolicy, request, page_host: str) -> str | None:
+    """Why *request* should be aborted, or ``None`` to let it through."""
+    if request.resource_type == "document" and request.is_navigation_request():
+        frame = request.frame
+        if frame.parent_frame is None:
+            return None  # the page itself
+        host = (urlsplit(request.url).hostname or "").lower()
+        if policy.third_party_frames and _site(host) != _site(page_host):
+            return "frame"
+    if request.resource_type in policy.resource_types:
+        return "type"
+    host = (urlsplit(request.url).hostname or "").lower()
+    if _site(host) != _site(page_host) and policy._blocked_domain(host):
+        return "domain"
+    return None
+
+
+async def _route(route, page, stats: Counter[str] | None) -> None:
+    policy = _POLICY
+    request = route.request
+    try:
+        page_host = (urlsplit(page.url).hostname or "").lower()
+        reason = _reason(policy, request, page_host) if policy.enabled else None
+        if reason is not None:
+            await route.abort("blockedbyclient")
+            if stats is not None:
+                stats["requests"] += 1
+                stats[f"requests:{reason}"] += 1
+            return
+        if policy.enabled and policy.max_response_bytes and request.resource_type != "document":
+            response = await route.fetch()
+            size = int(response.headers.get("content-length") or 0)
+            if size > policy.max_response_bytes:
+                await route.fulfill(status=response.status, body=b"")
+                if stats is not None:
+                    stats["requests"] += 1
+                    stats["requests:size"] += 1
+                    stats["bytes_withheld"] += size  # downloaded, not given to the page
+                return
+            await route.fulfill(response=response)
+            return
+        await route.continue_()
+    except Exception:
+        # Fetch timed out, page closed mid-request, … — never break the crawl,
+        # and never leave the request hanging: hand it back to the browser
+        # (a no-op error when the route was already handled).
+        with suppress(Exception):
+            await route.continue_()
+
+
+async def _on_page_context_created(page, context=None, **kwargs):
+    """crawl4ai hook: route every request of the new page through the policy."""
+    stats = _CURRENT.get()
+
+    async def _handler(route) -> None:
+        await _route(route, page, stats)
+
+    with suppress(Exception):
+        await page.route("**/*", _handler)
+    return page
+
+
+def install(crawler) -> None:
+    """Attach the blocking hook to an (unstarted) browser crawler."""
+    with suppress(Exception):
+        crawler.crawler_strategy.set_hook("on_page_context_created", _on_page_context_created)
@@ -0,0 +1,422 @@
+"""On-disk caches backed by one SQLite file shared by every worker process.
+
+:class:`_Store` is a small size-bounded key/value table with LRU eviction
+(least recently *accessed* rows go first).  The crawl cache built on it
+stores extracted Markdown keyed by the normalized URL plus the
+``CrawlerRunConfig`` options that change the output, together with each
+page's ``ETag`` / ``Last-Modified`` validators:
+
+* **fresh** (younger than the domain's TTL) — served without any network I/O;
+* **stale** with validators — revalidated with conditional ``GET`` requests;
+  if every page answers ``304 Not Modified`` the entry is refreshed and served;
+* otherwise — a miss; the caller crawls and stores the new result.
+
+The LLM response cache (:data:`LLM_CACHE`) is content-addressed: the key is
+a hash of the system prompt, the user content, ``max_tokens`` and the
+family of the model that answered, so identical overviews, compression
+chunks and file summaries are answered from disk instead of the network.
+Lookups try the families of the fallback chain in preference order, so an
+answer from a weaker fallback never stands in for the primary while the
+primary's own answer is cached.  Entries expire after
+``WEBSEARCH_LLM_CACHE_TTL`` seconds.
+
+The database runs in WAL mode so concurrent workers can read while one writes.
+
+Environment:
+    WEBSEARCH_CACHE: Set to ``0`` to disable the crawl cache (default on).
+    WEBSEARCH_CACHE_DIR: Cache directory (default ``~/.cache/websearch_bot``).
+    WEBSEARCH_CACHE_MAX_MB: Size bound of the crawl cache (default 256).
+    WEBSEARCH_CACHE_TTL: Default freshness lifetime in seconds (default 3600).
+    WEBSEARCH_CACHE_DOMAIN_TTL: Per-domain overrides, e.g.
+        ``"docs.python.org=86400,news.ycombinator.com=60"``.
+    WEBSEARCH_LLM_CACHE: Set to ``0`` to disable the LLM response cache
+        (default on).
+    WEBSEARCH_LLM_CACHE_MAX_MB: Size bound of the LLM response cache
+        (default 64).
+    WEBSEARCH_LLM_CACHE_TTL: Lifetime of a cached LLM response in seconds
+        (default 604800, one week).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from collections import Counter
+from collections.abc import Callable
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+
+__all__ = [
+    "CRAWL_CACHE", "LLM_CACHE", "normalize_url", "set_domain_ttl", "cache_stats",
+    "llm_cache_stats",
+]
+
+CACHE_DIR: Path = Path(
+    os.getenv("WEBSEARCH_CACHE_DIR", Path.home() / ".cache" / "websearch_bot")
+)
+_DB_PATH: Path = CACHE_DIR / "cache.sqlite3"
+
+ENABLED: bool = os.getenv("WEBSEARCH_CACHE", "1").lower() not in ("0", "false", "no", "off")
+DEFAULT_TTL: float = float(os.getenv("WEBSEARCH_CACHE_TTL", "3600"))
+_MAX_BYTES: int = int(float(os.getenv("WEBSEARCH_CACHE_MAX_MB", "256")) * 1024 * 1024)
+LLM_ENABLED: bool = os.getenv("WEBSEARCH_LLM_CACHE", "1").lower() not in ("0", "false", "no", "off")
+_LLM_MAX_BYTES: int = int(float(os.getenv("WEBSEARCH_LLM_CACHE_MAX_MB", "64")) * 1024 * 1024)
+LLM_TTL: float = float(os.getenv("WEBSEARCH_LLM_CACHE_TTL", str(7 * 86_400)))
+
+#: Query parameters that never change page content (tracking / referral tags).
+_TRACKING_PARAMS: frozenset[str] = frozenset({"ref", "fbclid", "gclid", "mc_cid", "mc_eid"})
+
+
+def _parse_domain_ttls(spec: str) -> dict[str, float]:
+    ttls: dict[str, float] = {}
+    for item in spec.split(","):
+        domain, _, seconds = item.partition("=")
+        if domain.strip() and seconds.strip():
+            ttls[domain.strip().lower()] = float(seconds)
+    return ttls
+
+
+_DOMAIN_TTLS: dict[str, float] = _parse_domain_ttls(os.getenv("WEBSEARCH_CACHE_DOMAIN_TTL", ""))
+
+
+def normalize_url(url: str) -> str:
+    """Canonicalize *url* so trivially different spellings share a cache key.
+
+    Lower-cases scheme and host, drops default ports, fragments and tracking
+    parameters (``utm_*``, ``ref``, ``fbclid`` …), and sorts the query string.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    netloc = host if port is None or (scheme, port) in {("http", 80), ("https", 443)} else f"{host}:{port}"
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    ))
+    return urlunsplit((scheme, netloc, parts.path or "/", query, ""))
+
+
+# ---------------------------------------------------------------------------
+# Generic store
+# ---------------------------------------------------------------------------
+
+
+class _Store:
+    """Size-bounded SQLite key/value table with LRU eviction.
+
+    Connections are opened per operation so the store is safe to use from
+    any thread (including ``asyncio.to_thread`` workers).
+
+    Args:
+        table: Table name inside the shared cache database.
+        max_bytes: Total ``value`` size above which LRU rows are evicted.
+    """
+
+    def __init__(self, table: str, max_bytes: int) -> None:
+        self.table = table
+        self.max_bytes = max_bytes
+        self._ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._ready:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(_DB_PATH, timeout=30)
+        if not self._ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, meta TEXT NOT NULL, "
+                "size INTEGER NOT NULL, stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.table}_lru ON {self.table} (accessed_at)"
+            )
+            self._ready = True
+        return conn
+
+    def get(self, key: str) -> tuple[str, dict, float] | None:
+        """Return ``(value, meta, stored_at)`` and mark the row as recently used."""
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT value, meta, stored_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+        return row[0], json.loads(row[1]), row[2]
+
+    def put(self, key: str, value: str, meta: dict | None = None) -> None:
+        """Insert or replace *key*, then evict LRU rows beyond ``max_bytes``."""
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?, ?, ?, ?)",
+                (key, value, json.dumps(meta or {}), size, now, now),
+            )
+            self._evict(conn)
+
+    def update(self, key: str, fn: Callable[[str | None], str]) -> str:
+        """Atomically replace *key*'s value with ``fn(current value or None)``.
+
+        The write lock is taken before the read (``BEGIN IMMEDIATE``), so
+        concurrent processes merge their updates instead of overwriting
+        each other.  Returns the new value.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                f"SELECT value FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            value = fn(row[0] if row else None)
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?, ?, ?, ?)",
+                (key, value, "{}", len(value.encode("utf-8")), now, now),
+            )
+            self._evict(conn)
+        return value
+
+    def refresh(self, key: str) -> None:
+        """Reset the freshness clock of *key* (after a successful revalidation)."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                f"UPDATE {self.table} SET stored_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, key),
+            )
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.table}").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)  # leave headroom so we don't evict on every put
+        doomed: list[tuple[str]] = []
+        for key, size in conn.execute(
+            f"SELECT key, size FROM {self.table} ORDER BY accessed_at"
+        ):
+            if total <= target:
+                break
+            doomed.append((key,))
+            total -= size
+        conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", doomed)
+
+    def clear(self) -> None:
+        """Delete every row of this store."""
+        with self._connect() as conn:
+            conn.execute(f"DELETE FROM {self.table}")
+
+
+# ---------------------------------------------------------------------------
+# Crawl cache
+# ---------------------------------------------------------------------------
+
+
+def _validators(headers: dict | None) -> dict[str, str]:
+    """Pick the HTTP cache validators out of a response-header mapping."""
+    lowered = {k.lower(): v for k, v in (headers or {}).items()}
+    out = {}
+    if lowered.get("etag"):
+        out["etag"] = lowered["etag"]
+    if lowered.get("last-modified"):
+        out["last_modified"] = lowered["last-modified"]
+    return out
+
+
+def _not_modified(url: str, validators: dict[str, str]) -> bool:
+    """Send a conditional GET; ``True`` when the server answers 304."""
+    headers = {}
+    if "etag" in validators:
+        headers["If-None-Match"] = validators["etag"]
+    if "last_modified" in validators:
+        headers["If-Modified-Since"] = validators["last_modified"]
+    try:
+        r = requests.get(url, headers=headers, timeout=5, stream=True)
+        r.close()
+        return r.status_code == 304
+    except Exception:
+        return False
+
+
+class _CrawlCache:
+    """Extracted-Markdown cache for crawls; see the module docstring."""
+
+    def __init__(self, store: _Store) -> None:
+        self.store = store
+        self.stats: Counter[str] = Counter()
+
+    @staticmethod
+    def key(url: str, options: dict) -> str:
+        """Cache key: normalized URL + the run options that change the output."""
+        payload = json.dumps(
+            {"url": normalize_url(url), **{k: v for k, v in options.items() if v}},
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def ttl_for(url: str) -> float:
+        """Return the freshness lifetime configured for *url*'s domain."""
+        host = (urlsplit(url).hostname or "").lower()
+        for domain, ttl in _DOMAIN_TTLS.items():
+            if host == domain or host.endswith("." + domain):
+                return ttl
+        return DEFAULT_TTL
+
+    async def aget(
+        self, url: str, options: dict, counts: Counter[str]
+    ) -> list[tuple[str, str]] | None:
+        """Return cached ``(url, markdown)`` pages for *url*, or ``None`` on a miss.
+
+        Stale entries are revalidated page by page with conditional requests.
+        *counts* (and the process-wide :attr:`stats`) receive ``hits``,
+        ``misses`` and ``revalidated`` increments.
+        """
+        if not ENABLED:
+            return None
+        key = self.key(url, options)
+        try:
+            row = await asyncio.to_thread(self.store.get, key)
+        except Exception:
+            row = None
+        outcome = "misses"
+        pages = None
+        if row is not None:
+            value, meta, stored_at = row
+            validators: dict[str, dict] = meta.get("validators", {})
+            if time.time() - stored_at < self.ttl_for(url):
+                outcome, pages = "hits", json.loads(value)
+            elif validators and len(validators) == len(meta.get("urls", [])):
+                checks = await asyncio.gather(*(
+                    asyncio.to_thread(_not_modified, u, v) for u, v in validators.items()
+                ))
+                if all(checks):
+                    await asyncio.to_thread(self.store.refresh, key)
+                    outcome, pages = "revalidated", json.loads(value)
+        counts[outcome] += 1
+        self.stats[outcome] += 1
+        return [tuple(p) for p in pages] if pages is not None else None
+
+    async def aput(
+        self,
+        url: str,
+        options: dict,
+        pages: list[tuple[str, str]],
+        headers: dict[str, dict],
+    ) -> None:
+        """Store *pages* with the validators found in their response *headers*."""
+        if not ENABLED or not pages:
+            return
+        validators = {u: v for u, _ in pages if (v := _validators(headers.get(u)))}
+        meta = {"urls": [u for u, _ in pages], "validators": validators}
+        # A read-only or full disk must never break scraping.
+        with contextlib.suppress(Exception):
+            await asyncio.to_thread(
+                self.store.put, self.key(url, options), json.dumps(pages), meta
+            )
+
+
+#: Process-wide crawl cache.
+CRAWL_CACHE = _CrawlCache(_Store("crawl", _MAX_BYTES))
+
+
+def set_domain_ttl(domain: str, seconds: float) -> None:
+    """Override the crawl-cache freshness lifetime for *domain* and its subdomains."""
+    _DOMAIN_TTLS[domain.lower()] = seconds
+
+
+def cache_stats() -> dict[str, int]:
+    """Return process-wide crawl-cache ``hits`` / ``misses`` / ``revalidated`` counts."""
+    return dict(CRAWL_CACHE.stats)
+
+
+# ---------------------------------------------------------------------------
+# LLM response cache
+# ---------------------------------------------------------------------------
+
+
+# Trailing date / version tags that do not change a model's family,
+# e.g. "-20251001", "-0905", "-latest".
+_MODEL_TAG_RE = re.compile(r"-(?:\d{4,8}|latest|preview)$")
+
+
+def model_family(model: str) -> str:
+    """Provider + model name without date or version tags (``groq/moonshotai/kimi-k2-instruct``)."""
+    return _MODEL_TAG_RE.sub("", model.lower())
+
+
+class _LLMCache:
+    """Content-addressed LLM response cache; see the module docstring."""
+
+    def __init__(self, store: _Store) -> None:
+        self.store = store
+        self.stats: Counter[str] = Counter()
+
+    @staticmethod
+    def key(system: str, user: str, max_tokens: int, family: str) -> str:
+        payload = json.dumps([system, user, max_tokens, family])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _lookup(self, keys: list[str]) -> tuple[str, dict, float] | None:
+        """The first of *keys* with a row younger than :data:`LLM_TTL`."""
+        now = time.time()
+        for key in keys:
+            row = self.store.get(key)
+            if row is not None and now - row[2] < LLM_TTL:
+                return row
+        return None
+
+    async def aget(
+        self, system: str, user: str, max_tokens: int, families: list[str]
+    ) -> tuple[str, str] | None:
+        """Return the cached ``(response_text, model_id)``, or ``None`` on a miss.
+
+        *families* are tried in order; the first unexpired answer wins.
+        """
+        if not LLM_ENABLED:
+            return None
+        try:
+            row = await asyncio.to_thread(
+                self._lookup, [self.key(system, user, max_tokens, f) for f in families]
+            )
+        except Exception:
+            row = None
+        self.stats["hits" if row is not None else "misses"] += 1
+        if row is None:
+            return None
+        self.stats["saved_chars"] += len(user)
+        return row[0], row[1].get("model", "")
+
+    async def aput(
+        self, system: str, user: str, max_tokens: int, family: str, text: str, model: str
+    ) -> None:
+        """Store a successful response under the answering model's *family*."""
+        if not LLM_ENABLED or not text:
+            return
+        with contextlib.suppress(Exception):
+            await asyncio.to_thread(
+                self.store.put, self.key(system, user, max_tokens, family), text, {"model": model}
+            )
+
+
+#: Process-wide LLM response cache.
+LLM_CACHE = _LLMCache(_Store("llm", _LLM_MAX_BYTES))
+
+
+def llm_cache_stats() -> dict[str, float]:
+    """Return LLM-cache ``hits``, ``misses``, ``hit_rate`` and ``saved_chars`` (prompt chars not resent)."""
+    stats: dict[str, float] = dict(LLM_CACHE.stats)
+    lookups = stats.get("hits", 0) + stats.get("misses", 0)
+    stats["hit_rate"] = round(stats.get("hits", 0) / lookups, 3) if lookups else 0.0
+    return stats
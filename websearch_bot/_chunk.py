@@ -0,0 +1,227 @@
+"""Markdown-aware, token-sized chunking for map-reduce compression.
+
+Slicing text into fixed character windows cuts through code fences, tables
+and sentences; a summary of half a code block is worse than useless and
+often longer than its input.  :func:`split_markdown` instead packs whole
+structural units greedily into chunks of at most ``max_tokens`` tokens,
+descending to finer units only for a unit that is too large on its own:
+
+1. ``## Source:`` sections (one crawled page of a batch) — kept together
+   whenever a section fits;
+2. heading sections (``#`` … ``######``);
+3. blocks — paragraphs, tables, lists and whole fenced code blocks;
+4. lines;
+5. sentences;
+6. a hard cut, for a single line longer than a chunk.
+
+Headings and separators are never parsed inside fenced code blocks.
+
+Token counts come from ``tiktoken`` (``cl100k_base``), loaded lazily on
+first use and cached; it ships with ``litellm``.  Without it
+:func:`count_tokens` falls back to the 4-characters-per-token estimate.
+:func:`chunk_tokens` sizes chunks from a model's catalog limits.
+
+Example:
+    >>> chunks = split_markdown(document, chunk_tokens("groq/llama-3.3-70b-versatile"))
+    >>> [count_tokens(c) for c in chunks]
+    [5911, 5874, 2210]
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+from collections.abc import Callable
+
+from ._groq import MODEL_TPM, MODELS
+
+__all__ = ["count_tokens", "chunk_tokens", "split_markdown", "headings", "sections"]
+
+# Smallest chunk worth an LLM call.
+_MIN_CHUNK_TOKENS = 2_000
+# Share of a model's context window a chunk may fill (the rest is the
+# system prompt and the summary).
+_CONTEXT_SHARE = 0.6
+
+_FENCE_RE = re.compile(r"^\s{0,3}(`{3,}|~{3,})")
+_HEADING_RE = re.compile(r"^#{1,6}\s")
+_SOURCE_RE = re.compile(r"^## Source:")
+_SENTENCE_RE = re.compile(r"(?<=[.!?]\s)")
+
+#: litellm model ID → context window in tokens, from the Groq catalog.
+_CONTEXT: dict[str, int] = {
+    m["litellm_id"]: m["context"] for m in MODELS if m.get("litellm_id") and m.get("context")
+}
+
+
+# ---------------------------------------------------------------------------
+# Token counting
+# ---------------------------------------------------------------------------
+
+
+@functools.lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Number of tokens in *text* (``cl100k_base``; ~4 chars per token without tiktoken)."""
+    enc = _encoding()
+    if enc is None:
+        return -(-len(text) // 4)  # rounded up, so piece counts add up safely
+    return len(enc.encode(text, disallowed_special=()))
+
+
+def chunk_tokens(model: str, scale: int = 1) -> int:
+    """Chunk size, in tokens, for compressing with *model*.
+
+    Half of the model's per-minute token budget, so two chunks fit in one
+    minute — Groq models without a published TPM count 6 K, other
+    providers 30 K — times *scale* (larger chunks mean fewer calls),
+    capped to :data:`_CONTEXT_SHARE` of its context window.
+    Example: llama-3.3-70b at 12 K TPM → 6 000-token chunks.
+    """
+    tpm = MODEL_TPM.get(model, 6_000 if model.startswith("groq/") else 30_000)
+    size = tpm // 2 * scale
+    context = _CONTEXT.get(model)
+    if context:
+        size = min(size, int(context * _CONTEXT_SHARE))
+    return max(size, _MIN_CHUNK_TOKENS)
+
+
+# ---------------------------------------------------------------------------
+# Splitting
+# ---------------------------------------------------------------------------
+
+
+def _split_lines(text: str, starts: Callable[[str], bool], ends: Callable[[str], bool]) -> list[str]:
+    """Split *text* into line runs, outside fenced code blocks.
+
+    A new piece starts before a line for which *starts* is true, and after
+    a line for which *ends* is true.  Joining the pieces gives back *text*.
+    """
+    pieces: list[str] = []
+    current: list[str] = []
+    fence: str | None = None
+    for line in text.splitlines(keepends=True):
+        m = _FENCE_RE.match(line)
+        if fence is None and not m and current and starts(line):
+            pieces.append("".join(current))
+            current = []
+        current.append(line)
+        if m:
+            marker = m.group(1)
+            if fence is None:
+                fence = marker
+            elif marker[0] == fence[0] and len(marker) >= len(fence):
+                fence = None
+        elif fence is None and ends(line):
+            pieces.append("".join(current))
+            current = []
+    if current:
+        pieces.append("".join(current))
+    return pieces
+
+
+def _never(line: str) -> bool:
+    return False
+
+
+def _blank(line: str) -> bool:
+    return not line.strip()
+
+
+# Finer and finer ways to cut a piece that does not fit in one chunk.
+_LEVELS: tuple[Callable[[str], list[str]], ...] = (
+    lambda t: _split_lines(t, lambda line: bool(_SOURCE_RE.match(line)), _never),
+    lambda t: _split_lines(t, lambda line: bool(_HEADING_RE.match(line)), _never),
+    lambda t: _split_lines(t, _never, _blank),
+    lambda t: t.splitlines(keepends=True),
+    lambda t: [s for s in _SENTENCE_RE.split(t) if s],
+)
+
+
+def _hard_split(text: str, max_tokens: int) -> list[str]:
+    step = max(max_tokens * 4, 1)
+    return [text[i:i + step] for i in range(0, len(text), step)]
+
+
+def _pack(text: str, max_tokens: int, level: int, out: list[str]) -> None:
+    """Append chunks of *text* to *out*, splitting at *level* and finer."""
+    if level >= len(_LEVELS):
+        out.extend(_hard_split(text, max_tokens))
+        return
+    current: list[str] = []
+    size = 0
+    for piece in _LEVELS[level](text):
+        tokens = count_tokens(piece)
+        if tokens > max_tokens:
+            if current:
+                out.append("".join(current))
+                current, size = [], 0
+            _pack(piece, max_tokens, level + 1, out)
+            continue
+        if current and size + tokens > max_tokens:
+            out.append("".join(current))
+            current, size = [], 0
+        current.append(piece)
+        size += tokens
+    if current:
+        out.append("".join(current))
+
+
+def _close_fences(chunks: list[str]) -> list[str]:
+    """Close a code fence left open at the end of a chunk and reopen it in the next."""
+    out: list[str] = []
+    opener: str | None = None  # fence line still open from the previous chunk
+    for chunk in chunks:
+        if opener is not None:
+            chunk = opener + chunk
+        fence: str | None = None
+        opener = None
+        for line in chunk.splitlines(keepends=True):
+            m = _FENCE_RE.match(line)
+            if not m:
+                continue
+            marker = m.group(1)
+            if fence is None:
+                fence, opener = marker, line if line.endswith("\n") else line + "\n"
+            elif marker[0] == fence[0] and len(marker) >= len(fence):
+                fence = opener = None
+        if fence is not None:
+            chunk = chunk + ("" if chunk.endswith("\n") else "\n") + fence + "\n"
+        out.append(chunk)
+    return out
+
+
+def split_markdown(text: str, max_tokens: int) -> list[str]:
+    """Split Markdown *text* into chunks of at most *max_tokens* tokens.
+
+    Structural units are kept whole whenever they fit (see the module
+    docstring).  A code block too large for one chunk is closed at the cut
+    and reopened, with its info string, in the next chunk; otherwise joining
+    the chunks gives back *text*.  Whitespace-only chunks are dropped.
+    """
+    if not text:
+        return []
+    out: list[str] = []
+    _pack(text, max(max_tokens, 1), 0, out)
+    return _close_fences([chunk for chunk in out if chunk.strip()])
+
+
+def sections(text: str) -> list[str]:
+    """Split *text* before every heading line outside fenced code blocks.
+
+    Each piece is one heading with its body (the first may have no
+    heading); joining the pieces gives back *text*.
+    """
+    return _split_lines(text, lambda line: bool(_HEADING_RE.match(line)), _never)
+
+
+def headings(text: str) -> list[str]:
+    """The Markdown heading lines of *text*, outside fenced code blocks."""
+    return [piece.splitlines()[0] for piece in sections(text) if _HEADING_RE.match(piece)]
@@ -1,8 +1,16 @@
-"""crawl4ai helpers — browser configuration, crawl execution, and output formatting.
+"""crawl4ai helpers — crawler configuration, crawl execution, and output formatting.
 
 Internal functions are prefixed with ``_`` and are not part of the public API.
 The two public entry points (:func:`scrape_website` and :func:`scrape_many`)
-are called by :mod:`websearch_bot.__init__` after URL routing.
+are called by :mod:`websearch_bot.__init__` after URL routing.  Browsers are
+borrowed from the warm, process-wide pool in :mod:`websearch_bot._pool`; every
+crawl first tries the HTTP tier in :mod:`websearch_bot._http` and only
+escalates to Chromium for pages that need JavaScript.
+
+Each public function has a native coroutine twin (``ascrape_website``,
+``ascrape_many``, ``afinalize``, ``awrap_context``) that runs end-to-end on
+the caller's event loop; the sync names wrap them via
+:func:`websearch_bot._aio.run_sync`.
 
 Example:
     >>> from websearch_bot._crawl import scrape_website
@@ -12,64 +20,61 @@ Example:
 from __future__ import annotations
 
 import asyncio
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
-from crawl4ai import (
-    AsyncWebCrawler,
-    BrowserConfig,
-    CrawlerRunConfig,
-    PruningContentFilter,
-    SemaphoreDispatcher,
-)
-from crawl4ai.content_scraping_strategy import LXMLWebScrapingStrategy
+from crawl4ai import CrawlerRunConfig, CrawlResult
 from crawl4ai.deep_crawling import BFSDeepCrawlStrategy, BestFirstCrawlingStrategy
 from crawl4ai.deep_crawling.scorers import KeywordRelevanceScorer
-from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
-
-from ._llm import MAX_CHARS, call_llm, compress_text
 
-__all__ = ["scrape_website", "scrape_many", "finalize"]
+from ._aio import run_sync as _run_sync
+from ._block import tracking as _track_blocked
+from ._cache import CRAWL_CACHE
+from ._dedup import Deduper, dedup_pages, strip_boilerplate
+from ._extract import WORKERS as EXTRACT_WORKERS, aextract, passthrough, scrape_options
+from ._frontier import build_frontier
+from ._incremental import condense
+from ._http import TIER_STATS, escalation_reason
+from ._llm import MAX_CHARS, acall_llm, acompress_text
+from ._pool import get_pool
+from ._profiles import STRATEGIES, get_profile, record as record_attempt
+from ._sched import Scheduler
+from ._scrape import _BASE, _BATCH
+from ._spill import THRESHOLD as SPILL_THRESHOLD, WINDOW as SPILL_WINDOW, SpillStore, acondense
+
+__all__ = [
+    "ascrape_website", "scrape_website", "ascrape_many", "scrape_many",
+    "astream_many", "afinalize", "finalize", "awrap_context", "wrap_context",
+]
 
 # ---------------------------------------------------------------------------
-# Browser and crawler configuration
+# Crawler configuration
 # ---------------------------------------------------------------------------
 
-# Headless Chromium; images and remote fonts disabled for speed.
-_BROWSER = BrowserConfig(
-    headless=True,
-    text_mode=False,
-    extra_args=[
-        "--blink-settings=imagesEnabled=false",
-        "--disable-remote-fonts",
-        "--disable-background-timer-throttling",
-        "--disable-backgrounding-occluded-windows",
-        "--disable-renderer-backgrounding",
-        "--no-first-run",
-    ],
+# The shared _BASE / _BATCH settings live in _scrape, which the extraction
+# workers import on their own.
+
+# Per-URL browser routes for batch pages the HTTP tier could not serve.
+# Only JavaScript shells need DOM-ready + scroll + the 1.5 s hydration
+# delay; other pages (thin, blocked, failed over HTTP) just wait for
+# network idle.  Each route is a set of overrides on the _BATCH config.
+_ROUTES: dict[str, dict] = {
+    "networkidle": {"wait_until": "networkidle", "delay_before_return_html": 0, "scan_full_page": False},
+    "domcontentloaded": {},
+}
+# HTTP-tier escalation reasons that mean "rendered by JavaScript".
+_JS_REASONS: frozenset[str] = frozenset({"js_shell", "noscript"})
+
+# Columns of the per-source outcome table (frontmatter ``sources``).
+_OUTCOME_FIELDS: tuple[str, ...] = (
+    "url", "status", "code", "ms", "bytes", "tier", "attempts", "error",
 )
 
-# PruningContentFilter removes low-density/boilerplate text blocks before
-# markdown generation, producing cleaner fit_markdown output for LLMs.
-_CONTENT_FILTER = PruningContentFilter(threshold=0.48, threshold_type="fixed")
-
-# Shared keyword arguments applied to every CrawlerRunConfig instance.
-_BASE: dict = dict(
-    word_count_threshold=10,
-    excluded_tags=["nav", "footer", "header", "aside", "script", "style"],
-    remove_overlay_elements=True,
-    remove_forms=True,                  # strip <form> elements — cleaner output
-    exclude_social_media_links=True,
-    magic=True,                         # auto-dismiss cookie banners / popups
-    markdown_generator=DefaultMarkdownGenerator(
-        content_filter=_CONTENT_FILTER,
-        options={"body_width": 0},
-    ),
-    scraping_strategy=LXMLWebScrapingStrategy(),
-    wait_until="networkidle",  # required for JS-rendered / SPA pages
-    page_timeout=15_000,       # 15 s (default is 60 s)
-    wait_for_images=False,
-    verbose=False,
-)
+# Crawl-cache options for batch pages (one page per URL, _BATCH config).
+_BATCH_CACHE_KEY: dict = {"mode": "batch"}
 
 # ---------------------------------------------------------------------------
 # Private helpers
@@ -90,17 +95,27 @@ def _extract_markdown(result) -> str:
     return md.fit_markdown or md.markdown_with_citations or md.raw_markdown or ""
 
 
-def _make_strategy(max_depth: int, max_pages: int, keywords: list[str] | None):
+def _make_strategy(
+    max_depth: int,
+    max_pages: int,
+    keywords: list[str] | None,
+    frontier: list[str] | None = None,
+):
     """Build a BestFirst (keyword-scored) or BFS deep-crawl strategy.
 
     Args:
         max_depth: Maximum link depth from the seed URL.
         max_pages: Maximum total pages to visit.
         keywords: When provided, enables keyword-relevance scoring.
+        frontier: Pages already chosen from the sitemap
+            (:mod:`~websearch_bot._frontier`); link discovery is then
+            unnecessary and no strategy is returned.
 
     Returns:
-        A crawl4ai deep-crawl strategy instance.
+        A crawl4ai deep-crawl strategy instance, or ``None`` with a frontier.
     """
+    if frontier:
+        return None
     if keywords:
         return BestFirstCrawlingStrategy(
             max_depth=max_depth,
@@ -115,56 +130,417 @@ def _make_strategy(max_depth: int, max_pages: int, keywords: list[str] | None):
     )
 
 
-def _run_sync(coro):
-    """Run an async coroutine from synchronous code.
+def _tier_summary(tiers: Counter[str]) -> str:
+    """Format per-tier page counts as a YAML flow mapping for the frontmatter."""
+    keys = ("http", "browser", "escalated")
+    return "{" + ", ".join(f"{k}: {tiers[k]}" for k in keys if tiers[k]) + "}"
+
+
+def _cache_summary(counts: Counter[str]) -> str:
+    """Format per-call crawl-cache counts as a YAML flow mapping."""
+    keys = ("hits", "misses", "revalidated")
+    return "{" + ", ".join(f"{k}: {counts[k]}" for k in keys) + "}"
+
+
+def _blocked_summary(blocked: Counter[str]) -> str:
+    """Format per-crawl blocked-request counts as a YAML flow mapping."""
+    keys = ("requests", "bytes_withheld")
+    return "{" + ", ".join(f"{k}: {blocked[k]}" for k in keys if blocked[k]) + "}"
+
+
+def _note_escalation(tiers: Counter[str], reason: str) -> None:
+    tiers["escalated"] += 1
+    tiers[f"escalated:{reason}"] += 1
+
+
+def _join_sources(pages: list[tuple[str, str]]) -> str:
+    """Join batch pages, each under a ``## Source: <url>`` heading."""
+    return "\n\n---\n\n".join(f"## Source: {url}\n\n{text}" for url, text in pages)
+
+
+@dataclass
+class _Crawl:
+    """Outcome of one crawl: extracted pages plus bookkeeping for the frontmatter."""
+    pages: list[tuple[str, str]] = field(default_factory=list)  # (url, markdown)
+    tiers: Counter[str] = field(default_factory=Counter)
+    headers: dict[str, dict] = field(default_factory=dict)       # url → response headers
+    strategy: str | None = None                                  # strategy that served the seed
+    blocked: Counter[str] = field(default_factory=Counter)      # requests aborted by _block
+    timing: Counter[str] = field(default_factory=Counter)       # fetch_ms / extract_ms
+    outcomes: dict[str, dict] = field(default_factory=dict)      # url → per-source outcome
+
+    def add(self, result, markdown: str, tier: str) -> None:
+        self.pages.append((result.url, markdown))
+        self.tiers[tier] += 1
+        self.headers[result.url] = getattr(result, "response_headers", None) or {}
+
+    def outcome(
+        self,
+        url: str,
+        status: str,
+        tier: str,
+        result=None,
+        ms: int = 0,
+        error: str = "",
+        attempts: int = 1,
+    ) -> None:
+        """Record the latest outcome of *url* for the frontmatter ``sources`` table.
+
+        *ms* and *attempts* accumulate across tiers; the other fields
+        describe the latest attempt.
+        """
+        entry = self.outcomes.setdefault(url, dict.fromkeys(_OUTCOME_FIELDS, 0) | {"url": url})
+        message = " ".join((getattr(result, "error_message", None) or "").split())[:80]
+        if status == "failed" and not (error or message):
+            error = entry["error"] or ""  # keep the earlier tier's reason
+        entry.update(
+            status=status,
+            code=getattr(result, "status_code", None) or 0,
+            ms=entry["ms"] + ms,
+            bytes=len((getattr(result, "html", None) or "").encode("utf-8")),
+            tier=tier,
+            error=error or message,
+            attempts=entry["attempts"] + attempts,
+        )
+
+    @property
+    def text(self) -> str:
+        return "\n\n".join(md for _, md in self.pages)
+
 
-    Applies ``nest_asyncio`` when an event loop is already running (e.g.
-    inside Jupyter) so the coroutine can still be awaited via
-    ``run_until_complete``.
+async def _crawl_pages(
+    url: str,
+    strategy: str,
+    config: CrawlerRunConfig,
+    frontier: list[str] | None = None,
+) -> list[tuple[CrawlResult, str]]:
+    """Run one crawl with *strategy*; return ``(result, markdown)`` pairs.
+
+    Without a *frontier* this is a (possibly deep) crawl from *url*; with one
+    the frontier pages are fetched as a flat batch, seed first.
     """
-    try:
-        asyncio.get_running_loop()
-        import nest_asyncio
-        nest_asyncio.apply()
-        return asyncio.get_event_loop().run_until_complete(coro)
-    except RuntimeError:
-        return asyncio.run(coro)
+    async def _run(crawler) -> list[tuple[CrawlResult, str]]:
+        if not frontier:
+            return [(r, _extract_markdown(r)) for r in await crawler.arun(url, config=config)]
+        rank = {u: i for i, u in enumerate(frontier)}
+        pages = [
+            (r, md) async for _, r, md in _scheduled(frontier, crawler, config, Scheduler())
+            if r is not None
+        ]
+        return sorted(pages, key=lambda p: rank.get(p[0].url, len(rank)))
+
+    if strategy == "http":
+        return await _run(await get_pool().http())
+    async with get_pool().acquire() as crawler:
+        return await _run(crawler)
+
+
+def _page_problem(strategy: str, result, markdown: str) -> str | None:
+    """Why a page from *strategy* is unusable (``None`` when it is fine)."""
+    if strategy == "http":
+        return escalation_reason(result, markdown)
+    return None if result.success and markdown.strip() else "failed"
 
 
 async def _async_crawl(
-    url: str, config: CrawlerRunConfig, fallback: CrawlerRunConfig | None = None
-) -> str:
-    """Crawl a single URL (possibly multiple pages) and return joined Markdown.
+    url: str,
+    configs: dict[str, CrawlerRunConfig],
+    plan: list[str],
+    frontier: list[str] | None = None,
+) -> _Crawl:
+    """Crawl a single URL (possibly multiple pages) following a strategy *plan*.
+
+    Strategies (see :mod:`~websearch_bot._profiles`) are tried in order until
+    one returns the seed page: ``http`` runs the whole (deep) crawl over plain
+    HTTP, the browser strategies use the warm :mod:`~websearch_bot._pool`.
+    Once the seed succeeds only the individual pages that failed (or, over
+    HTTP, need JavaScript) are retried with the next browser strategy — the
+    deep crawl itself is never re-run.  Every attempt is recorded in the
+    domain's profile.
 
-    If *fallback* is provided and the primary crawl returns empty content
-    (e.g. networkidle timeout on static sites), retries with the fallback config.
+    Args:
+        url: Seed URL.
+        configs: Strategy name → run config (with the deep-crawl strategy).
+        plan: Strategy names in the order to try them.
+        frontier: Optional sitemap-derived page list (seed first) fetched
+            instead of following links.
+    """
+    crawl = _Crawl()
+    with _track_blocked(crawl.blocked):
+        for i, strategy in enumerate(plan):
+            start = time.perf_counter()
+            try:
+                pages = await _crawl_pages(url, strategy, configs[strategy], frontier)
+            except Exception:
+                pages = []
+            seed_problem = _page_problem(strategy, *pages[0]) if pages else "failed"
+            await record_attempt(url, strategy, seed_problem is None, time.perf_counter() - start)
+            if seed_problem is not None:
+                if strategy == "http":
+                    _note_escalation(crawl.tiers, seed_problem)
+                continue
+
+            crawl.strategy = strategy
+            tier = "http" if strategy == "http" else "browser"
+            retry: list[str] = []
+            for r, md in pages:
+                problem = _page_problem(strategy, r, md)
+                if problem is None:
+                    crawl.add(r, md, tier)
+                else:
+                    retry.append(r.url)
+                    if strategy == "http":
+                        _note_escalation(crawl.tiers, problem)
+
+            retry_with = next((s for s in plan[i + 1:] if s != "http"), None)
+            if retry and retry_with:
+                config = configs[retry_with].clone(deep_crawl_strategy=None)
+                async with get_pool().acquire() as crawler:
+                    async for _, r, md in _scheduled(retry, crawler, config, Scheduler()):
+                        if r is not None and r.success and md.strip():
+                            crawl.add(r, md, "browser")
+            break
+    TIER_STATS.update(crawl.tiers)
+    return crawl
+
+
+async def _scheduled(
+    urls: list[str],
+    crawler,
+    config: CrawlerRunConfig,
+    sched: Scheduler,
+    timing: Counter[str] | None = None,
+    routes: dict[str, CrawlerRunConfig] | None = None,
+    latency: dict[str, int] | None = None,
+) -> AsyncIterator[tuple[str, CrawlResult | None, str]]:
+    """Fetch *urls* with *crawler* under *sched*; yield ``(url, result, markdown)``.
+
+    Results arrive in completion order; *result* is ``None`` when the fetch
+    raised.  With *timing*, HTML → Markdown extraction runs in the worker
+    pool of :mod:`~websearch_bot._extract` (off the event loop) and the
+    total ``fetch_ms`` / ``extract_ms`` are accumulated into it.  *routes*
+    overrides *config* for individual URLs; *latency* receives each URL's
+    fetch + extraction time in milliseconds.
     """
-    async with AsyncWebCrawler(config=_BROWSER) as crawler:
-        results = await crawler.arun(url, config=config)
-        raw = "\n\n".join(_extract_markdown(r) for r in results if r.success)
-        if not raw and fallback is not None:
-            results = await crawler.arun(url, config=fallback)
-            raw = "\n\n".join(_extract_markdown(r) for r in results if r.success)
-        return raw
+    offload = timing is not None and EXTRACT_WORKERS > 0
+    prepared: dict[int, tuple[CrawlerRunConfig, dict]] = {}
+    markdown: dict[str, str] = {}
+
+    def _prepare(c: CrawlerRunConfig) -> tuple[CrawlerRunConfig, dict]:
+        if id(c) not in prepared:
+            prepared[id(c)] = (passthrough(c), scrape_options(c)) if offload else (c, {})
+        return prepared[id(c)]
+
+    async def _fetch(u: str) -> CrawlResult:
+        run_config, options = _prepare((routes or {}).get(u, config))
+        start = time.perf_counter()
+        try:
+            r = await crawler.arun(u, config=run_config)
+            if timing is not None:
+                timing["fetch_ms"] += int((time.perf_counter() - start) * 1000)
+                if offload and r.success:
+                    # Extract inside the scheduled task so pages convert in parallel.
+                    page_options = {**options, "redirected_url": r.redirected_url}
+                    markdown[u], seconds = await aextract(u, r.html or "", page_options)
+                    timing["extract_ms"] += int(seconds * 1000)
+            return r
+        finally:
+            if latency is not None:
+                latency[u] = int((time.perf_counter() - start) * 1000)
+
+    async for url, r in sched.run(urls, _fetch):
+        if r is None or not r.success:
+            yield url, r, ""
+        else:
+            yield url, r, markdown.pop(url) if offload else _extract_markdown(r)
 
 
-async def _async_crawl_many(urls: list[str], config: CrawlerRunConfig) -> str:
-    """Crawl multiple URLs in parallel (up to 5 concurrent sessions).
+async def _http_tier_many(
+    urls: list[str], config: CrawlerRunConfig, crawl: _Crawl, sched: Scheduler
+) -> None:
+    """Fetch *urls* over plain HTTP, adding every usable page to *crawl*.
 
-    Each URL's content is wrapped in a ``## Source: <url>`` section so the
-    caller can tell which content came from which URL.
+    URLs that need the browser are recorded in ``crawl.outcomes`` with
+    status ``escalated`` and the reason as ``error``.
     """
-    async with AsyncWebCrawler(config=_BROWSER) as crawler:
-        results = await crawler.arun_many(
-            urls, config=config,
-            dispatcher=SemaphoreDispatcher(max_session_permit=5),
+    latency: dict[str, int] = {}
+    try:
+        http = await get_pool().http()
+        async for url, r, md in _scheduled(urls, http, config, sched, crawl.timing, latency=latency):
+            reason = escalation_reason(r, md) if r is not None else "failed"
+            if reason is None:
+                crawl.add(r, md, "http")
+                crawl.outcome(url, "ok", "http", r, latency.get(url, 0))
+            else:
+                _note_escalation(crawl.tiers, reason)
+                crawl.outcome(url, "escalated", "http", r, latency.get(url, 0), reason)
+    except Exception:
+        return
+
+
+async def _route(url: str, reason: str | None) -> list[str]:
+    """Browser strategies to try for *url* (first choice, then one retry).
+
+    A strategy the domain's profile has seen succeed goes first; otherwise
+    the HTTP tier's escalation *reason* decides — JavaScript shells get the
+    ``domcontentloaded`` route (scroll + hydration delay), everything else
+    ``networkidle`` with no fixed delay.
+    """
+    profile = await get_profile(url)
+    plan = profile.plan(STRATEGIES[1:])
+    if profile.winner() not in plan and reason in _JS_REASONS:
+        plan.sort(key=lambda strategy: strategy != "domcontentloaded")
+    return plan[:2]
+
+
+async def _browser_tier_many(
+    urls: list[str],
+    reasons: dict[str, str],
+    crawler,
+    config: CrawlerRunConfig,
+    max_concurrency: int | None,
+    per_host: int | None,
+    timing: Counter[str],
+) -> AsyncIterator[tuple[str, CrawlResult | None, str, str, int, int]]:
+    """Render *urls* in the browser, each on its own route; retry failures once.
+
+    Yields:
+        ``(url, result, markdown, strategy, ms, attempts)`` once per URL —
+        the first attempt that produced content, or the last failed one
+        (empty *markdown*); *ms* covers every attempt.  Each attempt is
+        recorded in the domain profile.
+    """
+    plans = {u: await _route(u, reasons.get(u)) for u in urls}
+    routes = {name: config.clone(**overrides) for name, overrides in _ROUTES.items()}
+    pending = list(urls)
+    spent: Counter[str] = Counter()
+    for attempt in range(2):
+        batch = [u for u in pending if len(plans[u]) > attempt]
+        if not batch:
+            return
+        latency: dict[str, int] = {}
+        sched = Scheduler(max_concurrency, per_host)
+        per_url = {u: routes[plans[u][attempt]] for u in batch}
+        async for url, r, md in _scheduled(batch, crawler, config, sched, timing, per_url, latency):
+            strategy = plans[url][attempt]
+            spent[url] += latency.get(url, 0)
+            ok = r is not None and r.success and bool(md.strip())
+            await record_attempt(url, strategy, ok, latency.get(url, 0) / 1000)
+            if ok or attempt + 1 >= len(plans[url]):
+                pending.remove(url)
+                yield url, r, md if ok else "", strategy, spent[url], attempt + 1
+
+
+async def _async_crawl_many(
+    urls: list[str],
+    config: CrawlerRunConfig,
+    max_concurrency: int | None = None,
+    per_host: int | None = None,
+) -> _Crawl:
+    """Crawl multiple URLs in parallel, HTTP tier first.
+
+    Concurrency is governed by :class:`~websearch_bot._sched.Scheduler`:
+    at most *per_host* pages per host, and a global limit (up to
+    *max_concurrency*) that adapts to latency, errors and memory.  Only URLs
+    the HTTP tier could not serve are rendered in the browser, each on the
+    route :func:`_route` picks for it, so only JavaScript-heavy pages pay
+    the scroll and ``delay_before_return_html`` wait; a URL whose first
+    route fails is retried once on the other.  Pages are returned in the
+    order of *urls*; every URL's outcome is in ``crawl.outcomes``.
+    """
+    crawl = _Crawl()
+    await _http_tier_many(urls, config, crawl, Scheduler(max_concurrency, per_host))
+    retry = [u for u in urls if crawl.outcomes.get(u, {}).get("status") != "ok"]
+    if retry:
+        reasons = {u: crawl.outcomes.get(u, {}).get("error", "") for u in retry}
+        with _track_blocked(crawl.blocked):
+            async with get_pool().acquire() as crawler:
+                async for url, r, md, strategy, ms, attempts in _browser_tier_many(
+                    retry, reasons, crawler, config, max_concurrency, per_host, crawl.timing
+                ):
+                    if md:
+                        crawl.add(r, md, "browser")
+                    crawl.outcome(url, "ok" if md else "failed", strategy, r, ms, attempts=attempts)
+    TIER_STATS.update(crawl.tiers)
+    rank = {u: i for i, u in enumerate(urls)}
+    crawl.pages.sort(key=lambda p: rank.get(p[0], len(rank)))
+    return crawl
+
+
+async def _astream_crawl_many(
+    urls: list[str],
+    config: CrawlerRunConfig,
+    max_concurrency: int | None = None,
+    per_host: int | None = None,
+) -> AsyncIterator[tuple[str, str, str]]:
+    """Yield ``(url, markdown, tier)`` for each URL the moment its page completes.
+
+    Fresh crawl-cache entries are yielded first (tier ``cache``).  The rest
+    are fetched under the adaptive scheduler so fast pages are not held back
+    by the slowest one: HTTP-tier pages stream first, then the pages that
+    had to be escalated stream from the browser (routed per URL, as in
+    :func:`_async_crawl_many`).  Failed pages are yielded with empty
+    Markdown.
+    """
+    pending: dict[str, str] = {}
+    counts: Counter[str] = Counter()
+    timing: Counter[str] = Counter()
+    for url in urls:
+        cached = await CRAWL_CACHE.aget(url, _BATCH_CACHE_KEY, counts)
+        if cached:
+            yield url, "\n\n".join(md for _, md in cached), "cache"
+        else:
+            pending[url] = ""
+    if not pending:
+        return
+
+    async def _store(url: str, r, md: str) -> None:
+        await CRAWL_CACHE.aput(
+            url, _BATCH_CACHE_KEY, [(url, md)],
+            {url: getattr(r, "response_headers", None) or {}},
         )
-        parts = []
-        for r in results:
-            text = _extract_markdown(r)
-            if r.success and text.strip():
-                parts.append(f"## Source: {r.url}\n\n{text}")
-        return "\n\n---\n\n".join(parts)
+
+    try:
+        http = await get_pool().http()
+        sched = Scheduler(max_concurrency, per_host)
+        async for url, r, md in _scheduled(list(pending), http, config, sched, timing):
+            if r is None:
+                continue
+            reason = escalation_reason(r, md)
+            if reason is None:
+                pending.pop(url, None)
+                TIER_STATS["http"] += 1
+                await _store(url, r, md)
+                yield url, md, "http"
+            else:
+                pending[url] = reason
+                _note_escalation(TIER_STATS, reason)
+    except Exception:
+        pass
+
+    if not pending:
+        return
+    async with get_pool().acquire() as crawler:
+        async for url, r, md, *_ in _browser_tier_many(
+            list(pending), pending, crawler, config, max_concurrency, per_host, timing
+        ):
+            if md:
+                TIER_STATS["browser"] += 1
+                await _store(url, r, md)
+            yield url, md, "browser"
+
+
+async def _incremental_meta(
+    pages: list[tuple[str, str]], max_chars: int, meta: dict
+) -> list[tuple[str, str]]:
+    """Condense *pages* with :func:`~websearch_bot._incremental.condense`; update *meta*."""
+    original = sum(len(md) for _, md in pages)
+    pages, stats = await condense(pages, max_chars)
+    calls = stats.pop("llm_calls")
+    meta.update(stats)
+    if calls:
+        meta.update(original_chars=original, llm_calls=calls)
+    return pages
 
 
 # ---------------------------------------------------------------------------
@@ -172,7 +548,12 @@ async def _async_crawl_many(urls: list[str], config: CrawlerRunConfig) -> str:
 # ---------------------------------------------------------------------------
 
 
-def wrap_context(content: str, meta: dict) -> str:
+async def awrap_context(
+    content: str,
+    meta: dict,
+    overview: bool = True,
+    overview_input: str | None = None,
+) -> str:
     """Wrap scraped content in a context-engineered Markdown document.
 
     The output structure follows Anthropic / industry best practices (2025–2026):
@@ -189,6 +570,10 @@ def wrap_context(content: str, meta: dict) -> str:
             ``source``, ``type``, ``original_chars``, ``llm_calls``,
             ``llm_compressed``.  Any additional keys are written verbatim
             into the frontmatter.
+        overview: When ``False`` the AI overview (one LLM call) is skipped
+            and the section omitted — used for per-source streaming chunks.
+        overview_input: Text to summarise for the overview instead of
+            *content* (e.g. excerpts of every source for a summary record).
 
     Returns:
         A fully formatted Markdown document string.
@@ -232,29 +617,47 @@ def wrap_context(content: str, meta: dict) -> str:
         if isinstance(v, list):
             lines.append(f"{k}:")
             for item in v:
-                lines.append(f'  - "{item}"')
+                if isinstance(item, dict):
+                    # Table rows (e.g. per-source outcomes) as YAML flow mappings.
+                    fields = ", ".join(
+                        f'{ik}: "{iv.replace(chr(34), chr(39))}"' if isinstance(iv, str)
+                        else f"{ik}: {iv}"
+                        for ik, iv in item.items()
+                    )
+                    lines.append(f"  - {{{fields}}}")
+                else:
+                    lines.append(f'  - "{item}"')
         else:
             lines.append(f"{k}: {v}")
     lines.append("---")
     frontmatter = "\n".join(lines)
 
+    if not overview:
+        return f"{frontmatter}\n\n## Content\n\n{content}"
+
     # Generate a signal-first overview for downstream AI agents.
-    overview_text, _ = call_llm(
+    overview_text, _ = await acall_llm(
         system=(
             "You are a context engineering assistant. Given scraped content, write a precise "
             "2-3 sentence overview for an AI agent covering: (1) what this content is about, "
             "(2) key information it contains, (3) what tasks or questions it is useful for. "
             "Be specific and factual."
         ),
-        user=content[:20_000],  # ~5 K tokens — within every model's TPM budget
+        # ~5 K tokens — within every model's TPM budget
+        user=(overview_input if overview_input is not None else content)[:20_000],
         max_tokens=200,
     )
-    overview = (
+    summary = (
         overview_text
         or "_Overview unavailable — set GROQ_API_KEY or WEBSEARCH_LLM_MODEL to enable._"
     )
 
-    return f"{frontmatter}\n\n## Overview\n\n{overview}\n\n---\n\n## Content\n\n{content}"
+    return f"{frontmatter}\n\n## Overview\n\n{summary}\n\n---\n\n## Content\n\n{content}"
+
+
+def wrap_context(content: str, meta: dict, overview: bool = True) -> str:
+    """Blocking wrapper around :func:`awrap_context`."""
+    return _run_sync(awrap_context(content, meta, overview=overview))
 
 
 # ---------------------------------------------------------------------------
@@ -262,7 +665,9 @@ def wrap_context(content: str, meta: dict) -> str:
 # ---------------------------------------------------------------------------
 
 
-def finalize(raw: str, meta: dict, max_chars: int) -> str:
+async def afinalize(
+    raw: str, meta: dict, max_chars: int, overview: bool = True, query: str | None = None
+) -> str:
     """Compress *raw*, attach compression stats to *meta*, and wrap with context.
 
     This helper eliminates the identical compress → update-meta → wrap pattern
@@ -270,10 +675,16 @@ def finalize(raw: str, meta: dict, max_chars: int) -> str:
 
     Args:
         raw: Raw scraped text (may be very large).
-        meta: Provenance dictionary passed to :func:`wrap_context`.
-            ``original_chars``, ``llm_calls``, and ``llm_compressed`` are
-            added automatically when LLM compression is applied.
-        max_chars: Character budget passed to :func:`~websearch_bot._llm.compress_text`.
+        meta: Provenance dictionary passed to :func:`awrap_context`.
+            ``original_chars``, ``llm_calls``, ``llm_compressed`` and
+            ``llm_calls_predicted`` (from the reduce plan) are added
+            automatically when LLM compression is applied;
+            ``compression_mode`` whenever *raw* was over budget, and
+            ``compression_plan`` when the plan exceeded its budget.
+        max_chars: Character budget passed to :func:`~websearch_bot._llm.acompress_text`.
+        overview: Passed through to :func:`awrap_context`.
+        query: Search query or crawl keywords; compression favours content
+            relevant to it (see :func:`~websearch_bot._llm.acompress_text`).
 
     Returns:
         A context-engineered Markdown document, or ``""`` if *raw* is empty.
@@ -282,17 +693,37 @@ def finalize(raw: str, meta: dict, max_chars: int) -> str:
     # summaries in the GitHub scraper); fall back to len(raw) for other scrapers.
     original_chars = meta.pop("original_chars", len(raw))
     prior_calls = meta.pop("llm_calls", 0)  # calls made before finalize (e.g. per-file summaries)
-    content, compress_calls, llm_used = compress_text(raw, max_chars)
+    plan: dict = {}
+    content, compress_calls, llm_used = await acompress_text(
+        raw, max_chars, report=plan, query=query
+    )
     if not content.strip():
         return ""
     total_calls = prior_calls + compress_calls
-    if total_calls > 0:
+    if total_calls > 0 or "compression_mode" in plan:
         meta.update(
             original_chars=original_chars,
             llm_calls=total_calls,
             llm_compressed=llm_used or bool(prior_calls),
         )
-    return wrap_context(content, meta)
+    if "compression_mode" in plan:
+        meta["compression_mode"] = plan["compression_mode"]
+    if "chunks_skipped" in plan:
+        meta["chunks_skipped"] = plan["chunks_skipped"]
+    if "llm_models" in plan:
+        meta["llm_models"] = plan["llm_models"]
+    if compress_calls or "compression_plan" in plan:
+        meta["llm_calls_predicted"] = prior_calls + plan.get("llm_calls_predicted", 0)
+        if "compression_plan" in plan:
+            meta["compression_plan"] = plan["compression_plan"]
+    return await awrap_context(content, meta, overview=overview)
+
+
+def finalize(
+    raw: str, meta: dict, max_chars: int, overview: bool = True, query: str | None = None
+) -> str:
+    """Blocking wrapper around :func:`afinalize`."""
+    return _run_sync(afinalize(raw, meta, max_chars, overview=overview, query=query))
 
 
 # ---------------------------------------------------------------------------
@@ -300,7 +731,7 @@ def finalize(raw: str, meta: dict, max_chars: int) -> str:
 # ---------------------------------------------------------------------------
 
 
-def scrape_website(
+async def ascrape_website(
     url: str,
     max_pages: int = 5,
     max_depth: int = 1,
@@ -309,6 +740,8 @@ def scrape_website(
     css_selector: str | None = None,
     js_code: list[str] | None = None,
     wait_for: str | None = None,
+    use_sitemap: bool = False,
+    incremental: bool = False,
 ) -> str:
     """Scrape a single website and return a context-engineered Markdown document.
 
@@ -317,7 +750,8 @@ def scrape_website(
         max_pages: Maximum pages to visit during the deep crawl.
         max_depth: Maximum link depth from the seed URL.
         keywords: When provided, BestFirst keyword-relevance scoring is used
-            instead of plain BFS traversal.
+            instead of plain BFS traversal, and compression favours content
+            matching them.
         max_chars: Character budget; content over this limit is LLM-compressed.
         css_selector: Optional CSS selector to extract only a specific page
             region (e.g. ``"main"`` or ``"article.content"``).
@@ -325,13 +759,18 @@ def scrape_website(
             (e.g. click buttons, dismiss modals, trigger lazy loading).
         wait_for: Optional CSS selector (``"css:..."``), XPath (``"xpath:..."``),
             or JS condition (``"js:() => ..."``) to wait for before capture.
+        use_sitemap: Choose the pages from the site's ``robots.txt`` /
+            ``sitemap.xml`` (ranked by *keywords*) and fetch them directly
+            instead of following links; *max_depth* is then ignored.  Falls
+            back to the link-following crawl when there is no sitemap.
+        incremental: Condense page by page and reuse the summaries stored
+            by earlier runs for pages whose content has not changed (see
+            :mod:`~websearch_bot._incremental`).
 
     Returns:
         A context-engineered Markdown document, or ``""`` on failure.
     """
     try:
-        strategy = _make_strategy(max_depth, max_pages, keywords)
-
         # Build per-call overrides from optional args.
         overrides: dict = {}
         if css_selector:
@@ -341,57 +780,424 @@ def scrape_website(
         if wait_for:
             overrides["wait_for"] = wait_for
 
-        config = CrawlerRunConfig(**{**_BASE, **overrides}, deep_crawl_strategy=strategy)
-
-        # Fallback: domcontentloaded + full-page scroll for lazy-loaded content.
-        fallback = CrawlerRunConfig(
-            **{
-                **_BASE,
-                **overrides,
-                "wait_until": "domcontentloaded",
-                "remove_overlay_elements": False,
-                "delay_before_return_html": 1.5,
-                "scan_full_page": True,   # scroll to trigger lazy loading
-            },
-            deep_crawl_strategy=strategy,
-        )
-        raw = _run_sync(_async_crawl(url, config, fallback=fallback))
+        cache_opts = {
+            **overrides, "max_pages": max_pages, "max_depth": max_depth, "keywords": keywords,
+            "use_sitemap": use_sitemap,
+        }
+        cache_counts: Counter[str] = Counter()
+        pages = await CRAWL_CACHE.aget(url, cache_opts, cache_counts)
+        tiers: Counter[str] = Counter()
+        blocked: Counter[str] = Counter()
+        served_by = "cache"
+        frontier: list[str] | None = None
+        if pages is None:
+            # Custom JS or wait conditions only make sense in a real browser.
+            allowed = STRATEGIES if not (js_code or wait_for) else STRATEGIES[1:]
+            plan = (await get_profile(url)).plan(allowed)
+            frontier = await build_frontier(url, keywords, max_pages) if use_sitemap else None
+
+            # Each config gets its own deep-crawl strategy: strategies keep
+            # per-run state (pages visited) and several may run for one call.
+            def _config(**extra) -> CrawlerRunConfig:
+                return CrawlerRunConfig(
+                    **{**_BASE, **overrides, **extra},
+                    deep_crawl_strategy=_make_strategy(max_depth, max_pages, keywords, frontier),
+                )
+
+            configs = {
+                "http": _config(),
+                "networkidle": _config(),
+                # Fallback: domcontentloaded + full-page scroll for lazy-loaded content.
+                "domcontentloaded": _config(
+                    wait_until="domcontentloaded",
+                    remove_overlay_elements=False,
+                    delay_before_return_html=1.5,
+                    scan_full_page=True,   # scroll to trigger lazy loading
+                ),
+            }
+            crawl = await _async_crawl(url, configs, plan, frontier)
+            await CRAWL_CACHE.aput(url, cache_opts, crawl.pages, crawl.headers)
+            pages, tiers = crawl.pages, crawl.tiers
+            # No strategy returned the seed page: report that, not "None".
+            served_by = crawl.strategy or "failed"
+            blocked = crawl.blocked
+        pages, boilerplate = strip_boilerplate(pages)
+        pages, dedup = dedup_pages(pages)
         meta: dict = {
             "source": url, "type": "website_crawl",
             "max_pages": max_pages, "max_depth": max_depth,
+            "fetch_tiers": _tier_summary(tiers),
+            "crawl_strategy": served_by,
+            "cache": _cache_summary(cache_counts),
+            **dedup,
+            "boilerplate_saved_chars": boilerplate,
         }
+        if blocked:
+            meta["blocked"] = _blocked_summary(blocked)
+        if frontier:
+            meta["frontier"] = f"sitemap ({len(frontier)} urls)"
         if keywords:
             meta["keywords"] = keywords
         if css_selector:
             meta["css_selector"] = css_selector
-        return finalize(raw, meta, max_chars)
+        if incremental:
+            budget = max_chars - 2 * len(pages)  # leave room for the joins
+            pages = await _incremental_meta(pages, budget, meta)
+        raw = "\n\n".join(md for _, md in pages)
+        return await afinalize(raw, meta, max_chars, query=" ".join(keywords or []) or None)
     except Exception:
         return ""
 
 
-def scrape_many(urls: list[str], max_chars: int = MAX_CHARS) -> str:
-    """Batch-scrape multiple URLs in parallel (up to 5 concurrent).
+def scrape_website(
+    url: str,
+    max_pages: int = 5,
+    max_depth: int = 1,
+    keywords: list[str] | None = None,
+    max_chars: int = MAX_CHARS,
+    css_selector: str | None = None,
+    js_code: list[str] | None = None,
+    wait_for: str | None = None,
+    use_sitemap: bool = False,
+    incremental: bool = False,
+) -> str:
+    """Blocking wrapper around :func:`ascrape_website`."""
+    return _run_sync(ascrape_website(
+        url,
+        max_pages=max_pages,
+        max_depth=max_depth,
+        keywords=keywords,
+        max_chars=max_chars,
+        css_selector=css_selector,
+        js_code=js_code,
+        wait_for=wait_for,
+        use_sitemap=use_sitemap,
+        incremental=incremental,
+    ))
+
+
+async def _acrawl_batch(
+    urls: list[str],
+    max_concurrency: int | None,
+    per_host: int | None,
+    cache_counts: Counter[str],
+) -> tuple[list[tuple[str, str]], _Crawl]:
+    """Serve *urls* from the crawl cache or crawl them; return pages in *urls* order."""
+    cached = await asyncio.gather(
+        *(CRAWL_CACHE.aget(u, _BATCH_CACHE_KEY, cache_counts) for u in urls)
+    )
+    texts = {u: c[0][1] for u, c in zip(urls, cached, strict=True) if c}
+    misses = [u for u in urls if u not in texts]
+    crawl = (
+        await _async_crawl_many(misses, CrawlerRunConfig(**_BATCH), max_concurrency, per_host)
+        if misses else _Crawl()
+    )
+    for u in texts:
+        crawl.outcome(u, "cached", "cache", attempts=0)
+    for u, text in crawl.pages:
+        texts[u] = text
+        await CRAWL_CACHE.aput(u, _BATCH_CACHE_KEY, [(u, text)], crawl.headers)
+    pages = [(u, texts[u]) for u in urls if u in texts]
+    pages += [(u, t) for u, t in texts.items() if u not in urls]
+    return pages, crawl
+
+
+def _sources(
+    urls: list[str], crawl: _Crawl, dropped: set[str], failures_only: bool = False
+) -> list[dict]:
+    """Per-source outcome rows in *urls* order; URLs in *dropped* were duplicates."""
+    rows = []
+    for u in urls:
+        row = dict(crawl.outcomes.get(u) or dict.fromkeys(_OUTCOME_FIELDS, 0) | {
+            "url": u, "status": "failed", "tier": "", "error": "not fetched",
+        })
+        if u in dropped:
+            row["status"] = "duplicate"
+        if not failures_only or row["status"] in ("failed", "escalated"):
+            rows.append(row)
+    return rows
+
+
+def _batch_meta(crawl: _Crawl, cache_counts: Counter[str], dedup: dict[str, int]) -> dict:
+    meta: dict = {
+        "fetch_tiers": _tier_summary(crawl.tiers),
+        "cache": _cache_summary(cache_counts),
+        **dedup,
+    }
+    if crawl.blocked:
+        meta["blocked"] = _blocked_summary(crawl.blocked)
+    if crawl.timing:
+        meta.update(fetch_ms=crawl.timing["fetch_ms"], extract_ms=crawl.timing["extract_ms"])
+    return meta
+
+
+async def _ascrape_spilled(
+    urls: list[str],
+    max_chars: int,
+    max_concurrency: int | None,
+    per_host: int | None,
+    incremental: bool,
+    query: str | None = None,
+) -> str:
+    """Spill-mode :func:`ascrape_many`: windowed crawl, pages kept on disk.
+
+    See :mod:`websearch_bot._spill`.  Only one window of pages and a couple
+    of compression groups are held in memory at any time.
+    """
+    cache_counts: Counter[str] = Counter()
+    totals = _Crawl()
+    deduper = Deduper()
+    failures: list[dict] = []
+    with SpillStore() as store:
+        windows = range(0, len(urls), SPILL_WINDOW)
+        for start in windows:
+            # Backpressure: the next window is fetched once this one is on disk.
+            window = urls[start:start + SPILL_WINDOW]
+            pages, crawl = await _acrawl_batch(window, max_concurrency, per_host, cache_counts)
+            totals.tiers.update(crawl.tiers)
+            totals.blocked.update(crawl.blocked)
+            totals.timing.update(crawl.timing)
+            kept = [(u, md) for u, raw in pages if (md := deduper.add(raw)) is not None]
+            failures += _sources(window, crawl, set(), failures_only=True)
+            await asyncio.to_thread(store.append, kept)
+            del pages, crawl, kept
+        if not store.pages:
+            return ""
+        meta: dict = {
+            "source": "batch", "type": "batch_crawl", "url_count": len(urls),
+            **_batch_meta(totals, cache_counts, deduper.stats()),
+            "spilled": f"{store.pages} pages in {len(windows)} windows",
+        }
+        if failures:
+            # Thousands of rows would swamp the frontmatter — list failures only.
+            meta["failed_sources"] = failures
+        original = store.chars
+        raw, stats = await acondense(store, max_chars, _join_sources, incremental, query)
+    calls = stats.pop("llm_calls")
+    meta.update(stats)
+    if calls:
+        meta.update(original_chars=original, llm_calls=calls)
+    return await afinalize(raw, meta, max_chars, query=query)
+
+
+async def ascrape_many(
+    urls: list[str],
+    max_chars: int = MAX_CHARS,
+    max_concurrency: int | None = None,
+    per_host: int | None = None,
+    incremental: bool = False,
+    spill: bool | None = None,
+    query: str | None = None,
+) -> str:
+    """Batch-scrape multiple URLs in parallel under the adaptive scheduler.
 
     Each URL's content is clearly labelled with a ``## Source:`` heading.
+    URLs with a fresh (or successfully revalidated) crawl-cache entry are
+    not fetched at all.
+
+    Batches of more than ``WEBSEARCH_SPILL_THRESHOLD`` URLs (or any batch
+    with ``spill=True``) are crawled in windows and spilled to disk, so
+    memory stays bounded regardless of batch size (see
+    :mod:`~websearch_bot._spill`).
 
     Args:
         urls: List of URLs to scrape.
         max_chars: Character budget; content over this limit is LLM-compressed.
+        max_concurrency: Upper bound on pages fetched at once (default
+            ``WEBSEARCH_MAX_CONCURRENCY``); the actual limit adapts below it.
+        per_host: Max pages fetched at once from one host (default
+            ``WEBSEARCH_PER_HOST``).
+        incremental: Reuse stored per-page summaries for unchanged pages.
+        spill: Force (``True``) or disable (``False``) spill mode; by default
+            it is used above ``WEBSEARCH_SPILL_THRESHOLD`` URLs.
+        query: The search query the URLs answer; compression skips
+            off-topic chunks and focuses on it.  Not applied to
+            *incremental* summaries, which are reused across queries.
 
     Returns:
         A context-engineered Markdown document, or ``""`` if every URL fails.
     """
     try:
-        cfg = {
-            **_BASE,
-            "excluded_tags": ["script", "style"],
-            "wait_until": "domcontentloaded",
-            "remove_overlay_elements": False,   # JS-rendered sites start hidden
-            "delay_before_return_html": 1.5,    # let hydration complete
-            "scan_full_page": True,             # scroll to trigger lazy loading
+        if spill if spill is not None else len(urls) > SPILL_THRESHOLD:
+            return await _ascrape_spilled(
+                urls, max_chars, max_concurrency, per_host, incremental, query
+            )
+        cache_counts: Counter[str] = Counter()
+        pages, crawl = await _acrawl_batch(urls, max_concurrency, per_host, cache_counts)
+        fetched = [u for u, _ in pages]
+        pages, dedup = dedup_pages(pages)
+        dropped = set(fetched) - {u for u, _ in pages}
+        meta: dict = {
+            "source": "batch", "type": "batch_crawl", "urls": urls,
+            **_batch_meta(crawl, cache_counts, dedup),
+            "sources": _sources(urls, crawl, dropped),
         }
-        raw = _run_sync(_async_crawl_many(urls, CrawlerRunConfig(**cfg)))
-        meta: dict = {"source": "batch", "type": "batch_crawl", "urls": urls}
-        return finalize(raw, meta, max_chars)
+        if query:
+            meta["query"] = query
+        if incremental:
+            # Leave room for the "## Source:" headings and separators.
+            budget = max_chars - len(_join_sources([(u, "") for u, _ in pages]))
+            pages = await _incremental_meta(pages, budget, meta)
+        raw = _join_sources(pages)
+        return await afinalize(raw, meta, max_chars, query=query)
     except Exception:
         return ""
+
+
+def scrape_many(
+    urls: list[str],
+    max_chars: int = MAX_CHARS,
+    max_concurrency: int | None = None,
+    per_host: int | None = None,
+    incremental: bool = False,
+    spill: bool | None = None,
+    query: str | None = None,
+) -> str:
+    """Blocking wrapper around :func:`ascrape_many`."""
+    return _run_sync(ascrape_many(
+        urls,
+        max_chars=max_chars,
+        max_concurrency=max_concurrency,
+        per_host=per_host,
+        incremental=incremental,
+        spill=spill,
+        query=query,
+    ))
+
+
+# ---------------------------------------------------------------------------
+# Streaming
+# ---------------------------------------------------------------------------
+
+
+async def asummary_record(
+    sources: list[tuple[str, str]],
+    failed: list[str],
+    duplicates: list[str] | None = None,
+) -> str:
+    """Build the closing record of a stream: source list plus a combined overview.
+
+    Args:
+        sources: ``(url, document)`` pairs already yielded to the caller.
+        failed: URLs that produced no content.
+        duplicates: URLs skipped as near-duplicates of an earlier source.
+
+    Returns:
+        A context-engineered Markdown document of ``type: stream_summary``.
+    """
+    lines = [f"- {url} — {len(doc):,} chars" for url, doc in sources]
+    lines += [f"- {url} — failed" for url in failed]
+    lines += [f"- {url} — duplicate" for url in duplicates or []]
+    share = 20_000 // max(len(sources), 1)
+    meta: dict = {
+        "source": "stream",
+        "type": "stream_summary",
+        "sources_ok": len(sources),
+        "sources_failed": len(failed),
+    }
+    if failed:
+        meta["failed"] = failed
+    if duplicates:
+        meta["duplicates_removed"] = len(duplicates)
+    return await awrap_context(
+        "\n".join(lines),
+        meta,
+        overview=bool(sources),
+        overview_input="\n\n".join(doc[:share] for _, doc in sources),
+    )
+
+
+async def astream_many(
+    urls: list[str],
+    max_chars: int = MAX_CHARS,
+    extra: Mapping[str, Callable[[int], Awaitable[str]]] | None = None,
+    max_concurrency: int | None = None,
+    per_host: int | None = None,
+    query: str | None = None,
+) -> AsyncIterator[str]:
+    """Yield one context-engineered document per source as soon as it is ready.
+
+    Pages are fetched under the adaptive per-host scheduler — HTTP tier
+    first, the browser only for pages that need it — and each source is
+    compressed to an equal share of *max_chars* and yielded as soon as its
+    page completes, without waiting for the rest of the batch.  Near-duplicates
+    of an earlier source are skipped and listed in the summary.  A
+    ``stream_summary`` record with an AI overview of every source is always
+    yielded last.
+
+    Args:
+        urls: URLs to crawl (HTTP tier first, browser when needed).
+        max_chars: Character budget shared by all sources.
+        extra: Optional ``url → factory`` of already-finalized documents
+            (e.g. GitHub scrapes) merged into the same stream.  Each factory
+            is called with the per-source character budget and only once the
+            stream is consumed, so closing the stream early leaves no
+            coroutine un-awaited.
+        max_concurrency: Upper bound on pages fetched at once.
+        per_host: Max pages fetched at once from one host.
+        query: Search query each source is compressed towards.
+
+    Yields:
+        Markdown documents of ``type: stream_source``, then the summary record.
+    """
+    extra = extra or {}
+    total = len(urls) + len(extra)
+    budget = max_chars // max(total, 1)
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def _crawl_producer() -> None:
+        try:
+            pages = _astream_crawl_many(
+                urls, CrawlerRunConfig(**_BATCH), max_concurrency, per_host
+            )
+            async for url, text, tier in pages:
+                await queue.put((url, text, tier))
+        except Exception:
+            pass
+        finally:
+            await queue.put(None)
+
+    async def _doc_producer(url: str, job: Callable[[int], Awaitable[str]]) -> None:
+        try:
+            await queue.put((url, await job(budget), None))
+        except Exception:
+            await queue.put((url, "", None))
+        finally:
+            await queue.put(None)
+
+    tasks = [asyncio.ensure_future(_doc_producer(u, j)) for u, j in extra.items()]
+    if urls:
+        tasks.append(asyncio.ensure_future(_crawl_producer()))
+
+    sources: list[tuple[str, str]] = []
+    duplicates: list[str] = []
+    deduper = Deduper()
+    live = len(tasks)
+    try:
+        while live:
+            item = await queue.get()
+            if item is None:
+                live -= 1
+                continue
+            url, text, tier = item
+            doc = text
+            if tier is not None and text.strip():  # raw crawl output, not a finished doc
+                text = deduper.add(text)
+                if text is None:
+                    duplicates.append(url)
+                    continue
+                meta: dict = {
+                    "source": url, "type": "stream_source",
+                    "index": len(sources) + 1, "total": total, "tier": tier,
+                }
+                doc = await afinalize(text, meta, budget, overview=False, query=query)
+            if doc:
+                sources.append((url, doc))
+                yield doc
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    done = {url for url, _ in sources} | set(duplicates)
+    failed = [u for u in [*urls, *extra] if u not in done]
+    yield await asummary_record(sources, failed, duplicates)
@@ -0,0 +1,186 @@
+"""Near-duplicate elimination for crawled pages, before compression.
+
+Deep crawls and batch searches often return the same content under
+different URLs — mirrors, ``?ref=`` variants, print versions, syndicated
+articles.  Everything that reaches :func:`~websearch_bot._llm.compress_text`
+costs LLM calls, so pages pass through a :class:`Deduper` first:
+
+* **Near-duplicate pages** — each page gets a 64-bit SimHash over word
+  3-shingles; a page within :data:`_MAX_DISTANCE` bits of one already kept
+  is dropped.
+* **Repeated blocks** — paragraphs (blank-line separated, with fenced code
+  blocks kept whole) of at least :data:`_MIN_BLOCK_CHARS` characters that
+  already appeared on an earlier page are removed, keeping the first copy.
+  A page left with nothing else is dropped as a duplicate.
+
+The deduper is incremental, so streaming crawls can use it page by page.
+
+:func:`strip_boilerplate` is a separate, site-level pass for deep crawls of
+one site: ``PruningContentFilter`` works per page, so sidebars, cookie
+notices, version pickers and footers that survive it repeat on every page.
+Blocks of at least :data:`_BOILERPLATE_MIN_CHARS` characters found on more
+than :data:`_BOILERPLATE_SHARE` of the pages (of a crawl of at least
+:data:`_BOILERPLATE_MIN_PAGES`) are kept on the first page only.  Headings
+and fenced code blocks are content and never stripped.
+
+Example:
+    >>> pages, stats = dedup_pages([(url_a, md_a), (url_b, md_b)])
+    >>> stats
+    {'duplicates_removed': 1, 'dedup_saved_chars': 10432}
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+
+from ._chunk import _blank, _never, _split_lines
+
+__all__ = ["Deduper", "dedup_pages", "simhash", "strip_boilerplate"]
+
+# Pages whose SimHashes differ in at most this many bits are near-duplicates.
+_MAX_DISTANCE = 3
+# Shorter blocks (headings, "Next →" links) are too generic to dedup globally.
+_MIN_BLOCK_CHARS = 200
+# Pages with fewer words than this are never treated as duplicates.
+_MIN_WORDS = 20
+
+# A block on more than this share of a site's pages is boilerplate …
+_BOILERPLATE_SHARE = 0.5
+# … provided the crawl has at least this many pages to compare …
+_BOILERPLATE_MIN_PAGES = 5
+# … and the block is at least this long.
+_BOILERPLATE_MIN_CHARS = 30
+
+_WORD_RE = re.compile(r"\w+")
+_LINK_TARGET_RE = re.compile(r"\]\([^)]*\)")
+_HEADING_RE = re.compile(r"^#{1,6}\s", re.MULTILINE)
+_FENCE_RE = re.compile(r"^\s{0,3}(`{3,}|~{3,})")
+
+
+def _hash64(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text: str) -> int:
+    """Return the 64-bit SimHash of *text* over lower-cased word 3-shingles."""
+    words = _WORD_RE.findall(text.lower())
+    shingles = [" ".join(words[i:i + 3]) for i in range(max(len(words) - 2, 1))]
+    weights = [0] * 64
+    for shingle in shingles:
+        h = _hash64(shingle)
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit, w in enumerate(weights) if w > 0)
+
+
+def _block_key(block: str) -> str:
+    return hashlib.blake2b(" ".join(block.lower().split()).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class Deduper:
+    """Incremental near-duplicate filter; feed pages in priority order."""
+
+    def __init__(self) -> None:
+        self._hashes: list[int] = []
+        self._blocks: set[str] = set()
+        self.duplicates_removed = 0
+        self.saved_chars = 0
+
+    def add(self, markdown: str) -> str | None:
+        """Return *markdown* with repeated blocks removed, or ``None`` if it is a duplicate."""
+        if len(_WORD_RE.findall(markdown)) >= _MIN_WORDS:
+            h = simhash(markdown)
+            if any(bin(h ^ seen).count("1") <= _MAX_DISTANCE for seen in self._hashes):
+                self.duplicates_removed += 1
+                self.saved_chars += len(markdown)
+                return None
+            self._hashes.append(h)
+
+        kept: list[str] = []
+        for block in _split_lines(markdown, _never, _blank):
+            if len(block.strip()) >= _MIN_BLOCK_CHARS:
+                key = _block_key(block)
+                if key in self._blocks:
+                    self.saved_chars += len(block)
+                    continue
+                self._blocks.add(key)
+            kept.append(block)
+        text = "".join(kept)
+        if not text.strip():  # nothing but blocks seen before
+            self.duplicates_removed += 1
+            return None
+        return text
+
+    def stats(self) -> dict[str, int]:
+        """Frontmatter counters: ``duplicates_removed`` and ``dedup_saved_chars``."""
+        return {"duplicates_removed": self.duplicates_removed, "dedup_saved_chars": self.saved_chars}
+
+
+def dedup_pages(pages: list[tuple[str, str]]) -> tuple[list[tuple[str, str]], dict[str, int]]:
+    """Drop near-duplicate pages and repeated blocks from ``(url, markdown)`` pairs.
+
+    Returns:
+        The surviving pages (order preserved) and :meth:`Deduper.stats`.
+    """
+    deduper = Deduper()
+    kept = [(url, md) for url, raw in pages if (md := deduper.add(raw)) is not None]
+    return kept, deduper.stats()
+
+
+def _strippable(block: str) -> bool:
+    """Whether *block* may be boilerplate: long enough, no heading, not code."""
+    return (
+        len(block.strip()) >= _BOILERPLATE_MIN_CHARS
+        and not _HEADING_RE.search(block)
+        and not _FENCE_RE.match(block)
+    )
+
+
+def _boilerplate_key(block: str) -> str:
+    """Normalize a block so per-page variations (link targets, case, spacing) match."""
+    text = _LINK_TARGET_RE.sub("]", block.lower())
+    return " ".join(text.split())
+
+
+def strip_boilerplate(
+    pages: list[tuple[str, str]],
+) -> tuple[list[tuple[str, str]], int]:
+    """Remove blocks repeated across most pages of one site, keeping one copy.
+
+    Args:
+        pages: ``(url, markdown)`` pairs from a single-site crawl, seed first.
+
+    Returns:
+        The cleaned pages (same order; pages left empty are dropped) and the
+        number of characters removed.
+    """
+    if len(pages) < _BOILERPLATE_MIN_PAGES:
+        return pages, 0
+    split = [_split_lines(md, _never, _blank) for _, md in pages]
+    counts: dict[str, int] = {}
+    for blocks in split:
+        for key in {_boilerplate_key(b) for b in blocks if _strippable(b)}:
+            counts[key] = counts.get(key, 0) + 1
+    threshold = len(pages) * _BOILERPLATE_SHARE
+    common = {key for key, n in counts.items() if n > threshold}
+    if not common:
+        return pages, 0
+
+    seen: set[str] = set()
+    saved = 0
+    cleaned: list[tuple[str, str]] = []
+    for (url, _), blocks in zip(pages, split, strict=True):
+        kept: list[str] = []
+        for block in blocks:
+            key = _boilerplate_key(block)
+            if key in common and _strippable(block):
+                if key in seen:
+                    saved += len(block)
+                    continue
+                seen.add(key)
+            kept.append(block)
+        text = "".join(kept)
+        if text.strip():
+            cleaned.append((url, text))
+    return cleaned, saved
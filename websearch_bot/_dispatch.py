@@ -0,0 +1,143 @@
+"""Spread a fan-out of LLM calls across the whole model pool.
+
+Every call of a map-reduce level used to start at ``PRIMARY``, with chunks
+sized for the primary's per-minute token budget; the rest of the Groq
+catalog — each model with its own TPM / RPM budget — only saw traffic once
+the primary was exhausted or failing.  This module plans a level across
+the pool instead, before any of its calls is made:
+
+* :func:`pool_chunk_model` picks the model whose chunk size (see
+  :func:`~websearch_bot._chunk.chunk_tokens`) lets the most aggregate TPM
+  take part: a chunk whose request exceeds a model's whole per-minute
+  budget, or its context window, can never be sent to it.  The largest
+  size within :data:`_THROUGHPUT_SHARE` of the best throughput wins, as
+  smaller chunks mean more calls.  With the free-tier catalog this trades
+  the primary's 6 K-token chunks, which fit six models, for 4 K-token
+  chunks that fit nine (all but allam-2-7b, whose context is 4 K).
+* :func:`assign` hands each request to the model that can **start it
+  soonest**, judged from the limiter's current bucket levels
+  (:meth:`~websearch_bot._ratelimit.RateLimiter.remaining`) minus what has
+  already been assigned to it; ties go to the earlier model of the chain,
+  so preference order still decides while budget is plentiful.  Models
+  without published limits, and every model when client-side limiting is
+  off, can always start at once.
+
+The assignment is a first choice only: :func:`~websearch_bot._llm.acall_llm`
+tries the assigned model first and still falls back along the chain, so a
+model whose budget was taken in the meantime, or that fails, costs nothing
+but a reroute.
+
+Example:
+    >>> chain = ["groq/llama-3.3-70b-versatile", "groq/meta-llama/llama-4-scout-17b-16e-instruct"]
+    >>> assign(chain, [5_000] * 4)     # 12 K and 30 K TPM, buckets full
+    ['groq/llama-3.3-70b-versatile', 'groq/llama-3.3-70b-versatile',
+     'groq/meta-llama/llama-4-scout-17b-16e-instruct', 'groq/meta-llama/llama-4-scout-17b-16e-instruct']
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from ._chunk import _CONTEXT, chunk_tokens
+from ._groq import MODEL_TPM
+from ._ratelimit import _BUCKETS, LIMITER
+
+__all__ = ["aassign", "assign", "pool_chunk_model"]
+
+# Chunk sizes whose pool throughput is at least this share of the best
+# one's count as equally good; the largest of them is used.
+_THROUGHPUT_SHARE = 0.9
+
+
+def _tpm(model: str) -> float:
+    """*model*'s catalog tokens per minute (unlimited when unpublished)."""
+    return MODEL_TPM.get(model, float("inf"))
+
+
+def _fits(model: str, tokens: int) -> bool:
+    """Whether a request of *tokens* can ever go to *model*.
+
+    Both its TPM and its context window (when known) must cover it.
+    """
+    return _tpm(model) >= tokens and tokens <= _CONTEXT.get(model, tokens)
+
+
+def pool_chunk_model(models: list[str], overhead: float = 1.0) -> str:
+    """The model of *models* whose chunk size the most pool TPM can take.
+
+    A chunk of ``chunk_tokens(m)`` tokens makes a request of about
+    ``overhead`` times that (prompt plus summary); the pool's throughput at
+    that size is the summed TPM of every model that can take one such
+    request (:func:`_fits`).  Of the sizes within :data:`_THROUGHPUT_SHARE`
+    of the best throughput, the largest wins (fewer calls).
+    """
+    def throughput(model: str) -> float:
+        tokens = int(chunk_tokens(model) * overhead)
+        return sum(_tpm(m) for m in models if _fits(m, tokens))
+
+    scores = {m: throughput(m) for m in models}
+    best = max(scores.values())
+    good = [m for m in models if scores[m] >= best * _THROUGHPUT_SHARE]
+    return max(good, key=chunk_tokens)
+
+
+def _levels(models: list[str]) -> dict[str, dict[str, float]]:
+    """Current bucket levels per model; full buckets where the state store failed."""
+    return {m: {**LIMITER.limits.get(m, {}), **LIMITER.remaining(m)} for m in models}
+
+
+def assign(
+    models: list[str],
+    requests: list[int],
+    levels: dict[str, dict[str, float]] | None = None,
+) -> list[str | None]:
+    """Pick a model of *models* (in preference order) for each of *requests*.
+
+    Args:
+        models: Candidate models, most preferred first.
+        requests: Estimated tokens of each call (prompt plus ``max_tokens``).
+        levels: Bucket levels per model, as read by :func:`aassign`; read
+            from the limiter when omitted.
+
+    Returns:
+        One model per request, in the same order — ``None`` where no model's
+        budget can ever cover the request (the caller's full chain is used).
+    """
+    levels = levels if levels is not None else _levels(models)
+
+    def start(model: str, tokens: int) -> float:
+        """Seconds until *model* has budget for *tokens* more."""
+        wait = 0.0
+        for bucket, capacity in LIMITER.limits.get(model, {}).items():
+            need = tokens if bucket.startswith("t") else 1
+            deficit = need - levels[model][bucket]
+            if deficit > 0:
+                wait = max(wait, deficit * _BUCKETS[bucket][1] / capacity)
+        return wait
+
+    chosen: list[str | None] = [None] * len(requests)
+    # Largest first, so big requests claim the roomy budgets.
+    for i in sorted(range(len(requests)), key=lambda k: -requests[k]):
+        tokens = requests[i]
+        eligible = [m for m in models if _fits(m, tokens)]
+        if not eligible:
+            continue
+        model = min(eligible, key=lambda m: (start(m, tokens), models.index(m)))
+        chosen[i] = model
+        for bucket in LIMITER.limits.get(model, {}):
+            levels[model][bucket] -= tokens if bucket.startswith("t") else 1
+    return chosen
+
+
+async def aassign(models: list[str], requests: list[int]) -> list[str | None]:
+    """Async :func:`assign`.
+
+    Reading the bucket levels refills them in a transaction, which in
+    shared mode is a blocking SQLite write — so they are read once, in a
+    worker thread.
+    """
+    if LIMITER.shared:
+        levels = await asyncio.to_thread(_levels, models)
+    else:
+        levels = _levels(models)
+    return assign(models, requests, levels)
@@ -0,0 +1,149 @@
+"""HTML → Markdown extraction in a process pool for batch crawls.
+
+LXML scraping, ``PruningContentFilter`` scoring and
+``DefaultMarkdownGenerator`` are CPU-bound.  Inside ``crawler.arun`` they
+run on the event loop that also drives the browser and the HTTP tier, so a
+few large pages stall every other in-flight fetch.  Batch crawls therefore
+fetch with a *passthrough* run config (no scraping, no Markdown) and hand
+the raw HTML to worker processes, which apply the exact same scraping
+strategy and Markdown generator as the in-loop path, with every plain
+setting of the run config forwarded to the scraper as crawl4ai does.
+Workers load only :mod:`websearch_bot._scrape` for those objects.
+
+Deep crawls keep in-loop extraction: crawl4ai needs the scraped links to
+discover the next pages.
+
+Environment:
+    WEBSEARCH_EXTRACT_WORKERS: Worker processes (default CPU cores − 1);
+        ``0`` keeps extraction on the event loop.
+
+Example:
+    >>> markdown, seconds = await aextract(url, html, scrape_options(config))
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import multiprocessing
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from crawl4ai import CrawlerRunConfig
+from crawl4ai.content_scraping_strategy import ContentScrapingStrategy
+from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+from crawl4ai.models import Links, Media, ScrapingResult
+
+__all__ = ["WORKERS", "passthrough", "scrape_options", "aextract", "shutdown"]
+
+WORKERS: int = int(os.getenv("WEBSEARCH_EXTRACT_WORKERS", str(max((os.cpu_count() or 2) - 1, 1))))
+
+# Config values forwarded to the workers; strategy objects, hooks and
+# other callables stay behind (the workers use the _scrape ones).
+_PLAIN = (type(None), bool, int, float, str, list, tuple, dict)
+_BASE_HREF_RE = re.compile(r'<base\s[^>]*href\s*=\s*["\']([^"\']+)["\']', re.I)
+
+_LOCK = threading.Lock()
+_EXECUTOR: ProcessPoolExecutor | None = None
+
+
+class _PassthroughScraping(ContentScrapingStrategy):
+    """Scraping strategy that does nothing — the raw ``result.html`` is kept."""
+
+    # crawl4ai attaches its logger to the strategy before scraping.
+    logger = None
+
+    def scrap(self, url: str, html: str, **kwargs) -> ScrapingResult:
+        return ScrapingResult(cleaned_html="", success=True, media=Media(), links=Links(), metadata={})
+
+    async def ascrap(self, url: str, html: str, **kwargs) -> ScrapingResult:
+        return self.scrap(url, html, **kwargs)
+
+
+_PASSTHROUGH = _PassthroughScraping()
+_NO_MARKDOWN = DefaultMarkdownGenerator()
+
+
+def passthrough(config: CrawlerRunConfig) -> CrawlerRunConfig:
+    """Return a copy of *config* that only fetches (extraction happens in :func:`aextract`)."""
+    return config.clone(scraping_strategy=_PASSTHROUGH, markdown_generator=_NO_MARKDOWN)
+
+
+def scrape_options(config: CrawlerRunConfig) -> dict:
+    """Picklable settings of *config*, as crawl4ai passes them to the scraper.
+
+    crawl4ai hands the scraping strategy the whole config as keyword
+    arguments; every plain value is forwarded, so per-call overrides
+    (``css_selector``, ``excluded_tags``, ``target_elements``, …) apply in
+    the workers exactly as they do in-loop.
+    """
+    return {
+        name: value
+        for name, value in vars(config).items()
+        if name != "url" and isinstance(value, _PLAIN)
+    }
+
+
+def _html_to_markdown(url: str, html: str, options: dict) -> tuple[str, float]:
+    """Worker: scrape *html* and generate Markdown; return ``(markdown, seconds)``."""
+    start = time.perf_counter()
+    # Same strategy objects as the in-loop path (imported once per worker).
+    from ._scrape import _BASE
+
+    scraped = _BASE["scraping_strategy"].scrap(url, html, **options)
+    # Links resolve against <base href>, else the final URL, as in crawl4ai.
+    base = _BASE_HREF_RE.search(html)
+    base_url = (
+        base.group(1) if base else options.get("base_url") or options.get("redirected_url") or url
+    )
+    md = _BASE["markdown_generator"].generate_markdown(
+        input_html=scraped.cleaned_html, base_url=base_url
+    )
+    text = md.fit_markdown or md.markdown_with_citations or md.raw_markdown or ""
+    return text, time.perf_counter() - start
+
+
+def _executor() -> ProcessPoolExecutor:
+    global _EXECUTOR
+    with _LOCK:
+        if _EXECUTOR is None:
+            # spawn: the parent runs a background event-loop thread, which
+            # makes fork unsafe.
+            _EXECUTOR = ProcessPoolExecutor(
+                max_workers=WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _EXECUTOR
+
+
+async def aextract(url: str, html: str, options: dict) -> tuple[str, float]:
+    """Convert *html* to Markdown in the worker pool.
+
+    *options* come from :func:`scrape_options`, plus the fetch's
+    ``redirected_url`` when there was one.
+
+    Returns:
+        ``(markdown, extraction_seconds)``; ``("", 0.0)`` when *html* is
+        empty or the worker fails.
+    """
+    if not html:
+        return "", 0.0
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor(), _html_to_markdown, url, html, options)
+    except Exception:
+        return "", 0.0
+
+
+def shutdown() -> None:
+    """Stop the worker processes (restarted on next use)."""
+    global _EXECUTOR
+    with _LOCK:
+        executor, _EXECUTOR = _EXECUTOR, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(shutdown)
@@ -0,0 +1,325 @@
+"""Local extractive compression — pick the most informative sentences, no LLM.
+
+Map-reduce summarization costs LLM calls for every oversized page, and
+without an API key content over the budget is returned uncompressed.
+:func:`extract` shrinks Markdown toward a character budget on the CPU
+instead, by keeping its most informative parts verbatim:
+
+1. The text is cut into **units**: headings, whole fenced code blocks and
+   tables, list items, and the sentences of prose paragraphs (see
+   :mod:`websearch_bot._chunk` for the block splitting).
+2. Each unit is scored with two NumPy-vectorized signals, each scaled to
+   ``[0, 1]`` and averaged:
+
+   * **BM25** against a query — the caller's, or else the document's own
+     most salient terms (highest total TF-IDF);
+   * **TextRank** centrality — PageRank over the cosine-similarity graph of
+     the units' TF-IDF vectors, so sentences that many others echo rank
+     high.
+
+3. Units are taken in order of score per square-root character (short,
+   dense sentences win over long ones), skipping near-copies of units
+   already taken, until the budget is full.  Headings are always kept.
+4. The chosen units are emitted in their original order, so the Markdown
+   structure survives.
+
+Long documents are scored in windows of :data:`_WINDOW_UNITS` units, each
+with its share of the budget, which keeps the similarity matrix small.
+
+``numpy`` is imported lazily; without it :func:`extract` returns the text
+unchanged.
+
+Example:
+    >>> short = extract(page_markdown, max_chars=20_000)
+    >>> len(short) <= 20_000
+    True
+"""
+
+from __future__ import annotations
+
+import math
+import re
+
+from ._chunk import _FENCE_RE, _HEADING_RE, _SENTENCE_RE, _blank, _never, _split_lines
+
+__all__ = ["extract", "query_terms", "relevance"]
+
+# Units scored together; the similarity matrix is this size squared.
+_WINDOW_UNITS = 1_000
+# BM25 parameters.
+_K1 = 1.5
+_B = 0.75
+# Query terms used when the caller gives none.
+_SALIENT_TERMS = 20
+# PageRank damping and iterations.
+_DAMPING = 0.85
+_ITERATIONS = 30
+# A unit this similar (cosine) to one already taken is a near-copy.
+_MAX_SIMILARITY = 0.9
+
+_WORD_RE = re.compile(r"\w{2,}")
+# Query words that carry no topic.
+_STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "for",
+    "from", "how", "i", "in", "is", "it", "of", "on", "or", "the", "this", "to",
+    "was", "what", "when", "where", "which", "who", "why", "with", "you", "your", "vs",
+})
+# Suffixes stripped for relevance matching, longest first ("installation",
+# "installing" and "installs" all match "install").
+_SUFFIXES = ("ations", "ation", "ments", "ment", "ings", "ing", "ers", "ies", "ied", "er", "ed", "es", "ly", "s")
+_LIST_RE = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s")
+_RULE_RE = re.compile(r"^\s{0,3}(?:-{3,}|\*{3,}|_{3,})\s*$")
+# Rounds of tightening the budget when the output comes out over it.
+_FIT_ROUNDS = 3
+
+
+# ---------------------------------------------------------------------------
+# Units
+# ---------------------------------------------------------------------------
+
+
+def _fence_runs(lines: list[str]) -> list[tuple[str, bool]]:
+    """Group *lines* into ``(text, fenced)`` runs; a fenced code block is one run."""
+    runs: list[tuple[str, bool]] = []
+    current: list[str] = []
+    fence: str | None = None
+    for line in lines:
+        m = _FENCE_RE.match(line)
+        if fence is None and m:
+            if current:
+                runs.append(("".join(current), False))
+            current, fence = [line], m.group(1)
+            continue
+        current.append(line)
+        if fence is not None and m and m.group(1)[0] == fence[0] and len(m.group(1)) >= len(fence):
+            runs.append(("".join(current), True))
+            current, fence = [], None
+    if current:
+        runs.append(("".join(current), fence is not None))
+    return runs
+
+
+def _units(text: str) -> list[tuple[str, bool, bool]]:
+    """Split *text* into ``(unit, always_keep, block_end)`` triples.
+
+    Joining every unit gives back *text*; ``block_end`` marks the last unit
+    of a block, which carries the block's trailing blank line.
+    """
+    units: list[tuple[str, bool, bool]] = []
+    for block in _split_lines(text, _never, _blank):
+        lines = block.splitlines(keepends=True)
+        parts: list[tuple[str, bool]] = []
+        first = lines[0] if lines else ""
+        if (_HEADING_RE.match(first) or _RULE_RE.match(first)) and not _FENCE_RE.match(first):
+            parts.append((first, True))                        # heading / separator
+            lines = lines[1:]
+        for body, fenced in _fence_runs(lines):
+            if fenced or body.lstrip().startswith("|"):
+                parts.append((body, False))                   # code block / table
+            elif _LIST_RE.match(body):
+                parts.extend((line, False) for line in body.splitlines(keepends=True))
+            else:
+                parts.extend((s, False) for s in _SENTENCE_RE.split(body) if s)
+        for i, (unit, keep) in enumerate(parts):
+            units.append((unit, keep, i == len(parts) - 1))
+    return units
+
+
+def _emit(units: list[tuple[str, bool, bool]], chosen: list[bool]) -> str:
+    """Join the chosen units, with one blank line between blocks."""
+    out: list[str] = []
+    tail = ""  # last two characters written
+    for (unit, _, block_end), take in zip(units, chosen, strict=True):
+        if take:
+            if tail.endswith("\n\n"):
+                unit = unit.lstrip("\n")
+        elif block_end and tail and not tail.endswith("\n\n"):
+            # The block's trailing blank line was on a dropped unit.
+            out[-1] = out[-1].rstrip(" ")
+            unit = "\n" if tail.endswith("\n") else "\n\n"
+        else:
+            continue
+        if unit:
+            out.append(unit)
+            tail = (tail + unit)[-2:]
+    return "".join(out).strip() + "\n"
+
+
+# ---------------------------------------------------------------------------
+# Scoring
+# ---------------------------------------------------------------------------
+
+
+def _scale(x):
+    span = x.max() - x.min()
+    return (x - x.min()) / span if span > 0 else x * 0.0
+
+
+def _stem(word: str) -> str:
+    """Crude suffix-stripping stem of a lower-cased *word*."""
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            break
+    return word[:-1] if word.endswith("e") and len(word) > 3 else word
+
+
+def _matrix(texts: list[str], stem: bool = False):
+    """Return the term-frequency matrix, IDF vector and vocabulary of *texts*."""
+    import numpy as np
+
+    vocab: dict[str, int] = {}
+    rows: list[int] = []
+    cols: list[int] = []
+    for i, text in enumerate(texts):
+        for w in _WORD_RE.findall(text.lower()):
+            if stem:
+                w = _stem(w)
+            rows.append(i)
+            cols.append(vocab.setdefault(w, len(vocab)))
+    n = len(texts)
+    tf = np.zeros((n, max(len(vocab), 1)), dtype=np.float32)
+    np.add.at(tf, (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64)), 1.0)
+    df = (tf > 0).sum(axis=0)
+    idf = np.log((n - df + 0.5) / (df + 0.5) + 1.0).astype(np.float32)
+    return tf, idf, vocab
+
+
+def _bm25(tf, idf, terms: list[int]):
+    """BM25 score of every row of *tf* for the vocabulary indices *terms*."""
+    import numpy as np
+
+    if not terms:
+        return np.zeros(tf.shape[0], dtype=np.float32)
+    lengths = tf.sum(axis=1)
+    avg = lengths.mean() or 1.0
+    q = tf[:, terms]
+    denom = q + _K1 * (1 - _B + _B * lengths[:, None] / avg)
+    return (idf[terms] * q * (_K1 + 1) / np.maximum(denom, 1e-9)).sum(axis=1)
+
+
+def _scores(texts: list[str], query: list[str] | None):
+    """Return ``(scores, similarity)`` for *texts*; see the module docstring.
+
+    ``similarity`` is the pairwise cosine similarity of the units' TF-IDF
+    vectors, with a zero diagonal.
+    """
+    import numpy as np
+
+    n = len(texts)
+    tf, idf, vocab = _matrix(texts)
+
+    # TF-IDF unit vectors (rows of zeros stay zero).
+    tfidf = tf * idf
+    norms = np.linalg.norm(tfidf, axis=1, keepdims=True)
+    vectors = np.divide(tfidf, norms, out=np.zeros_like(tfidf), where=norms > 0)
+
+    # BM25 against the query, or the document's most salient terms.
+    if query:
+        terms = [vocab[w] for w in dict.fromkeys(query) if w in vocab]
+    else:
+        terms = list(np.argsort(-tfidf.sum(axis=0))[:_SALIENT_TERMS])
+    bm25 = _bm25(tf, idf, terms)
+
+    # TextRank: PageRank over the cosine-similarity graph.
+    sim = vectors @ vectors.T
+    np.fill_diagonal(sim, 0.0)
+    out_weight = sim.sum(axis=1, keepdims=True)
+    transition = np.divide(sim, out_weight, out=np.zeros_like(sim), where=out_weight > 0)
+    rank = np.full(n, 1.0 / n, dtype=np.float32)
+    for _ in range(_ITERATIONS):
+        rank = (1 - _DAMPING) / n + _DAMPING * (transition.T @ rank)
+
+    return (_scale(bm25) + _scale(rank)) / 2, sim
+
+
+def _select(units: list[tuple[str, bool, bool]], budget: int, query: list[str] | None) -> list[bool]:
+    """Choose which *units* to keep within *budget* characters."""
+    chosen = [keep for _, keep, _ in units]
+    used = sum(len(u) for u, keep, _ in units if keep)
+    candidates = [i for i, (_, keep, _) in enumerate(units) if not keep and units[i][0].strip()]
+    if not candidates:
+        return chosen
+    scores, sim = _scores([units[i][0] for i in candidates], query)
+    order = sorted(
+        range(len(candidates)),
+        key=lambda k: -scores[k] / math.sqrt(max(len(units[candidates[k]][0]), 1)),
+    )
+    taken: list[int] = []
+    for k in order:
+        size = len(units[candidates[k]][0])
+        if used + size > budget:
+            continue
+        if taken and float(sim[k, taken].max()) > _MAX_SIMILARITY:
+            continue
+        taken.append(k)
+        chosen[candidates[k]] = True
+        used += size
+    return chosen
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def query_terms(query: str) -> list[str]:
+    """Lower-cased content words of *query* (stopwords and 1-letter words dropped)."""
+    return [w for w in _WORD_RE.findall(query.lower()) if w not in _STOPWORDS]
+
+
+def relevance(texts: list[str], terms: list[str]) -> list[float]:
+    """BM25 relevance of each of *texts* to *terms*, scaled so the best is ``1.0``.
+
+    Words are matched on crude stems, so "installation" counts for
+    "install".  Returns all ``1.0`` when no text matches (or ``numpy`` is
+    missing), so callers never discard everything on a query that simply
+    uses other words.
+    """
+    if not texts or not terms:
+        return [1.0] * len(texts)
+    try:
+        tf, idf, vocab = _matrix(texts, stem=True)
+    except ImportError:
+        return [1.0] * len(texts)
+    stems = dict.fromkeys(_stem(w) for w in terms)
+    scores = _bm25(tf, idf, [vocab[w] for w in stems if w in vocab])
+    top = float(scores.max()) if len(scores) else 0.0
+    if top <= 0:
+        return [1.0] * len(texts)
+    return [float(x) / top for x in scores]
+
+
+def extract(text: str, max_chars: int, query: list[str] | None = None) -> str:
+    """Shrink Markdown *text* to about *max_chars* by keeping its best units.
+
+    Args:
+        text: Markdown to compress.
+        max_chars: Character budget.
+        query: Terms to score relevance against, as returned by
+            :func:`query_terms` (default: the document's own salient terms).
+
+    Returns:
+        The selected units in document order, or *text* unchanged when it
+        already fits or ``numpy`` is not installed.
+    """
+    if len(text) <= max_chars:
+        return text
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return text
+    units = _units(text)
+    budget = max_chars
+    for _ in range(_FIT_ROUNDS):
+        chosen: list[bool] = []
+        for start in range(0, len(units), _WINDOW_UNITS):
+            window = units[start:start + _WINDOW_UNITS]
+            share = budget * sum(len(u) for u, _, _ in window) // len(text)
+            chosen.extend(_select(window, share, query))
+        out = _emit(units, chosen)
+        if len(out) <= max_chars:
+            break
+        # Separators and kept headings took more room than planned.
+        budget = budget * max_chars // len(out) - 1
+    return out
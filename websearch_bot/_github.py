@@ -2,9 +2,14 @@
 
 Fetches the full recursive file tree via ``/git/trees`` and downloads each
 source file from ``raw.githubusercontent.com`` in parallel.  Each file is
-then summarized individually by an LLM (max_workers=4 to stay within free-tier
-TPM) and the combined summaries are passed through a final compress pass if
-they still exceed the character budget.
+then summarized individually by an LLM — as many at once as the model
+chain's aggregate rate limits sustain for a file of average size (see
+:func:`~websearch_bot._llm.llm_concurrency`) — and the combined summaries
+are passed through a final compress pass if they still exceed the
+character budget.
+
+:func:`ascrape_github` runs on the caller's event loop (blocking HTTP calls
+are moved to worker threads); :func:`scrape_github` is its sync wrapper.
 
 Environment:
     GITHUB_TOKEN: Optional personal access token.  When set, the API rate
@@ -17,16 +22,17 @@ Example:
 
 from __future__ import annotations
 
+import asyncio
 import os
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import requests
 
-from ._llm import MAX_CHARS, call_llm
-from ._crawl import finalize
+from ._aio import run_sync
+from ._llm import MAX_CHARS, acall_llm, llm_concurrency
+from ._crawl import afinalize
 
-__all__ = ["scrape_github"]
+__all__ = ["ascrape_github", "scrape_github"]
 
 # ---------------------------------------------------------------------------
 # File-type and path filters
@@ -118,7 +124,7 @@ def _fetch_raw(
         return None
 
 
-def _summarize_file(path: str, content: str) -> str:
+async def _summarize_file(path: str, content: str) -> str:
     """Return a concise LLM summary of one source file.
 
     Uses up to _MAX_FILE_CHARS of input and targets ~400 output tokens.
@@ -132,7 +138,7 @@ def _summarize_file(path: str, content: str) -> str:
         A dense Markdown summary string.
     """
     ext = path.rsplit(".", 1)[-1] if "." in path else "txt"
-    summary, _ = call_llm(
+    summary, _ = await acall_llm(
         system=(
             "You are a code analyst. Summarize this source file concisely: "
             "purpose, key exports/functions/classes, and important logic. "
@@ -149,7 +155,7 @@ def _summarize_file(path: str, content: str) -> str:
 # ---------------------------------------------------------------------------
 
 
-def scrape_github(
+async def ascrape_github(
     repo_url: str,
     extensions: list[str] | None = None,
     max_files: int = 200,
@@ -159,8 +165,9 @@ def scrape_github(
 
     Uses the GitHub REST API to retrieve the full recursive file tree, then
     downloads each matching file in parallel.  Each file is summarized
-    individually by :func:`_summarize_file` (max_workers=4) and the combined
-    summaries are passed through :func:`~websearch_bot._llm.compress_text`
+    individually by :func:`_summarize_file` (as many concurrently as
+    :func:`~websearch_bot._llm.llm_concurrency` allows) and the combined
+    summaries are passed through :func:`~websearch_bot._llm.acompress_text`
     if they still exceed *max_chars*.
 
     Args:
@@ -189,7 +196,8 @@ def scrape_github(
 
     # Fetch the recursive file tree from the GitHub API.
     try:
-        r = requests.get(
+        r = await asyncio.to_thread(
+            requests.get,
             f"https://api.github.com/repos/{owner}/{repo}/git/trees/HEAD?recursive=1",
             headers=headers,
             timeout=15,
@@ -206,30 +214,31 @@ def scrape_github(
         and any(item["path"].endswith(ext) for ext in exts)
     ][:max_files]
 
-    # Download all candidate files in parallel (10 workers).
-    fetched: dict[str, str] = {}
-    with ThreadPoolExecutor(max_workers=10) as pool:
-        futures = {
-            pool.submit(_fetch_raw, owner, repo, item["path"], headers): item["path"]
-            for item in candidates
-        }
-        for fut in as_completed(futures):
-            result = fut.result()
-            if result:
-                fetched[result[0]] = result[1]
-
-    # Summarize each file individually (max_workers=4 keeps concurrent token
-    # usage within free-tier TPM budget).  Files larger than _MAX_FILE_CHARS
-    # are skipped — they are almost always generated artefacts.
+    # Download all candidate files in parallel (10 at a time, in worker threads).
+    download_sem = asyncio.Semaphore(10)
+
+    async def _download(path: str) -> tuple[str, str] | None:
+        async with download_sem:
+            return await asyncio.to_thread(_fetch_raw, owner, repo, path, headers)
+
+    results = await asyncio.gather(*(_download(item["path"]) for item in candidates))
+    fetched: dict[str, str] = dict(r for r in results if r)
+
+    # Summarize each file individually, as many at once as the models' rate
+    # limits sustain for files of this size.  Files larger than
+    # _MAX_FILE_CHARS are skipped — they are almost always generated artefacts.
     to_summarize = [
         item for item in candidates
         if item["path"] in fetched and len(fetched[item["path"]]) <= _MAX_FILE_CHARS
     ]
-    with ThreadPoolExecutor(max_workers=4) as pool:
-        summaries = list(pool.map(
-            lambda item: f"### {item['path']}\n\n{_summarize_file(item['path'], fetched[item['path']])}",
-            to_summarize,
-        ))
+    mean_chars = sum(len(fetched[item["path"]]) for item in to_summarize) // max(len(to_summarize), 1)
+    summary_sem = asyncio.Semaphore(llm_concurrency(mean_chars // 4 + 400))
+
+    async def _summarize(path: str) -> str:
+        async with summary_sem:
+            return f"### {path}\n\n{await _summarize_file(path, fetched[path])}"
+
+    summaries = await asyncio.gather(*(_summarize(item["path"]) for item in to_summarize))
     raw = "\n\n".join(summaries)
     raw_file_chars = sum(len(fetched[item["path"]]) for item in to_summarize)
     meta: dict = {
@@ -240,4 +249,16 @@ def scrape_github(
         "llm_calls": len(to_summarize),  # one call attempted per summarized file
         "original_chars": raw_file_chars,  # total raw file content before LLM summaries
     }
-    return finalize(raw, meta, max_chars)
+    return await afinalize(raw, meta, max_chars)
+
+
+def scrape_github(
+    repo_url: str,
+    extensions: list[str] | None = None,
+    max_files: int = 200,
+    max_chars: int = MAX_CHARS,
+) -> str:
+    """Blocking wrapper around :func:`ascrape_github`."""
+    return run_sync(ascrape_github(
+        repo_url, extensions=extensions, max_files=max_files, max_chars=max_chars,
+    ))
@@ -0,0 +1,184 @@
+"""Per-model health registry and circuit breaker for the LLM fallback chain.
+
+Without it every call starts at ``PRIMARY`` and walks the chain in a fixed
+order, so while the primary is down or rate-limited each call first pays
+the failure latency of every dead model.  :data:`HEALTH` tracks, per model:
+
+* an exponentially weighted **error rate** and **latency**;
+* a **circuit** — after :data:`_FAILURES_TO_OPEN` consecutive failures, or
+  immediately on a ``429``, the model is skipped for a cooldown
+  (``Retry-After`` when the provider sent one, otherwise
+  ``WEBSEARCH_LLM_COOLDOWN`` seconds, doubling on each re-open up to
+  :data:`_MAX_COOLDOWN`).  When the cooldown ends a single call is let
+  through as a probe (*half-open*); success closes the circuit.
+
+:meth:`HealthRegistry.order` drops models whose circuit is open, puts
+models due for a probe first, and moves degraded ones (high error rate, or
+much slower than the rest) behind the healthy ones, keeping the configured
+preference order within each group.
+Both :func:`~websearch_bot._llm.acall_llm` and
+:func:`~websearch_bot._select.select_urls` use it.
+
+Environment:
+    WEBSEARCH_LLM_COOLDOWN: Base circuit cooldown in seconds (default 30).
+
+Example:
+    >>> for model in HEALTH.order(chain):
+    ...     ...
+    ...     HEALTH.record(model, ok=True, latency=1.8)
+"""
+
+from __future__ import annotations
+
+import os
+import statistics
+import threading
+import time
+from dataclasses import dataclass
+
+__all__ = ["HEALTH", "HealthRegistry", "model_health"]
+
+COOLDOWN: float = float(os.getenv("WEBSEARCH_LLM_COOLDOWN", "30"))
+
+# Consecutive failures that open a model's circuit.
+_FAILURES_TO_OPEN = 3
+# Upper bound of the doubling cooldown.
+_MAX_COOLDOWN = 600.0
+# Weight of the newest sample in the moving averages.
+_ALPHA = 0.3
+# A model is degraded above this error rate …
+_DEGRADED_ERROR_RATE = 0.5
+# … or when its latency is this many times the median of the healthy models.
+_DEGRADED_SLOWDOWN = 3.0
+# A claimed probe that never reported back is given up after this long.
+_PROBE_TIMEOUT = 60.0
+# The error rate halves every this many seconds without calls, so a
+# degraded model that is no longer tried still earns its place back.
+_ERROR_HALF_LIFE = 120.0
+
+
+@dataclass
+class _ModelHealth:
+    error_rate: float = 0.0
+    latency: float | None = None     # seconds, successful calls only
+    failures: int = 0                # consecutive
+    opens: int = 0                   # consecutive circuit openings
+    open_until: float = 0.0
+    probing_since: float = 0.0       # half-open probe in flight since
+    calls: int = 0
+    updated: float = 0.0
+
+    def errors(self, now: float) -> float:
+        """Error rate decayed for the time since the last call."""
+        return self.error_rate * 0.5 ** ((now - self.updated) / _ERROR_HALF_LIFE)
+
+    def state(self, now: float) -> str:
+        if now < self.open_until:
+            return "open"
+        return "half_open" if self.opens else "closed"
+
+
+class HealthRegistry:
+    """Process-wide, thread-safe health table; see the module docstring."""
+
+    def __init__(self, cooldown: float = COOLDOWN) -> None:
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._models: dict[str, _ModelHealth] = {}
+
+    def _get(self, model: str) -> _ModelHealth:
+        return self._models.setdefault(model, _ModelHealth())
+
+    def order(self, models: list[str]) -> list[str]:
+        """Return *models* to try, open circuits dropped.
+
+        Half-open models come first — each is included only while no probe
+        is in flight, and including it claims the probe — then healthy
+        models, then degraded ones.
+        """
+        now = time.time()
+        with self._lock:
+            probes: list[str] = []
+            healthy: list[str] = []
+            degraded: list[str] = []
+            latencies = [
+                h.latency for m in models
+                if (h := self._models.get(m)) and h.latency is not None
+            ]
+            typical = statistics.median(latencies) if latencies else None
+            for model in models:
+                h = self._get(model)
+                state = h.state(now)
+                if state == "open":
+                    continue
+                if state == "half_open":
+                    if now - h.probing_since < _PROBE_TIMEOUT:
+                        continue
+                    h.probing_since = now
+                    probes.append(model)
+                    continue
+                slow = (
+                    typical is not None and h.latency is not None
+                    and h.latency > typical * _DEGRADED_SLOWDOWN
+                )
+                if h.errors(now) > _DEGRADED_ERROR_RATE or slow:
+                    degraded.append(model)
+                else:
+                    healthy.append(model)
+            return probes + healthy + degraded
+
+    def record(
+        self, model: str, ok: bool, latency: float, retry_after: float | None = None
+    ) -> None:
+        """Record one call's outcome; *retry_after* (from a ``429``) opens the circuit."""
+        now = time.time()
+        with self._lock:
+            h = self._get(model)
+            h.calls += 1
+            h.probing_since = 0.0
+            h.error_rate = (1 - _ALPHA) * h.errors(now) + _ALPHA * (0.0 if ok else 1.0)
+            h.updated = now
+            if ok:
+                h.latency = latency if h.latency is None else (1 - _ALPHA) * h.latency + _ALPHA * latency
+                h.failures = h.opens = 0
+                h.open_until = 0.0
+                return
+            h.failures += 1
+            if retry_after is not None or h.failures >= _FAILURES_TO_OPEN or h.opens:
+                # A failed probe re-opens immediately, with a longer cooldown.
+                h.opens += 1
+                backoff = min(self.cooldown * 2 ** (h.opens - 1), _MAX_COOLDOWN)
+                h.open_until = now + (retry_after or backoff)
+                h.failures = 0
+
+    def release(self, models: list[str]) -> None:
+        """Give back probes claimed by :meth:`order` for *models* that were never called."""
+        with self._lock:
+            for model in models:
+                if model in self._models:
+                    self._models[model].probing_since = 0.0
+
+    def snapshot(self) -> dict[str, dict]:
+        """Per-model ``state``, ``error_rate``, ``latency_ms`` and ``calls``."""
+        now = time.time()
+        with self._lock:
+            return {
+                model: {
+                    "state": h.state(now),
+                    "error_rate": round(h.errors(now), 3),
+                    "latency_ms": int(h.latency * 1000) if h.latency is not None else None,
+                    "calls": h.calls,
+                    **({"retry_in_s": int(h.open_until - now)} if h.open_until > now else {}),
+                }
+                for model, h in self._models.items()
+                if h.calls
+            }
+
+
+#: Process-wide registry shared by every LLM caller.
+HEALTH = HealthRegistry()
+
+
+def model_health() -> dict[str, dict]:
+    """Return :meth:`HealthRegistry.snapshot` of the process-wide registry."""
+    return HEALTH.snapshot()
@@ -0,0 +1,99 @@
+"""HTTP-first fetch tier — serve static pages without launching Chromium.
+
+Most documentation pages are plain server-rendered HTML, so every crawl is
+first attempted with crawl4ai's ``AsyncHTTPCrawlerStrategy`` (a pooled
+aiohttp client) using the *same* ``CrawlerRunConfig`` — LXML scraping,
+``PruningContentFilter`` and ``DefaultMarkdownGenerator`` all apply
+unchanged.  A page is escalated to the headless browser only when the
+static response shows a signal that it needs JavaScript:
+
+* the request failed or returned an error status,
+* the response is not HTML,
+* the body is an empty single-page-app mount point (``<div id="root">``),
+* a ``<noscript>`` block asks the user to enable JavaScript,
+* the extracted Markdown is too thin to be the real content.
+
+Hit counters per tier (and per escalation reason) are kept in
+:data:`TIER_STATS` for the whole process.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+
+from crawl4ai import AsyncWebCrawler, HTTPCrawlerConfig
+from crawl4ai.async_crawler_strategy import AsyncHTTPCrawlerStrategy
+
+__all__ = ["TIER_STATS", "escalation_reason", "make_crawler", "tier_stats"]
+
+#: Process-wide page counts: ``http``, ``browser``, ``escalated`` and
+#: ``escalated:<reason>``.
+TIER_STATS: Counter[str] = Counter()
+
+# Desktop Chrome headers — some CDNs serve a bot wall to unknown user agents.
+_HTTP_CONFIG = HTTPCrawlerConfig(
+    method="GET",
+    headers={
+        "User-Agent": (
+            "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+            "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+        ),
+        "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.9",
+    },
+    follow_redirects=True,
+)
+
+# Empty SPA mount points: React/CRA, Vue, Next.js, Nuxt, Svelte.
+_SHELL_RE = re.compile(
+    r"<div[^>]+id=[\"'](?:root|app|__next|__nuxt|svelte)[\"'][^>]*>\s*</div>", re.I
+)
+_NOSCRIPT_RE = re.compile(r"<noscript[^>]*>(.*?)</noscript>", re.I | re.S)
+_JS_WARNING_RE = re.compile(
+    r"(?:enable|turn on|requires?|need)\s+javascript|javascript\s+(?:is\s+)?(?:required|disabled)",
+    re.I,
+)
+
+#: Extracted Markdown shorter than this is treated as an unrendered page.
+_MIN_CHARS = 200
+
+
+def make_crawler() -> AsyncWebCrawler:
+    """Return an (unstarted) crawler backed by the pooled HTTP strategy."""
+    return AsyncWebCrawler(crawler_strategy=AsyncHTTPCrawlerStrategy(browser_config=_HTTP_CONFIG))
+
+
+def escalation_reason(result, markdown: str) -> str | None:
+    """Return why *result* needs the browser tier, or ``None`` if it is usable.
+
+    Args:
+        result: crawl4ai ``CrawlResult`` from the HTTP tier.
+        markdown: Markdown already extracted from *result*.
+
+    Returns:
+        A short reason code (``"failed"``, ``"status_403"``, ``"non_html"``,
+        ``"js_shell"``, ``"noscript"``, ``"thin"``) or ``None``.
+    """
+    if not result.success:
+        return "failed"
+    status = getattr(result, "status_code", None) or 200
+    if status >= 400:
+        return f"status_{status}"
+    headers = {k.lower(): v for k, v in (getattr(result, "response_headers", None) or {}).items()}
+    ctype = headers.get("content-type", "")
+    if ctype and "html" not in ctype.lower():
+        return "non_html"
+    html = result.html or ""
+    if _SHELL_RE.search(html):
+        return "js_shell"
+    if any(_JS_WARNING_RE.search(block) for block in _NOSCRIPT_RE.findall(html)):
+        return "noscript"
+    if len(markdown.strip()) < _MIN_CHARS:
+        return "thin"
+    return None
+
+
+def tier_stats() -> dict[str, int]:
+    """Return a copy of the process-wide per-tier hit counters."""
+    return dict(TIER_STATS)
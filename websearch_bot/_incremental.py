@@ -0,0 +1,111 @@
+"""Incremental re-crawls — reuse last run's per-page summaries for unchanged pages.
+
+Re-scraping the same site every day used to re-compress every page, even
+though most of them had not changed.  In incremental mode the pages of a
+crawl are condensed one by one instead of as one blob:
+
+* each page's Markdown is hashed (SHA-256) and looked up by URL in the
+  ``pages`` table of the shared on-disk cache (:mod:`websearch_bot._cache`);
+* an **unchanged** page reuses its stored summary, provided that summary
+  (roughly) fits the page's share of the budget — no LLM call;
+* a **new or changed** page is compressed to its share of *max_chars*
+  (proportional to its size) and the result is stored for the next run.
+
+The condensed pages are then reassembled in crawl order; the usual
+:func:`~websearch_bot._crawl.afinalize` only has work left to do when the
+sum still exceeds the budget.
+
+Example:
+    >>> pages, stats = await condense(pages, max_chars=100_000)
+    >>> stats
+    {'pages_changed': 2, 'pages_reused': 18, 'llm_calls': 2}
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+
+from ._cache import ENABLED as _PERSIST
+from ._cache import _Store, normalize_url
+from ._llm import acompress_text, llm_concurrency
+
+__all__ = ["condense"]
+
+_STORE = _Store("pages", 64 * 1024 * 1024)
+
+# A stored summary up to this much over the page's current share is still
+# reused — shares shift slightly whenever any other page changes size.
+_SHARE_SLACK = 1.2
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+async def _load(url: str) -> tuple[str, dict] | None:
+    if not _PERSIST:
+        return None
+    try:
+        row = await asyncio.to_thread(_STORE.get, normalize_url(url))
+    except Exception:
+        return None
+    return (row[0], row[1]) if row is not None else None
+
+
+async def _save(url: str, summary: str, digest: str) -> None:
+    if not _PERSIST:
+        return
+    with contextlib.suppress(Exception):  # persistence is best-effort
+        await asyncio.to_thread(_STORE.put, normalize_url(url), summary, {"hash": digest})
+
+
+async def condense(
+    pages: list[tuple[str, str]], max_chars: int
+) -> tuple[list[tuple[str, str]], dict[str, int]]:
+    """Fit ``(url, markdown)`` *pages* into *max_chars*, reusing stored summaries.
+
+    Args:
+        pages: Crawled pages in output order.
+        max_chars: Character budget for all pages together.
+
+    Returns:
+        The condensed pages (same order) and frontmatter counters:
+        ``pages_changed`` (new or different since the last run),
+        ``pages_reused`` (unchanged, stored result used as-is) and
+        ``llm_calls``.
+    """
+    total = sum(len(md) for _, md in pages) or 1
+    over_budget = total > max_chars
+
+    # Pages are condensed concurrently, as many at once as the models' budget
+    # sustains for an average page (prompt chars / 4 + a 4 : 1 summary).
+    mean_chars = total // max(len(pages), 1)
+    sem = asyncio.Semaphore(llm_concurrency(mean_chars // 4 + mean_chars // 16))
+
+    async def _one(url: str, md: str) -> tuple[str, bool, bool, int]:
+        """Return ``(text, changed, reused, llm_calls)`` for one page."""
+        digest = _digest(md)
+        share = max(max_chars * len(md) // total, 1)
+        stored = await _load(url)
+        changed = stored is None or stored[1].get("hash") != digest
+        if not over_budget:
+            text, calls = md, 0
+        elif stored is not None and not changed and stored[0] and len(stored[0]) <= share * _SHARE_SLACK:
+            return stored[0], False, True, 0
+        else:
+            async with sem:
+                text, calls, _ = await acompress_text(md, share)
+        if changed or calls:
+            # Keep only real summaries; a page that fits is cheap to reuse anyway.
+            await _save(url, text if calls and len(text) <= share else "", digest)
+        return text, changed, not changed and not calls, calls
+
+    results = await asyncio.gather(*(_one(url, md) for url, md in pages))
+    stats = {
+        "pages_changed": sum(r[1] for r in results),
+        "pages_reused": sum(r[2] for r in results),
+        "llm_calls": sum(r[3] for r in results),
+    }
+    return [(url, r[0]) for (url, _), r in zip(pages, results, strict=True)], stats
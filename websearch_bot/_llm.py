@@ -5,8 +5,14 @@ chain defined in :mod:`websearch_bot._models`.  ``litellm`` is imported
 lazily so the package remains importable when it is not installed.
 
 Set ``GROQ_API_KEY`` (or ``WEBSEARCH_LLM_MODEL``) in the environment to
-enable compression and AI overviews; without it the library still scrapes
-but returns raw (uncompressed) content.
+enable LLM compression and AI overviews; without it the library still
+scrapes, and oversized content is shrunk locally by extractive compression
+(:mod:`websearch_bot._extractive`).
+
+Every helper is natively async (:func:`acall_llm`, :func:`acompress_text`,
+built on ``litellm.acompletion``) and runs on the caller's event loop; the
+synchronous names are thin wrappers that execute on the background loop
+from :mod:`websearch_bot._aio`.
 
 Example:
     >>> from websearch_bot._llm import call_llm
@@ -17,9 +23,11 @@ Example:
 
 from __future__ import annotations
 
+import asyncio
 import os
+import time
 import warnings
-from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
 from pathlib import Path
 
 # Load .env from the project root automatically (silent when dotenv is absent).
@@ -29,11 +37,27 @@ try:
 except ImportError:
     pass
 
-from ._groq import DEFAULT_PRIMARY, MODEL_TPM, get_fallbacks as _groq_fallbacks
+from ._aio import run_sync
+from ._cache import LLM_CACHE, model_family
+from ._chunk import chunk_tokens, count_tokens, headings, sections, split_markdown
+from ._dispatch import aassign, pool_chunk_model
+from ._extractive import extract, query_terms, relevance
+from ._groq import DEFAULT_PRIMARY
+from ._groq import get_fallbacks as _groq_fallbacks
 from ._groq import is_available as _groq_available
-from ._models import PROVIDER_ENV, PROVIDER_FALLBACK_MODELS, _available_provider_fallbacks
+from ._health import HEALTH
+from ._models import (
+    PROVIDER_ENV,
+    PROVIDER_FALLBACK_MODELS,
+    _available_provider_fallbacks,
+)
+from ._plan import MAX_CALLS, RATIO, fit_plan, level_targets
+from ._ratelimit import LIMITER, estimate_tokens, retry_after, used_tokens
 
-__all__ = ["MAX_CHARS", "PRIMARY", "call_llm", "compress_text"]
+__all__ = [
+    "MAX_CHARS", "PRIMARY", "COMPRESS_MODE",
+    "acall_llm", "call_llm", "acompress_text", "compress_text", "llm_concurrency",
+]
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -68,127 +92,409 @@ PRIMARY: str = _resolve_primary()
 #: compressed via map-reduce summarisation before being returned.
 MAX_CHARS: int = 100_000
 
+#: Compression mode — ``"hybrid"``, ``"extractive"`` or ``"llm"`` (see
+#: :func:`acompress_text`); override via ``WEBSEARCH_COMPRESS_MODE``.
+COMPRESS_MODE: str = os.getenv("WEBSEARCH_COMPRESS_MODE", "hybrid").lower()
+_MODES = ("hybrid", "extractive", "llm")
+if COMPRESS_MODE not in _MODES:
+    raise ValueError(
+        f"WEBSEARCH_COMPRESS_MODE must be one of {', '.join(_MODES)}, not {COMPRESS_MODE!r}"
+    )
+
+# Hybrid mode extracts down to this many times the budget before the reduce.
+_HYBRID_HEADROOM = 2
+# Chunks scoring under this share of the best chunk's relevance to the
+# query get only a tiny summary.
+_LOW_RELEVANCE = 0.15
+
+#: Upper bound on concurrent LLM calls from one fan-out (compression chunks,
+#: file summaries) — override via ``WEBSEARCH_LLM_MAX_CONCURRENCY``.
+MAX_CONCURRENCY: int = max(int(os.getenv("WEBSEARCH_LLM_MAX_CONCURRENCY", "16")), 1)
+
+# Concurrency never drops below the historical two calls in flight.
+_MIN_CONCURRENCY = 2
+# Slots per model without published limits (paid providers).
+_UNLIMITED_SLOTS = 8
+# Assumed call latency, in seconds, for models not called yet.
+_DEFAULT_LATENCY = 5.0
+
 _COMPRESS_SYSTEM = (
     "Summarize the following content concisely, preserving all key facts, "
     "technical details, code structures, and important information. "
     "Output dense, information-rich Markdown."
 )
+# Appended to the compression prompt when the caller has a query.
+_FOCUS = (
+    " The reader wants to answer this query: {query!r}. Keep what helps answer it; "
+    "reduce everything else to a brief mention."
+)
 
 # ---------------------------------------------------------------------------
 # Core LLM call
 # ---------------------------------------------------------------------------
 
 
-def call_llm(
+def _candidate_models() -> list[str]:
+    """Return ``PRIMARY`` followed by every available fallback model (deduplicated)."""
+    all_fallbacks = _groq_fallbacks() + _available_provider_fallbacks()
+    return [PRIMARY] + [m for m in all_fallbacks if m != PRIMARY]
+
+
+def _model_chain() -> list[str]:
+    """Return :func:`_candidate_models` reordered by current health
+    (see :mod:`websearch_bot._health`)."""
+    return HEALTH.order(_candidate_models())
+
+
+def _live_models() -> list[str]:
+    """Return :func:`_candidate_models` whose circuit is not open, in preference order.
+
+    Unlike :func:`_model_chain` this claims no half-open probe.
+    """
+    health = HEALTH.snapshot()
+    return [m for m in _candidate_models() if health.get(m, {}).get("state") != "open"]
+
+
+async def acall_llm(
     system: str,
     user: str,
     max_tokens: int = 1024,
+    prefer: str | None = None,
 ) -> tuple[str | None, str | None]:
     """Send a chat completion request, cycling through every fallback model.
 
+    The chain is ordered by model health — models with an open circuit are
+    skipped (see :mod:`websearch_bot._health`).  Each attempt goes to the
+    first remaining model that has rate-limit budget for it (see
+    :mod:`websearch_bot._ratelimit`); when none has, the call waits for the
+    first budget to free up.  Responses are cached on disk by content
+    (see :data:`~websearch_bot._cache.LLM_CACHE`): a repeated request is
+    answered without any network call.
+
     Args:
         system: System prompt.
         user: User message (the content to process).
         max_tokens: Maximum completion tokens to request.
+        prefer: Model to try first (see :mod:`websearch_bot._dispatch`);
+            the rest of the chain is still the fallback.
 
     Returns:
         ``(response_text, model_id)`` on success, or ``(None, None)`` if
         every model in the fallback chain fails.
     """
     try:
+        # An answer is keyed by the family that gave it; the chain's
+        # families are looked up in preference order.
+        families = list(dict.fromkeys(model_family(m) for m in _candidate_models()))
+        cached = await LLM_CACHE.aget(system, user, max_tokens, families)
+        if cached is not None:
+            return cached
+
         import litellm
         litellm.suppress_debug_info = True
         warnings.filterwarnings("ignore", category=RuntimeWarning, module="litellm")
 
-        all_fallbacks = _groq_fallbacks() + _available_provider_fallbacks()
-        all_models = [PRIMARY] + [m for m in all_fallbacks if m != PRIMARY]
         msgs = [{"role": "system", "content": system}, {"role": "user", "content": user}]
-
-        for model in all_models:
-            try:
-                resp = litellm.completion(
-                    model=model, messages=msgs, max_tokens=max_tokens, num_retries=0
-                )
-                return resp.choices[0].message.content, model
-            except Exception:
-                continue
+        tokens = estimate_tokens(system, user, max_tokens)
+        remaining = _model_chain()
+        if prefer in remaining:
+            remaining = [prefer] + [m for m in remaining if m != prefer]
+
+        try:
+            while remaining:
+                model = await LIMITER.acquire(remaining, tokens)
+                if model is None:
+                    break
+                remaining = [m for m in remaining if m != model]
+                start = time.perf_counter()
+                try:
+                    resp = await litellm.acompletion(
+                        model=model, messages=msgs, max_tokens=max_tokens, num_retries=0
+                    )
+                    HEALTH.record(model, True, time.perf_counter() - start)
+                    await LIMITER.asettle(model, tokens, used_tokens(resp))
+                    text = resp.choices[0].message.content
+                    await LLM_CACHE.aput(
+                        system, user, max_tokens, model_family(model), text, model
+                    )
+                    return text, model
+                except Exception as exc:
+                    delay = retry_after(exc)
+                    HEALTH.record(model, False, time.perf_counter() - start, delay)
+                    if delay is not None:
+                        await LIMITER.athrottled(model, delay)
+                    continue
+        finally:
+            HEALTH.release(remaining)
     except Exception:
         pass
     return None, None
 
 
+def llm_concurrency(tokens: int) -> int:
+    """How many calls of about *tokens* tokens to keep in flight at once.
+
+    Sums, over every model of the chain whose circuit is not open, the calls
+    per minute its rate limits allow (``min(rpm, tpm / tokens)``) times its
+    observed latency — the calls it can have in flight without outrunning
+    its budget.  Models without published limits count
+    :data:`_UNLIMITED_SLOTS` each, so paid provider keys raise the
+    concurrency.  The result is clamped to ``[2, MAX_CONCURRENCY]``.
+    """
+    health = HEALTH.snapshot()
+    slots = 0.0
+    for model in _candidate_models():
+        state = health.get(model, {})
+        if state.get("state") == "open":
+            continue
+        limits = LIMITER.limits.get(model)
+        if not limits:
+            slots += _UNLIMITED_SLOTS
+            continue
+        per_minute = min(
+            limits.get("rpm", float("inf")), limits.get("tpm", float("inf")) / max(tokens, 1)
+        )
+        latency = (state.get("latency_ms") or _DEFAULT_LATENCY * 1000) / 1000
+        slots += per_minute * latency / 60
+    return max(_MIN_CONCURRENCY, min(int(slots), MAX_CONCURRENCY))
+
+
+def call_llm(
+    system: str,
+    user: str,
+    max_tokens: int = 1024,
+) -> tuple[str | None, str | None]:
+    """Blocking wrapper around :func:`acall_llm`."""
+    return run_sync(acall_llm(system, user, max_tokens))
+
+
 # ---------------------------------------------------------------------------
 # Map-reduce compression
 # ---------------------------------------------------------------------------
 
 
-def compress_text(
+async def acompress_text(
     text: str,
     max_chars: int,
-    _depth: int = 0,
-    _calls: int = 0,
-    _llm_used: bool = False,
+    report: dict | None = None,
+    mode: str | None = None,
+    query: str | None = None,
 ) -> tuple[str, int, bool]:
-    """Recursively compress *text* to fit within *max_chars* via map-reduce.
+    """Compress *text* to fit within *max_chars*.
 
-    The text is split into chunks sized at 50 % of the primary model's TPM
-    budget (to stay within rate limits), then each chunk is summarised in
-    parallel at a 4 : 1 compression ratio.  The pass repeats until the
-    combined result fits within *max_chars*.
+    Modes (default ``WEBSEARCH_COMPRESS_MODE``, ``"hybrid"``):
 
-    Two safety conditions stop early without omitting content:
+    * ``"extractive"`` — local sentence selection only
+      (:func:`~websearch_bot._extractive.extract`); no LLM calls.
+    * ``"llm"`` — map-reduce summarisation along a planned reduce tree
+      (:func:`_areduce`).
+    * ``"hybrid"`` — extract down to twice the budget first, so the reduce
+      needs a single gentle pass; if the result is still over budget (no
+      API key, models rate-limited), extract the rest of the way.
 
-    * **All models rate-limited** — if no LLM call succeeds in a pass,
-      the combined text is returned as-is (no infinite loop).
-    * **Depth limit** — after 20 passes the text is returned as-is.
+    Args:
+        text: Input text to compress.
+        max_chars: Target character budget.
+        report: Optional dict that receives ``compression_mode`` and the
+            plan figures of :func:`_areduce`.
+        mode: Override the configured mode.
+        query: What the caller is looking for (a search query, crawl
+            keywords).  Extraction ranks sentences against it, and the
+            reduce skips off-topic chunks and focuses its prompt on it.
+
+    Returns:
+        A 3-tuple ``(compressed_text, total_llm_calls, llm_was_used)``.
+
+    Raises:
+        ValueError: If *mode* is not one of the modes above.
+    """
+    mode = (mode or COMPRESS_MODE).lower()
+    if mode not in _MODES:
+        raise ValueError(f"mode must be one of {', '.join(_MODES)}, not {mode!r}")
+    if len(text) <= max_chars:
+        return text, 0, False
+    if report is not None:
+        report["compression_mode"] = mode
+    terms = query_terms(query) if query else None
+    if mode == "extractive":
+        return await asyncio.to_thread(extract, text, max_chars, terms), 0, False
+    if mode == "llm":
+        return await _areduce(text, max_chars, report, query)
+    text = await asyncio.to_thread(extract, text, max_chars * _HYBRID_HEADROOM, terms)
+    result, calls, used = await _areduce(text, max_chars, report, query)
+    if len(result) > max_chars:
+        result = await asyncio.to_thread(extract, result, max_chars, terms)
+    return result, calls, used
+
+
+def _has_body(chunk: str) -> bool:
+    """Whether *chunk* has any non-blank line besides its headings."""
+    outline = set(headings(chunk))
+    return any(line.strip() and line not in outline for line in chunk.splitlines())
+
+
+async def _areduce(
+    text: str, max_chars: int, report: dict | None = None, query: str | None = None
+) -> tuple[str, int, bool]:
+    """Compress *text* to fit within *max_chars* along a planned reduce tree.
+
+    Before any call, :func:`~websearch_bot._plan.fit_plan` lays out the
+    tree — how many levels, how many calls per level, each node's summary
+    target — and checks it against the call / time budget (see
+    :mod:`websearch_bot._plan`).  Each level splits its input along the
+    Markdown structure (see :mod:`websearch_bot._chunk`) and summarises the
+    chunks concurrently, as many at once as :func:`llm_concurrency` allows.
+    Inner levels compress 4 : 1; the last one only as far as the budget
+    needs.
+
+    The calls are spread over the whole model pool: chunks are sized so
+    that as much of the pool's TPM as possible can take them, and each
+    level hands every chunk to the model with budget for it soonest (see
+    :mod:`websearch_bot._dispatch`).
+
+    With a *query*, the source text is scored locally for relevance (BM25
+    on word stems, :func:`~websearch_bot._extractive.relevance`), first per
+    heading section and then, in the first level, per chunk.  Sections and
+    chunks that never mention the query are not sent at all — only their
+    headings are kept.  Off-topic sections are dropped before planning, so
+    they go even when what remains needs no LLM call.  Barely relevant
+    chunks get a tiny summary target.  Later levels work on the model's own
+    paraphrases, which are not re-scored.  Every prompt asks for what
+    answers the query.
+
+    Compression stops early without omitting content:
+
+    * **All models rate-limited** — if no LLM call succeeds in a level,
+      the text is returned as it stands.
+    * **Over budget** — a plan that exceeds the call / time budget runs only
+      the levels that fit, or none at all.
 
     Args:
         text: Input text to compress.
         max_chars: Target character budget.
-        _depth: Recursion depth counter (internal — do not pass).
-        _calls: Running LLM-call count (internal — do not pass).
-        _llm_used: Whether any LLM call ever succeeded (internal — do not pass).
+        report: Optional dict that receives ``llm_calls_predicted``,
+            ``reduce_levels`` (actual), ``llm_models`` (calls answered per
+            model), ``chunks_skipped`` (off-topic, with a *query*) and,
+            when the plan did not fit its budget,
+            ``compression_plan`` (``"degraded"`` or ``"refused"``).
+        query: Focus of the summaries; see above.
 
     Returns:
         A 3-tuple ``(compressed_text, total_llm_calls, llm_was_used)``.
     """
     if len(text) <= max_chars:
-        return text, _calls, _llm_used
-
-    if _depth >= 20:  # safety valve — all LLMs persistently unavailable
-        return text, _calls, _llm_used
-
-    # Chunk size = 50 % of the primary model's per-minute token budget.
-    # Example: llama-3.3-70b at 12 K TPM → 12 000 × 4 × 0.5 = 24 000 chars/chunk.
-    # Non-Groq paid providers have no tight TPM limit; use 30K as a safe default.
-    _default_tpm = 6_000 if PRIMARY.startswith("groq/") else 30_000
-    tpm = MODEL_TPM.get(PRIMARY, _default_tpm)
-    chunk_chars = max(int(tpm * 4 * 0.5), 8_000)
-
-    chunks = [text[i: i + chunk_chars] for i in range(0, len(text), chunk_chars)]
-    llm_succeeded = [False]
-
-    def _summarize(chunk: str) -> str:
-        # Target 25 % of input tokens → 4 : 1 compression ratio per chunk.
-        target = max(len(chunk) // 16, 256)
-        result, model = call_llm(system=_COMPRESS_SYSTEM, user=chunk, max_tokens=target)
-        if result and model:
-            llm_succeeded[0] = True
-            return result
-        return chunk  # keep intact on failure — never drop content
-
-    # Two concurrent workers keep token usage ≤ TPM (2 × chunk_tokens ≤ TPM).
-    with ThreadPoolExecutor(max_workers=2) as pool:
-        summaries = list(pool.map(_summarize, chunks))
-
-    new_calls = _calls + len(chunks)
-    used = _llm_used or llm_succeeded[0]
-    combined = "\n\n".join(summaries)
-
-    # If nothing was compressed this pass, stop — another pass would be a no-op.
-    if not llm_succeeded[0]:
-        return combined, new_calls, used
-
-    if len(combined) > max_chars:
-        return compress_text(combined, max_chars, _depth + 1, new_calls, used)
-    return combined, new_calls, used
+        return text, 0, False
+
+    # Budget in tokens, at this text's own chars-per-token ratio.
+    budget_tokens = max(int(max_chars * count_tokens(text) / len(text)), 1)
+    base = pool_chunk_model(_live_models() or [PRIMARY], 1 + 1 / RATIO)
+    sizes = sorted({chunk_tokens(base, scale) for scale in (1, 2, 4)})
+    terms = query_terms(query) if query else []
+    system = _COMPRESS_SYSTEM + _FOCUS.format(query=query) if terms else _COMPRESS_SYSTEM
+    splits: dict[int, tuple[list[str], list[int]]] = {}
+
+    skipped = 0
+    if terms:
+        # Drop off-topic sections up front, whether or not a level follows.
+        parts = sections(text)
+        weights = relevance(parts, terms)
+        skipped = sum(w <= 0 for w in weights)
+        if skipped:
+            text = "".join(
+                p if w > 0 else "".join(f"{h}\n\n" for h in headings(p))
+                for p, w in zip(parts, weights, strict=True)
+            )
+
+    def _leaves(size: int) -> list[int]:
+        chunks = split_markdown(text, size)
+        splits[size] = chunks, [count_tokens(c) for c in chunks]
+        weights = relevance(chunks, terms)
+        return [n for n, w in zip(splits[size][1], weights, strict=True) if w > 0]
+
+    latency = (HEALTH.snapshot().get(PRIMARY, {}).get("latency_ms") or _DEFAULT_LATENCY * 1000) / 1000
+    concurrency = llm_concurrency(sizes[0] + sizes[0] // RATIO)
+    plan = fit_plan(_leaves, budget_tokens, sizes, concurrency, latency)
+    if report is not None:
+        report["llm_calls_predicted"] = plan.calls
+        if plan.degraded or plan.refused:
+            report["compression_plan"] = "refused" if plan.refused else "degraded"
+
+    calls = 0
+    used = False
+    levels = 0
+    answered: Counter[str] = Counter()
+    current = text
+    # Summaries may overshoot their targets: allow one level beyond the plan,
+    # but never more calls than the budget.
+    while plan.levels and levels < len(plan.levels) + (0 if plan.degraded else 1):
+        if levels == 0:
+            chunks, sized = splits[plan.chunk_tokens]
+        else:
+            chunks = split_markdown(current, plan.chunk_tokens)
+            sized = [count_tokens(c) for c in chunks]
+        if not chunks:  # whitespace only
+            break
+        # Only source text is scored; summaries paraphrase the query away.
+        weights = relevance(chunks, terms) if levels == 0 else [1.0] * len(chunks)
+        sent = [w > 0 for w in weights]
+        if MAX_CALLS and calls + sum(sent) > MAX_CALLS:
+            if report is not None:
+                report["compression_plan"] = "degraded"
+            break
+        targets, _ = level_targets(sized, budget_tokens, [w < _LOW_RELEVANCE for w in weights])
+        sem = asyncio.Semaphore(llm_concurrency(max(sized) + max(targets)))
+        picks = iter(await aassign(_live_models(), [
+            estimate_tokens(system, c, t)
+            for c, t, send in zip(chunks, targets, sent, strict=True)
+            if send
+        ]))
+        models = [next(picks) if send else None for send in sent]
+        succeeded = [False]
+
+        async def _summarize(
+            chunk: str,
+            target: int,
+            send: bool,
+            prefer: str | None,
+            sem: asyncio.Semaphore,
+            succeeded: list[bool],
+        ) -> str:
+            if not send:  # off-topic: keep the outline, spend no call
+                return "\n".join(headings(chunk))
+            async with sem:
+                result, model = await acall_llm(
+                    system=system, user=chunk, max_tokens=target, prefer=prefer
+                )
+            if result and model:
+                succeeded[0] = True
+                answered[model] += 1
+                return result
+            return chunk  # keep intact on failure — never drop content
+
+        summaries = await asyncio.gather(*(
+            _summarize(c, t, send, m, sem, succeeded)
+            for c, t, send, m in zip(chunks, targets, sent, models, strict=True)
+        ))
+        summaries = [part for part in summaries if part.strip()]
+        calls += sum(sent)
+        # Chunks of bare headings were left by the section skip above.
+        skipped += sum(not send and _has_body(c) for c, send in zip(chunks, sent, strict=True))
+        levels += 1
+        current = "\n\n".join(summaries)
+        used = used or succeeded[0]
+        # Nothing compressed: another level would be a no-op.
+        if not succeeded[0] or len(current) <= max_chars:
+            break
+
+    if report is not None:
+        report["reduce_levels"] = levels
+        if answered:
+            report["llm_models"] = dict(answered)
+        if skipped:
+            report["chunks_skipped"] = skipped
+    return current, calls, used
+
+
+def compress_text(text: str, max_chars: int, query: str | None = None) -> tuple[str, int, bool]:
+    """Blocking wrapper around :func:`acompress_text`."""
+    return run_sync(acompress_text(text, max_chars, query=query))
@@ -0,0 +1,174 @@
+"""Reduce-tree planning for map-reduce compression.
+
+Compression used to recurse blindly: chunk, summarize at 4 : 1, join, and
+try again while the result is still over budget — up to 20 passes, with no
+idea up front how many passes or calls a document needs.  The planner
+works it out before the first call.  Given the input size, the budget and
+the first-level chunks, :func:`plan_reduce` lays out the reduce tree level
+by level:
+
+* a level splits its input into chunks (``nodes``) that are summarized in
+  parallel;
+* every level but the last compresses at the full :data:`RATIO`; the
+  summaries are then regrouped into chunks for the next level (``fan_in``
+  summaries per node);
+* the **last** level — the first one whose output at full ratio would fit
+  the budget — only compresses as much as needed: each node gets its share
+  of the budget as its target, so a document twice the budget needs one
+  gentle pass rather than a 4 : 1 squeeze.
+
+:func:`fit_plan` checks the plan against a call budget and a time budget
+(predicted from the available concurrency and model latency).  Over budget
+it first tries larger chunks (fewer, bigger calls, up to the model's
+context window); when that is not enough it **degrades** to the levels
+that fit (the output stays over ``max_chars``, as it does when every model
+is rate-limited) or, when not even the first level fits, **refuses** — the
+text is returned uncompressed without spending any calls.
+
+Environment:
+    WEBSEARCH_COMPRESS_MAX_CALLS: Most LLM calls one compression may plan
+        (default 200; ``0`` for no limit).
+    WEBSEARCH_COMPRESS_MAX_SECONDS: Longest predicted compression time in
+        seconds (default ``0``, no limit).
+
+Example:
+    >>> plan = plan_reduce([6_000] * 66, budget_tokens=25_000, chunk_tokens=6_000)
+    >>> [(level.nodes, level.target_tokens) for level in plan.levels]
+    [(66, 1500), (17, 1363)]
+    >>> plan.calls
+    83
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+__all__ = ["RATIO", "Level", "ReducePlan", "plan_reduce", "fit_plan", "level_targets"]
+
+MAX_CALLS: int = int(os.getenv("WEBSEARCH_COMPRESS_MAX_CALLS", "200"))
+MAX_SECONDS: float = float(os.getenv("WEBSEARCH_COMPRESS_MAX_SECONDS", "0"))
+
+#: Compression ratio of one summarization call (input tokens : output tokens).
+RATIO = 4
+# Smallest useful summary, in tokens.
+_MIN_TARGET = 256
+# Summary target of a chunk that is barely relevant to the query.
+_TINY_TARGET = 64
+# The last level aims this far under the budget, as summaries overshoot.
+_HEADROOM = 0.9
+# Hard bound on tree depth (a 4 : 1 tree this deep covers any real input).
+_MAX_LEVELS = 12
+
+
+@dataclass
+class Level:
+    """One level of the reduce tree."""
+
+    nodes: int            # LLM calls at this level
+    input_tokens: int
+    target_tokens: int    # per-node summary target (largest node)
+    fan_in: int           # summaries of the previous level per node (1 for leaves)
+    final: bool = False   # compresses to a budget share instead of the full ratio
+
+
+@dataclass
+class ReducePlan:
+    """A reduce tree, with its budgets and verdict."""
+
+    chunk_tokens: int
+    budget_tokens: int
+    levels: list[Level] = field(default_factory=list)
+    degraded: bool = False  # levels dropped to stay within the call / time budget
+    refused: bool = False   # not even the first level fits the budget
+
+    @property
+    def calls(self) -> int:
+        """Predicted LLM calls."""
+        return sum(level.nodes for level in self.levels)
+
+    def seconds(self, concurrency: int, latency: float) -> float:
+        """Predicted wall time: each level runs in waves of *concurrency* calls."""
+        return sum(math.ceil(level.nodes / max(concurrency, 1)) * latency for level in self.levels)
+
+
+def level_targets(
+    sizes: list[int], budget_tokens: int, low: list[bool] | None = None
+) -> tuple[list[int], bool]:
+    """Per-node summary targets for one level with node inputs of *sizes* tokens.
+
+    Returns the targets and whether this is the final level: when the level
+    at full :data:`RATIO` would fit *budget_tokens*, each node gets its
+    proportional share of the budget instead (never more than its input).
+    Nodes flagged in *low* (off-topic for the query) get
+    :data:`_TINY_TARGET` tokens at most, and leave their share to the rest.
+    """
+    low = low or [False] * len(sizes)
+    reserved = sum(min(_TINY_TARGET, s) for s, off in zip(sizes, low, strict=True) if off)
+    total = sum(s for s, off in zip(sizes, low, strict=True) if not off) or 1
+    final = total / RATIO + reserved <= budget_tokens
+    if final:
+        share = max(budget_tokens * _HEADROOM - reserved, 0) / total
+        targets = [max(min(int(s * share), s), min(_MIN_TARGET, s)) for s in sizes]
+    else:
+        targets = [max(s // RATIO, min(_MIN_TARGET, s)) for s in sizes]
+    return [min(_TINY_TARGET, s) if off else t for s, t, off in zip(sizes, targets, low, strict=True)], final
+
+
+def plan_reduce(leaves: list[int], budget_tokens: int, chunk_tokens: int) -> ReducePlan:
+    """Lay out the reduce tree for leaf chunks of *leaves* tokens into *budget_tokens*.
+
+    The leaves are the real first-level chunks; every later level is
+    assumed to pack the previous level's summaries into full chunks of
+    *chunk_tokens*.
+    """
+    chunk_tokens = max(chunk_tokens, 1)
+    plan = ReducePlan(chunk_tokens=chunk_tokens, budget_tokens=budget_tokens)
+    sizes = list(leaves)
+    fan_in = 1
+    while sizes and sum(sizes) > budget_tokens and len(plan.levels) < _MAX_LEVELS:
+        targets, final = level_targets(sizes, budget_tokens)
+        plan.levels.append(Level(len(sizes), sum(sizes), max(targets), fan_in, final))
+        if final:
+            break
+        # The next level packs this level's summaries into full chunks.
+        tokens = sum(targets)
+        fan_in = max(chunk_tokens // max(max(targets), 1), 1)
+        nodes = math.ceil(tokens / chunk_tokens)
+        sizes = [chunk_tokens] * (nodes - 1) + [tokens - chunk_tokens * (nodes - 1)]
+    return plan
+
+
+def fit_plan(
+    leaves: Callable[[int], list[int]],
+    budget_tokens: int,
+    chunk_sizes: list[int],
+    concurrency: int,
+    latency: float,
+    max_calls: int = MAX_CALLS,
+    max_seconds: float = MAX_SECONDS,
+) -> ReducePlan:
+    """Return the first plan, over ascending *chunk_sizes*, within the budgets.
+
+    *leaves* maps a chunk size to the token sizes of the first-level chunks
+    at that size; it is only called for the sizes actually tried.  When no
+    size fits, the plan with the largest chunks is cut down to the levels
+    that do fit (``degraded``), or to none (``refused``).
+    """
+    def fits(plan: ReducePlan) -> bool:
+        return (not max_calls or plan.calls <= max_calls) and (
+            not max_seconds or plan.seconds(concurrency, latency) <= max_seconds
+        )
+
+    plan = ReducePlan(chunk_tokens=chunk_sizes[-1], budget_tokens=budget_tokens)
+    for size in chunk_sizes:
+        plan = plan_reduce(leaves(size), budget_tokens, size)
+        if fits(plan):
+            return plan
+    while plan.levels and not fits(plan):
+        plan.levels.pop()
+        plan.degraded = True
+    plan.refused = not plan.levels
+    return plan
@@ -0,0 +1,323 @@
+"""Warm headless-browser pool shared by every crawl in the process.
+
+Launching Chromium dominates the latency of a single-page scrape, so instead
+of ``async with AsyncWebCrawler(...)`` per call, crawls borrow an already
+started crawler from a :class:`BrowserPool`:
+
+* **Warm reuse** — idle crawlers are handed out most-recently-used first;
+  crawl4ai recycles the browser context and opens a fresh page per crawl.
+* **Bounded size** — at most ``size`` browsers per pool; extra callers wait.
+* **Health checks** — a crawler whose browser has disconnected is discarded
+  on checkout/checkin and transparently replaced.
+* **Recycling** — a crawler is retired after ``max_uses`` crawls to cap
+  Chromium memory growth.
+* **Idle shutdown** — browsers unused for ``idle_timeout`` seconds are closed.
+
+Every launched browser carries the request-blocking hook from
+:mod:`websearch_bot._block`.
+
+Each pool also owns one shared HTTP-tier crawler (see
+:mod:`websearch_bot._http`), whose aiohttp connection pool is reused by every
+static-page fetch on the loop.
+
+Browsers are bound to the event loop that launched them, so there is one
+pool per loop.  The sync API always runs on the background loop from
+:mod:`websearch_bot._aio`, which therefore owns the long-lived pool.
+
+Environment:
+    WEBSEARCH_BROWSER_POOL_SIZE: Max warm browsers per pool (default 2).
+    WEBSEARCH_BROWSER_IDLE_TIMEOUT: Seconds before an idle browser is
+        closed (default 300).
+    WEBSEARCH_BROWSER_MAX_USES: Crawls served before a browser is
+        recycled (default 100).
+
+Example:
+    >>> async with get_pool().acquire() as crawler:
+    ...     result = await crawler.arun("https://example.com")
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import os
+import weakref
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass, field
+
+from crawl4ai import AsyncWebCrawler, BrowserConfig
+
+from . import _aio, _block, _http
+
+__all__ = ["BrowserPool", "get_pool", "configure", "aclose", "close"]
+
+# ---------------------------------------------------------------------------
+# Browser configuration
+# ---------------------------------------------------------------------------
+
+# Headless Chromium; images and remote fonts disabled for speed.
+_BROWSER = BrowserConfig(
+    headless=True,
+    text_mode=False,
+    extra_args=[
+        "--blink-settings=imagesEnabled=false",
+        "--disable-remote-fonts",
+        "--disable-background-timer-throttling",
+        "--disable-backgrounding-occluded-windows",
+        "--disable-renderer-backgrounding",
+        "--no-first-run",
+    ],
+)
+
+#: Pool defaults — overridable via env vars or :func:`configure`.
+POOL_SIZE: int = int(os.getenv("WEBSEARCH_BROWSER_POOL_SIZE", "2"))
+IDLE_TIMEOUT: float = float(os.getenv("WEBSEARCH_BROWSER_IDLE_TIMEOUT", "300"))
+MAX_USES: int = int(os.getenv("WEBSEARCH_BROWSER_MAX_USES", "100"))
+
+# ---------------------------------------------------------------------------
+# Pool
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _Slot:
+    """One pooled crawler plus its bookkeeping."""
+    crawler: AsyncWebCrawler
+    uses: int = 0
+    last_used: float = field(default=0.0)
+
+
+def _is_healthy(crawler: AsyncWebCrawler) -> bool:
+    """Return ``False`` when the crawler's Chromium process is gone."""
+    if not getattr(crawler, "ready", True):
+        return False
+    manager = getattr(getattr(crawler, "crawler_strategy", None), "browser_manager", None)
+    browser = getattr(manager, "browser", None)
+    try:
+        return browser is None or browser.is_connected()
+    except Exception:
+        return False
+
+
+class BrowserPool:
+    """Bounded pool of started :class:`AsyncWebCrawler` instances.
+
+    All methods must be awaited on the event loop that owns the pool.
+
+    Args:
+        size: Maximum number of concurrently launched browsers.
+        idle_timeout: Seconds an idle browser is kept before shutdown.
+        max_uses: Crawls served by one browser before it is recycled.
+        browser_config: crawl4ai browser configuration for new launches.
+    """
+
+    def __init__(
+        self,
+        size: int = POOL_SIZE,
+        idle_timeout: float = IDLE_TIMEOUT,
+        max_uses: int = MAX_USES,
+        browser_config: BrowserConfig = _BROWSER,
+    ) -> None:
+        self.size = max(1, size)
+        self.idle_timeout = idle_timeout
+        self.max_uses = max(1, max_uses)
+        self.browser_config = browser_config
+        self._idle: list[_Slot] = []
+        self._total = 0
+        self._cond = asyncio.Condition()
+        self._reaper: asyncio.Task | None = None
+        self._closed = False
+        self._http_crawler: AsyncWebCrawler | None = None
+        self._http_lock = asyncio.Lock()
+        self.launches = 0
+        self.reuses = 0
+
+    def stats(self) -> dict:
+        """Return a snapshot of pool occupancy and reuse counters."""
+        return {
+            "size": self.size,
+            "browsers": self._total,
+            "idle": len(self._idle),
+            "launches": self.launches,
+            "reuses": self.reuses,
+        }
+
+    async def http(self) -> AsyncWebCrawler:
+        """Return the pool's shared HTTP-tier crawler, starting it on first use.
+
+        Unlike browsers it is not leased — the underlying connection pool
+        serves any number of concurrent requests.
+        """
+        async with self._http_lock:
+            if self._closed:
+                raise RuntimeError("browser pool is closed")
+            if self._http_crawler is None:
+                crawler = _http.make_crawler()
+                await crawler.start()
+                self._http_crawler = crawler
+            return self._http_crawler
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Borrow a started crawler for the duration of the ``async with`` block."""
+        slot = await self._checkout()
+        try:
+            yield slot.crawler
+        finally:
+            await self._checkin(slot)
+
+    async def _checkout(self) -> _Slot:
+        dead: list[_Slot] = []
+        try:
+            async with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("browser pool is closed")
+                    while self._idle:
+                        slot = self._idle.pop()  # most recently used = warmest
+                        if _is_healthy(slot.crawler):
+                            self.reuses += 1
+                            return slot
+                        self._total -= 1
+                        dead.append(slot)
+                    if self._total < self.size:
+                        self._total += 1
+                        break
+                    await self._cond.wait()
+        finally:
+            for slot in dead:
+                await self._dispose(slot)
+
+        # Launch outside the lock so other callers can still check in/out.
+        try:
+            crawler = AsyncWebCrawler(config=self.browser_config)
+            _block.install(crawler)
+            await crawler.start()
+        except BaseException:
+            async with self._cond:
+                self._total -= 1
+                self._cond.notify()
+            raise
+        self.launches += 1
+        self._ensure_reaper()
+        return _Slot(crawler)
+
+    async def _checkin(self, slot: _Slot) -> None:
+        slot.uses += 1
+        slot.last_used = asyncio.get_running_loop().time()
+        retire = (
+            self._closed
+            or slot.uses >= self.max_uses
+            or not _is_healthy(slot.crawler)
+        )
+        async with self._cond:
+            if retire:
+                self._total -= 1
+            else:
+                self._idle.append(slot)
+            self._cond.notify()
+        if retire:
+            await self._dispose(slot)
+
+    @staticmethod
+    async def _dispose(slot: _Slot) -> None:
+        with suppress(Exception):
+            await slot.crawler.close()
+
+    def _ensure_reaper(self) -> None:
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.get_running_loop().create_task(self._reap())
+
+    async def _reap(self) -> None:
+        """Close browsers idle longer than ``idle_timeout``; exit when empty."""
+        interval = max(1.0, min(self.idle_timeout / 2, 30.0))
+        while not self._closed:
+            await asyncio.sleep(interval)
+            now = asyncio.get_running_loop().time()
+            async with self._cond:
+                stale = [s for s in self._idle if now - s.last_used >= self.idle_timeout]
+                self._idle = [s for s in self._idle if s not in stale]
+                self._total -= len(stale)
+                empty = self._total == 0
+            for slot in stale:
+                await self._dispose(slot)
+            if empty:
+                return
+
+    async def aclose(self) -> None:
+        """Close every idle browser; leased ones are closed on checkin."""
+        self._closed = True
+        if self._reaper is not None:
+            self._reaper.cancel()
+        async with self._cond:
+            idle, self._idle = self._idle, []
+            self._total -= len(idle)
+            self._cond.notify_all()
+        for slot in idle:
+            await self._dispose(slot)
+        async with self._http_lock:
+            http, self._http_crawler = self._http_crawler, None
+        if http is not None:
+            await self._dispose(_Slot(http))
+
+
+# ---------------------------------------------------------------------------
+# Per-loop registry
+# ---------------------------------------------------------------------------
+
+_POOLS: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, BrowserPool] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_pool() -> BrowserPool:
+    """Return the browser pool for the running event loop, creating it lazily."""
+    loop = asyncio.get_running_loop()
+    pool = _POOLS.get(loop)
+    if pool is None or pool._closed:
+        pool = _POOLS[loop] = BrowserPool(POOL_SIZE, IDLE_TIMEOUT, MAX_USES)
+    return pool
+
+
+def configure(
+    size: int | None = None,
+    idle_timeout: float | None = None,
+    max_uses: int | None = None,
+) -> None:
+    """Change pool settings for existing and future pools.
+
+    Args:
+        size: Maximum warm browsers per pool.
+        idle_timeout: Seconds before an idle browser is closed.
+        max_uses: Crawls served before a browser is recycled.
+    """
+    global POOL_SIZE, IDLE_TIMEOUT, MAX_USES
+    if size is not None:
+        POOL_SIZE = max(1, size)
+    if idle_timeout is not None:
+        IDLE_TIMEOUT = idle_timeout
+    if max_uses is not None:
+        MAX_USES = max(1, max_uses)
+    for pool in list(_POOLS.values()):
+        pool.size, pool.idle_timeout, pool.max_uses = POOL_SIZE, IDLE_TIMEOUT, MAX_USES
+
+
+async def aclose() -> None:
+    """Shut down the warm browsers owned by the running event loop."""
+    pool = _POOLS.get(asyncio.get_running_loop())
+    if pool is not None:
+        await pool.aclose()
+
+
+def close() -> None:
+    """Shut down the warm browsers used by the synchronous API."""
+    loop = _aio._LOOP
+    pool = _POOLS.get(loop) if loop is not None else None
+    if pool is not None:
+        _aio.run_sync(pool.aclose(), timeout=30)
+
+
+@atexit.register
+def _close_at_exit() -> None:
+    with suppress(Exception):
+        close()
@@ -0,0 +1,140 @@
+"""Learned per-domain crawl profiles — skip strategies that are known to fail.
+
+A single-site crawl can be served by three strategies, tried in order:
+
+* ``http`` — the HTTP-first tier (:mod:`websearch_bot._http`);
+* ``networkidle`` — headless browser, wait for network idle (15 s timeout);
+* ``domcontentloaded`` — headless browser, DOM ready + full-page scroll.
+
+Every attempt records, per domain, whether it produced content and how
+long it took.  On later calls :meth:`DomainProfile.plan` puts the winning
+strategy first and drops strategies that have only ever failed, so a site
+that never reaches network idle stops paying the 15 s timeout every time.
+A dropped strategy is tried again once its last failure is
+:data:`_RETRY_AFTER` seconds old, so a brief outage is not remembered
+forever.
+
+Profiles are kept in memory and persisted to the shared SQLite cache
+(:mod:`websearch_bot._cache`) so every worker process learns together:
+each attempt is merged into the stored row, not written over it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+from ._cache import ENABLED as _PERSIST
+from ._cache import _Store
+
+__all__ = ["STRATEGIES", "DomainProfile", "get_profile", "record"]
+
+#: Default try-order of crawl strategies.
+STRATEGIES: tuple[str, ...] = ("http", "networkidle", "domcontentloaded")
+
+# Failures (with zero successes) after which a strategy is skipped.
+_DOOMED_AFTER = 2
+# Counts are halved past this many samples so profiles track site changes.
+_MAX_SAMPLES = 20
+# A skipped strategy is retried this many seconds after its last failure.
+_RETRY_AFTER = 6 * 3600.0
+
+_STORE = _Store("profiles", 4 * 1024 * 1024)
+_PROFILES: dict[str, DomainProfile] = {}
+
+
+def _domain(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+
+@dataclass
+class DomainProfile:
+    """Per-strategy outcome statistics for one domain.
+
+    ``stats`` maps strategy → ``{"ok": n, "empty": n, "avg_s": seconds,
+    "failed_at": timestamp}`` where ``avg_s`` is the mean duration of
+    successful attempts and ``failed_at`` the time of the last failure.
+    """
+    domain: str
+    stats: dict[str, dict] = field(default_factory=dict)
+
+    def record(self, strategy: str, ok: bool, elapsed: float) -> None:
+        """Add one attempt's outcome."""
+        s = self.stats.setdefault(strategy, {"ok": 0, "empty": 0, "avg_s": 0.0})
+        if ok:
+            s["avg_s"] = (s["avg_s"] * s["ok"] + elapsed) / (s["ok"] + 1)
+            s["ok"] += 1
+        else:
+            s["empty"] += 1
+            s["failed_at"] = time.time()
+        if s["ok"] + s["empty"] > _MAX_SAMPLES:
+            s["ok"], s["empty"] = s["ok"] / 2, s["empty"] / 2
+
+    def _doomed(self, strategy: str) -> bool:
+        s = self.stats.get(strategy)
+        if not s:
+            return False
+        return (
+            s["ok"] == 0 and s["empty"] >= _DOOMED_AFTER
+            and time.time() - s.get("failed_at", 0.0) < _RETRY_AFTER
+        )
+
+    def winner(self) -> str | None:
+        """Strategy with the best success rate (ties → fastest), if any succeeded."""
+        good = [(k, s) for k, s in self.stats.items() if s["ok"] > 0]
+        if not good:
+            return None
+        return min(
+            good, key=lambda ks: (-ks[1]["ok"] / (ks[1]["ok"] + ks[1]["empty"]), ks[1]["avg_s"])
+        )[0]
+
+    def plan(self, allowed: tuple[str, ...] = STRATEGIES) -> list[str]:
+        """Return the strategies to try, winner first, known-doomed ones dropped.
+
+        Never returns an empty list: if every allowed strategy looks doomed
+        the last one is kept as a final attempt.
+        """
+        order = [s for s in allowed if not self._doomed(s)] or [allowed[-1]]
+        best = self.winner()
+        if best in order:
+            order.remove(best)
+            order.insert(0, best)
+        return order
+
+
+async def get_profile(url: str) -> DomainProfile:
+    """Return the profile for *url*'s domain, loading it from disk on first use."""
+    domain = _domain(url)
+    profile = _PROFILES.get(domain)
+    if profile is None:
+        stats: dict = {}
+        if _PERSIST:
+            try:
+                row = await asyncio.to_thread(_STORE.get, domain)
+                if row is not None:
+                    stats = json.loads(row[0])
+            except Exception:
+                pass
+        profile = _PROFILES[domain] = DomainProfile(domain, stats)
+    return profile
+
+
+async def record(url: str, strategy: str, ok: bool, elapsed: float) -> None:
+    """Record an attempt for *url*'s domain, merged into the persisted profile."""
+    profile = await get_profile(url)
+    if _PERSIST:
+        def merge(stored: str | None) -> str:
+            merged = DomainProfile(profile.domain, json.loads(stored) if stored else {})
+            merged.record(strategy, ok, elapsed)
+            return json.dumps(merged.stats)
+
+        try:
+            row = await asyncio.to_thread(_STORE.update, profile.domain, merge)
+            profile.stats = json.loads(row)
+            return
+        except Exception:
+            pass
+    profile.record(strategy, ok, elapsed)
@@ -0,0 +1,361 @@
+"""Token-bucket rate limiting for LLM calls, driven by the Groq model catalog.
+
+:data:`websearch_bot._groq.MODELS` lists each model's free-tier ``rpm``,
+``rpd``, ``tpm`` and ``tpd``.  :data:`LIMITER` keeps four token buckets per
+model — requests and tokens, per minute and per day — that refill
+continuously at those rates.  Before a call, :meth:`RateLimiter.acquire`
+takes the first model of the fallback chain whose buckets can cover the
+request (estimated prompt tokens + ``max_tokens``); when none can, it
+waits for the one that frees up first, up to ``WEBSEARCH_LLM_MAX_WAIT``
+seconds.  Calls are therefore routed or delayed *before* they would be
+rejected, instead of burning through ``429`` responses and landing on
+weaker models.
+
+After a call :meth:`RateLimiter.settle` corrects the token buckets with the
+real usage reported by the provider, and :meth:`RateLimiter.throttled`
+empties a model's minute buckets when it answers ``429`` anyway (another
+client sharing the key, or a stale catalog).
+
+Models without catalog limits (non-Groq providers) are never limited.
+
+Bucket state lives in memory for the whole process; with
+``WEBSEARCH_RATE_LIMIT_SHARED=1`` it is kept in the shared SQLite cache
+file instead (:mod:`websearch_bot._cache`), updated in ``BEGIN IMMEDIATE``
+transactions so every worker process draws from the same budget.
+
+Environment:
+    WEBSEARCH_RATE_LIMIT: Set to ``0`` to disable client-side limiting.
+    WEBSEARCH_RATE_LIMIT_SHARED: Set to ``1`` to share budgets between
+        processes through the cache database.
+    WEBSEARCH_LLM_MAX_WAIT: Longest wait, in seconds, for a model's budget
+        before the call gives up (default 30).
+
+Example:
+    >>> tokens = estimate_tokens(system, user, max_tokens=512)
+    >>> model = await LIMITER.acquire(["groq/llama-3.3-70b-versatile", ...], tokens)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from . import _cache
+from ._groq import MODELS
+
+__all__ = [
+    "LIMITER", "RateLimiter", "estimate_tokens", "retry_after", "used_tokens", "rate_limit_stats",
+]
+
+ENABLED: bool = os.getenv("WEBSEARCH_RATE_LIMIT", "1").lower() not in ("0", "false", "no", "off")
+SHARED: bool = os.getenv("WEBSEARCH_RATE_LIMIT_SHARED", "0").lower() in ("1", "true", "yes", "on")
+MAX_WAIT: float = float(os.getenv("WEBSEARCH_LLM_MAX_WAIT", "30"))
+
+# bucket → (catalog field, refill period in seconds)
+_BUCKETS: dict[str, tuple[str, float]] = {
+    "rpm": ("rpm", 60.0),
+    "rpd": ("rpd", 86_400.0),
+    "tpm": ("tpm", 60.0),
+    "tpd": ("tpd", 86_400.0),
+}
+# Default pause after a 429 without a usable Retry-After header.
+_THROTTLE_SECONDS = 60.0
+
+#: litellm model ID → {bucket: capacity} for every model with published limits.
+_LIMITS: dict[str, dict[str, int]] = {
+    m["litellm_id"]: {b: m[field] for b, (field, _) in _BUCKETS.items() if m.get(field)}
+    for m in MODELS
+    if m.get("litellm_id")
+}
+
+
+def estimate_tokens(system: str, user: str, max_tokens: int) -> int:
+    """Tokens a call may consume: prompt (~4 chars per token) plus *max_tokens*."""
+    return (len(system) + len(user)) // 4 + max_tokens
+
+
+def retry_after(exc: BaseException) -> float | None:
+    """Return the ``Retry-After`` delay if *exc* is a rate-limit (429) error.
+
+    Returns ``0.0`` for a 429 without a usable header and ``None`` for any
+    other error.
+    """
+    response = getattr(exc, "response", None)
+    status = getattr(exc, "status_code", None) or getattr(response, "status_code", None)
+    if status != 429 and type(exc).__name__ != "RateLimitError":
+        return None
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after") or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def used_tokens(resp) -> int | None:
+    """Total tokens reported in a litellm response's ``usage``, if any."""
+    usage = getattr(resp, "usage", None)
+    return getattr(usage, "total_tokens", None)
+
+
+# ---------------------------------------------------------------------------
+# Bucket state backends
+# ---------------------------------------------------------------------------
+
+
+class _MemoryState:
+    """Process-wide bucket state, guarded by a lock (safe from any thread)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._state: dict[str, dict] = {}
+
+    @contextmanager
+    def transaction(self, model: str) -> Iterator[dict]:
+        with self._lock:
+            yield self._state.setdefault(model, {})
+
+
+class _SqliteState:
+    """Bucket state in the shared cache database, one row per model.
+
+    ``BEGIN IMMEDIATE`` takes the write lock before reading, so the
+    read-refill-consume-write cycle is atomic across processes.
+    """
+
+    def __init__(self) -> None:
+        self._ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._ready:
+            _cache.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(_cache._DB_PATH, timeout=30, isolation_level=None)
+        if not self._ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits (model TEXT PRIMARY KEY, state TEXT NOT NULL)"
+            )
+            self._ready = True
+        return conn
+
+    @contextmanager
+    def transaction(self, model: str) -> Iterator[dict]:
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT state FROM rate_limits WHERE model = ?", (model,)).fetchone()
+            state = json.loads(row[0]) if row else {}
+            yield state
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limits VALUES (?, ?)", (model, json.dumps(state))
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+
+# ---------------------------------------------------------------------------
+# Limiter
+# ---------------------------------------------------------------------------
+
+
+class RateLimiter:
+    """Per-model token buckets built from the Groq catalog limits.
+
+    Args:
+        limits: ``model → {"rpm"|"rpd"|"tpm"|"tpd": capacity}``; models not
+            listed are unlimited.
+        shared: Keep bucket state in the cache database (multi-process).
+        max_wait: Longest time :meth:`acquire` waits for budget.
+    """
+
+    def __init__(
+        self,
+        limits: dict[str, dict[str, int]],
+        shared: bool = False,
+        max_wait: float = MAX_WAIT,
+    ) -> None:
+        self.limits = limits
+        self.shared = shared
+        self.max_wait = max_wait
+        self._state = _SqliteState() if shared else _MemoryState()
+        self.stats: Counter[str] = Counter()
+
+    # -- bucket arithmetic (called inside a state transaction) ---------------
+
+    def _refill(self, model: str, state: dict, now: float) -> None:
+        """Bring *state*'s bucket levels up to date (buckets start full)."""
+        elapsed = max(now - state.get("t", now), 0.0)
+        for bucket, capacity in self.limits[model].items():
+            period = _BUCKETS[bucket][1]
+            level = state.get(bucket, capacity)
+            state[bucket] = min(capacity, level + capacity * elapsed / period)
+        state["t"] = now
+
+    def _wait(self, model: str, state: dict, tokens: int, now: float) -> float:
+        """Seconds until *state* can cover one request of *tokens*."""
+        wait = max(state.get("blocked_until", 0.0) - now, 0.0)
+        for bucket, capacity in self.limits[model].items():
+            # A request larger than a whole bucket goes through once it is full.
+            need = min(tokens if bucket.startswith("t") else 1, capacity)
+            deficit = need - state[bucket]
+            if deficit > 0:
+                wait = max(wait, deficit * _BUCKETS[bucket][1] / capacity)
+        return wait
+
+    def _try(self, model: str, tokens: int) -> float:
+        """Take budget for one call if available; return 0, else seconds to wait."""
+        if model not in self.limits:
+            return 0.0
+        now = time.time()
+        with self._state.transaction(model) as state:
+            self._refill(model, state, now)
+            wait = self._wait(model, state, tokens, now)
+            if wait == 0.0:
+                for bucket in self.limits[model]:
+                    state[bucket] -= tokens if bucket.startswith("t") else 1
+        return wait
+
+    # -- public API ----------------------------------------------------------
+
+    def try_acquire(self, models: list[str], tokens: int) -> tuple[str | None, float]:
+        """Take budget from the first of *models* that has it.
+
+        Returns:
+            ``(model, 0.0)`` on success, else ``(None, shortest_wait)``.
+        """
+        shortest = float("inf")
+        for i, model in enumerate(models):
+            try:
+                wait = self._try(model, tokens)
+            except Exception:
+                wait = 0.0  # broken state store — never block calls on it
+            if wait == 0.0:
+                if i:
+                    self.stats["rerouted"] += 1
+                return model, 0.0
+            shortest = min(shortest, wait)
+        return None, shortest
+
+    async def acquire(self, models: list[str], tokens: int) -> str | None:
+        """Return the first of *models* with budget, waiting up to :attr:`max_wait`.
+
+        Returns ``None`` (after counting a ``gave_up``) when no model frees
+        up in time; the caller then treats the call as failed.
+        """
+        if not models:
+            return None
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            if self.shared:  # SQLite transactions may block — keep them off the loop
+                model, wait = await asyncio.to_thread(self.try_acquire, models, tokens)
+            else:
+                model, wait = self.try_acquire(models, tokens)
+            if model is not None:
+                return model
+            if time.monotonic() + wait > deadline:
+                self.stats["gave_up"] += 1
+                return None
+            self.stats["waits"] += 1
+            self.stats["waited_ms"] += int(wait * 1000)
+            await asyncio.sleep(wait)
+
+    def acquire_sync(self, models: list[str], tokens: int) -> str | None:
+        """Blocking variant of :meth:`acquire` for synchronous callers."""
+        if not models:
+            return None
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            model, wait = self.try_acquire(models, tokens)
+            if model is not None:
+                return model
+            if time.monotonic() + wait > deadline:
+                self.stats["gave_up"] += 1
+                return None
+            self.stats["waits"] += 1
+            self.stats["waited_ms"] += int(wait * 1000)
+            time.sleep(wait)
+
+    def remaining(self, model: str) -> dict[str, float]:
+        """Current bucket levels of *model*, without taking any budget.
+
+        Empty for models without limits (or when the state store fails).
+        """
+        if model not in self.limits:
+            return {}
+        try:
+            with self._state.transaction(model) as state:
+                self._refill(model, state, time.time())
+                levels = {bucket: state[bucket] for bucket in self.limits[model]}
+                blocked = state.get("blocked_until", 0.0) - time.time()
+        except Exception:
+            return {}
+        if blocked > 0:  # throttled: nothing left until the block ends
+            levels.update({b: 0.0 for b in ("rpm", "tpm") if b in levels})
+        return levels
+
+    def settle(self, model: str, reserved: int, used: int | None) -> None:
+        """Correct *model*'s token buckets once the real usage is known."""
+        if model not in self.limits or not used:
+            return
+        try:
+            with self._state.transaction(model) as state:
+                for bucket in ("tpm", "tpd"):
+                    if bucket in state:
+                        state[bucket] += reserved - used
+        except Exception:
+            pass
+
+    def throttled(self, model: str, retry_after: float | None = None) -> None:
+        """Record a ``429`` from *model*: block it for *retry_after* seconds."""
+        if model not in self.limits:
+            return
+        self.stats["throttled"] += 1
+        try:
+            with self._state.transaction(model) as state:
+                state["blocked_until"] = time.time() + (retry_after or _THROTTLE_SECONDS)
+                for bucket in ("rpm", "tpm"):
+                    if bucket in state:
+                        state[bucket] = 0.0
+        except Exception:
+            pass
+
+    async def asettle(self, model: str, reserved: int, used: int | None) -> None:
+        """Async :meth:`settle`; shared-state transactions run off the loop."""
+        if self.shared:
+            await asyncio.to_thread(self.settle, model, reserved, used)
+        else:
+            self.settle(model, reserved, used)
+
+    async def athrottled(self, model: str, retry_after: float | None = None) -> None:
+        """Async :meth:`throttled`; shared-state transactions run off the loop."""
+        if self.shared:
+            await asyncio.to_thread(self.throttled, model, retry_after)
+        else:
+            self.throttled(model, retry_after)
+
+
+#: Process-wide limiter used by every LLM call.
+LIMITER = RateLimiter(_LIMITS if ENABLED else {}, shared=SHARED)
+
+
+def rate_limit_stats() -> dict[str, int]:
+    """Return the process-wide limiter counters.
+
+    ``rerouted`` (calls sent to a later model of the chain because earlier
+    ones had no budget), ``waits`` / ``waited_ms`` (calls delayed until
+    budget freed up), ``gave_up`` (no budget within
+    ``WEBSEARCH_LLM_MAX_WAIT``) and ``throttled`` (``429`` responses seen
+    despite the limiter).
+    """
+    return dict(LIMITER.stats)
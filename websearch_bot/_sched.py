@@ -0,0 +1,245 @@
+"""Adaptive, per-host scheduler for batch crawls.
+
+Replaces crawl4ai's fixed ``SemaphoreDispatcher(max_session_permit=5)``
+with two layers of admission control:
+
+* **Per host** — at most ``per_host`` pages of one host are in flight, so a
+  batch that is mostly one domain stays polite.  A ``429`` / ``503``
+  response pauses that host (honouring ``Retry-After``) and retries the
+  page once, without slowing down the others.
+* **Global, adaptive** — the total in-flight limit follows an AIMD rule:
+  after every window of completions it grows by one while latency, error
+  rate and memory look healthy, and halves when the median latency doubles
+  against the best window seen, more than a fifth of pages fail, or system
+  memory is above ``WEBSEARCH_MEMORY_LIMIT`` percent.
+
+Pages are yielded in completion order, so the same scheduler serves both
+the batch and the streaming APIs.
+
+Environment:
+    WEBSEARCH_MAX_CONCURRENCY: Upper bound on concurrent page fetches
+        (default 4 × CPU cores, at most 32).
+    WEBSEARCH_PER_HOST: Max concurrent fetches per host (default 2).
+    WEBSEARCH_MEMORY_LIMIT: System memory use, in percent, above which
+        concurrency is cut (default 85).
+
+Example:
+    >>> sched = Scheduler(max_concurrency=16, per_host=2)
+    >>> async for url, result in sched.run(urls, lambda u: crawler.arun(u, config=cfg)):
+    ...     print(url, result.success)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import statistics
+import time
+from collections import defaultdict
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Protocol, TypeVar
+from urllib.parse import urlsplit
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - psutil ships with crawl4ai
+    psutil = None
+
+__all__ = ["Scheduler", "AdaptiveLimiter", "MAX_CONCURRENCY", "PER_HOST"]
+
+MAX_CONCURRENCY: int = int(
+    os.getenv("WEBSEARCH_MAX_CONCURRENCY", str(min(32, 4 * (os.cpu_count() or 2))))
+)
+PER_HOST: int = int(os.getenv("WEBSEARCH_PER_HOST", "2"))
+_MEMORY_LIMIT: float = float(os.getenv("WEBSEARCH_MEMORY_LIMIT", "85"))
+
+# Back-off for a throttled host when the response has no usable Retry-After.
+_HOST_BACKOFF = 5.0
+_MAX_HOST_BACKOFF = 60.0
+# A window whose median latency exceeds the best window by this factor is "slow".
+_SLOW_FACTOR = 2.0
+_MAX_ERROR_RATE = 0.2
+
+
+class _Result(Protocol):
+    """What the scheduler reads from a fetch result (a crawl4ai ``CrawlResult``)."""
+
+    success: bool
+
+
+_R = TypeVar("_R", bound=_Result)
+
+
+def _memory_pressure() -> bool:
+    if psutil is None:
+        return False
+    try:
+        return psutil.virtual_memory().percent >= _MEMORY_LIMIT
+    except Exception:
+        return False
+
+
+def _retry_after(result) -> float | None:
+    """Seconds to pause the host for, when *result* says it is being throttled."""
+    status = getattr(result, "status_code", None)
+    if status not in (429, 503):
+        return None
+    headers = {k.lower(): v for k, v in (getattr(result, "response_headers", None) or {}).items()}
+    try:
+        return min(float(headers.get("retry-after", "")), _MAX_HOST_BACKOFF)
+    except ValueError:
+        return _HOST_BACKOFF
+
+
+# ---------------------------------------------------------------------------
+# Global limiter
+# ---------------------------------------------------------------------------
+
+
+class AdaptiveLimiter:
+    """Concurrency limit that adapts with additive increase / multiplicative decrease.
+
+    Args:
+        initial: Starting limit.
+        maximum: Hard upper bound.
+        minimum: Hard lower bound.
+    """
+
+    def __init__(self, initial: int, maximum: int, minimum: int = 1) -> None:
+        self.maximum = max(maximum, 1)
+        self.minimum = max(min(minimum, self.maximum), 1)
+        self.limit = max(min(initial, self.maximum), self.minimum)
+        self.active = 0
+        self.peak = self.limit
+        self.decreases = 0
+        self._cond = asyncio.Condition()
+        self._latencies: list[float] = []
+        self._errors = 0
+        self._best: float | None = None
+        self._wakers: set[asyncio.Task] = set()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one unit of the current limit for the duration of the block."""
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self.active -= 1
+                self._cond.notify_all()
+
+    def observe(self, elapsed: float, ok: bool) -> None:
+        """Record one completed fetch; adjusts the limit at the end of each window."""
+        self._latencies.append(elapsed)
+        self._errors += not ok
+        if len(self._latencies) < max(self.limit, 4):
+            return
+        median = statistics.median(self._latencies)
+        error_rate = self._errors / len(self._latencies)
+        self._latencies, self._errors = [], 0
+        if self._best is None or median < self._best:
+            self._best = median
+        slow = median > self._best * _SLOW_FACTOR
+        if slow or error_rate > _MAX_ERROR_RATE or _memory_pressure():
+            self.limit = max(self.minimum, self.limit // 2)
+            self.decreases += 1
+        elif self.limit < self.maximum:
+            self.limit += 1
+            self.peak = max(self.peak, self.limit)
+        # A larger limit may admit waiters immediately.  Notifying needs the
+        # condition's lock, so it runs as a task — referenced until done so
+        # it cannot be garbage-collected mid-flight.
+        task = asyncio.ensure_future(self._wake())
+        self._wakers.add(task)
+        task.add_done_callback(self._wakers.discard)
+
+    async def _wake(self) -> None:
+        async with self._cond:
+            self._cond.notify_all()
+
+
+# ---------------------------------------------------------------------------
+# Scheduler
+# ---------------------------------------------------------------------------
+
+
+class Scheduler:
+    """Per-host + adaptive global admission control for one batch of URLs.
+
+    Args:
+        max_concurrency: Upper bound on pages in flight (default
+            :data:`MAX_CONCURRENCY`).
+        per_host: Max pages in flight per host (default :data:`PER_HOST`).
+        initial: Starting global limit; defaults to a quarter of
+            *max_concurrency* (at least 2) so a cold batch ramps up.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        per_host: int | None = None,
+        initial: int | None = None,
+    ) -> None:
+        maximum = max_concurrency or MAX_CONCURRENCY
+        self.per_host = max(per_host or PER_HOST, 1)
+        self.limiter = AdaptiveLimiter(initial or max(2, maximum // 4), maximum)
+        self._hosts: dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(self.per_host)
+        )
+        self._paused_until: dict[str, float] = {}
+        self.throttled = 0
+
+    async def _wait_for_host(self, host: str) -> None:
+        while (delay := self._paused_until.get(host, 0.0) - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+
+    async def _one(self, url: str, fetch: Callable[[str], Awaitable[_R]]) -> tuple[str, _R | None]:
+        host = (urlsplit(url).hostname or "").lower()
+        async with self._hosts[host]:
+            for _ in range(2):  # one retry after a throttling pause
+                await self._wait_for_host(host)
+                async with self.limiter.slot():
+                    start = time.perf_counter()
+                    try:
+                        result = await fetch(url)
+                    except Exception:
+                        result = None
+                    elapsed = time.perf_counter() - start
+                pause = _retry_after(result)
+                if pause is None:
+                    self.limiter.observe(elapsed, bool(result is not None and result.success))
+                    break
+                # Host-level throttling is not a sign of local overload:
+                # pause this host only and leave the global limit alone.
+                self.throttled += 1
+                self._paused_until[host] = time.monotonic() + pause
+        return url, result
+
+    async def run(
+        self, urls: list[str], fetch: Callable[[str], Awaitable[_R]]
+    ) -> AsyncIterator[tuple[str, _R | None]]:
+        """Fetch every URL and yield ``(url, result)`` in completion order.
+
+        *result* is whatever *fetch* returned (a crawl4ai ``CrawlResult``),
+        or ``None`` when it raised.
+        """
+        tasks = [asyncio.ensure_future(self._one(u, fetch)) for u in dict.fromkeys(urls)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stats(self) -> dict[str, int]:
+        """Final/peak global limit, number of cut-backs and throttled responses."""
+        return {
+            "limit": self.limiter.limit,
+            "peak": self.limiter.peak,
+            "decreases": self.limiter.decreases,
+            "throttled": self.throttled,
+        }
@@ -0,0 +1,48 @@
+"""Scraping and Markdown-generation settings shared by every crawl.
+
+Kept apart from :mod:`websearch_bot._crawl` so the extraction workers of
+:mod:`websearch_bot._extract` load only crawl4ai's scraping and Markdown
+modules — not the crawl machinery, caches and LLM layer — and build their
+scraper and generator from exactly the objects the in-loop path uses.
+"""
+
+from __future__ import annotations
+
+from crawl4ai.content_filter_strategy import PruningContentFilter
+from crawl4ai.content_scraping_strategy import LXMLWebScrapingStrategy
+from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+
+__all__: list[str] = []
+
+# PruningContentFilter removes low-density/boilerplate text blocks before
+# markdown generation, producing cleaner fit_markdown output for LLMs.
+_CONTENT_FILTER = PruningContentFilter(threshold=0.48, threshold_type="fixed")
+
+# Shared keyword arguments applied to every CrawlerRunConfig instance.
+_BASE: dict = dict(
+    word_count_threshold=10,
+    excluded_tags=["nav", "footer", "header", "aside", "script", "style"],
+    remove_overlay_elements=True,
+    remove_forms=True,                  # strip <form> elements — cleaner output
+    exclude_social_media_links=True,
+    magic=True,                         # auto-dismiss cookie banners / popups
+    markdown_generator=DefaultMarkdownGenerator(
+        content_filter=_CONTENT_FILTER,
+        options={"body_width": 0},
+    ),
+    scraping_strategy=LXMLWebScrapingStrategy(),
+    wait_until="networkidle",  # required for JS-rendered / SPA pages
+    page_timeout=15_000,       # 15 s (default is 60 s)
+    wait_for_images=False,
+    verbose=False,
+)
+
+# Batch crawls (search results, URL lists) favour robustness over speed.
+_BATCH: dict = {
+    **_BASE,
+    "excluded_tags": ["script", "style"],
+    "wait_until": "domcontentloaded",
+    "remove_overlay_elements": False,   # JS-rendered sites start hidden
+    "delay_before_return_html": 1.5,    # let hydration complete
+    "scan_full_page": True,             # scroll to trigger lazy loading
+}
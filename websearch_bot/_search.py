@@ -15,7 +15,11 @@ Example:
 
 from __future__ import annotations
 
-from ._crawl import scrape_many
+import asyncio
+from collections.abc import AsyncIterator
+
+from ._aio import run_sync
+from ._crawl import ascrape_many, astream_many
 from ._llm import MAX_CHARS
 from ._select import select_urls
 
@@ -25,24 +29,14 @@ __all__: list[str] = []
 _DDG_FETCH = 10
 
 
-def _ddg_search(
-    query: str,
-    max_results: int = _DDG_FETCH,
-    max_chars: int = MAX_CHARS,
-) -> str:
-    """Search DuckDuckGo, pick top URLs with an LLM, and scrape them.
+async def _aselect(query: str, max_results: int) -> list[str]:
+    """Fetch DDG candidates for *query* and let the LLM pick the URLs to scrape.
 
-    Fetches up to *max_results* candidates from DuckDuckGo, then uses an LLM
-    with structured Pydantic output to select the most relevant pages before
-    scraping.
-
-    Args:
-        query: Free-text search query.
-        max_results: How many DDG results to fetch as candidates.
-        max_chars: Character budget for the combined output.
+    The blocking DDG and selection calls run in worker threads so the
+    caller's event loop stays responsive.
 
     Returns:
-        A context-engineered Markdown document, or ``""`` on failure.
+        Selected URLs, or ``[]`` when the search fails or finds nothing.
     """
     try:
         from ddgs import DDGS
@@ -54,16 +48,88 @@ def _ddg_search(
 
     # 1. Fetch candidate results from DuckDuckGo.
     try:
-        results = list(DDGS().text(query, max_results=max_results))
+        results = await asyncio.to_thread(
+            lambda: list(DDGS().text(query, max_results=max_results))
+        )
     except Exception:
-        return ""
+        return []
 
     results = [r for r in results if r.get("href")]
     if not results:
-        return ""
+        return []
 
     # 2. Use LLM structured output to pick the most relevant URLs.
-    urls = select_urls(query, results)
+    return await asyncio.to_thread(select_urls, query, results)
+
+
+async def _addg_search(
+    query: str,
+    max_results: int = _DDG_FETCH,
+    max_chars: int = MAX_CHARS,
+    max_concurrency: int | None = None,
+    per_host: int | None = None,
+) -> str:
+    """Search DuckDuckGo, pick top URLs with an LLM, and scrape them.
+
+    Fetches up to *max_results* candidates from DuckDuckGo, then uses an LLM
+    with structured Pydantic output to select the most relevant pages before
+    scraping.
+
+    Args:
+        query: Free-text search query.
+        max_results: How many DDG results to fetch as candidates.
+        max_chars: Character budget for the combined output.
+        max_concurrency: Upper bound on pages fetched at once.
+        per_host: Max pages fetched at once from one host.
+
+    Returns:
+        A context-engineered Markdown document, or ``""`` on failure.
+    """
+    urls = await _aselect(query, max_results)
+    if not urls:
+        return ""
 
     # 3. Scrape selected URLs in parallel.
-    return scrape_many(urls, max_chars=max_chars)
+    return await ascrape_many(
+        urls, max_chars=max_chars, max_concurrency=max_concurrency, per_host=per_host,
+        query=query,
+    )
+
+
+async def _astream_ddg_search(
+    query: str,
+    max_results: int = _DDG_FETCH,
+    max_chars: int = MAX_CHARS,
+    max_concurrency: int | None = None,
+    per_host: int | None = None,
+) -> AsyncIterator[str]:
+    """Streaming variant of :func:`_addg_search` — one document per source.
+
+    Yields nothing when the search fails; otherwise see
+    :func:`~websearch_bot._crawl.astream_many`.
+    """
+    urls = await _aselect(query, max_results)
+    if urls:
+        stream = astream_many(
+            urls, max_chars=max_chars, max_concurrency=max_concurrency, per_host=per_host,
+            query=query,
+        )
+        async for doc in stream:
+            yield doc
+
+
+def _ddg_search(
+    query: str,
+    max_results: int = _DDG_FETCH,
+    max_chars: int = MAX_CHARS,
+    max_concurrency: int | None = None,
+    per_host: int | None = None,
+) -> str:
+    """Blocking wrapper around :func:`_addg_search`."""
+    return run_sync(_addg_search(
+        query,
+        max_results=max_results,
+        max_chars=max_chars,
+        max_concurrency=max_concurrency,
+        per_host=per_host,
+    ))
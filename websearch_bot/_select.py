@@ -7,14 +7,15 @@ to scrape.  Falls back to the top-N DDG results when the LLM is unavailable.
 
 from __future__ import annotations
 
+import time
 import warnings
 
 from pydantic import BaseModel, Field
 
 import websearch_bot._llm as _llm_mod
 
-from ._groq import get_fallbacks as _groq_fallbacks
-from ._models import _available_provider_fallbacks
+from ._health import HEALTH
+from ._ratelimit import LIMITER, retry_after, used_tokens
 
 __all__: list[str] = []
 
@@ -90,21 +91,38 @@ def select_urls(query: str, results: list[dict]) -> list[str]:
         litellm.suppress_debug_info = True
         warnings.filterwarnings("ignore", category=RuntimeWarning, module="litellm")
 
-        primary = _llm_mod.PRIMARY
-        all_fallbacks = _groq_fallbacks() + _available_provider_fallbacks()
-        all_models = [primary] + [m for m in all_fallbacks if m != primary]
-
-        for model in all_models:
-            try:
-                resp = litellm.completion(
-                    model=model,
-                    messages=msgs,
-                    response_format=_URLSelection,
-                    max_tokens=300,
-                    num_retries=0,
-                )
-                raw = resp.choices[0].message.content or ""
-                selection = _URLSelection.model_validate_json(raw)
+        # Same health-ordered chain as call_llm.
+        all_models = _llm_mod._model_chain()
+
+        reserved = prompt_tokens + 300
+        try:
+            while all_models:
+                model = LIMITER.acquire_sync(all_models, reserved)
+                if model is None:
+                    break
+                all_models = [m for m in all_models if m != model]
+                start = time.perf_counter()
+                try:
+                    resp = litellm.completion(
+                        model=model,
+                        messages=msgs,
+                        response_format=_URLSelection,
+                        max_tokens=300,
+                        num_retries=0,
+                    )
+                except Exception as exc:
+                    delay = retry_after(exc)
+                    HEALTH.record(model, False, time.perf_counter() - start, delay)
+                    if delay is not None:
+                        LIMITER.throttled(model, delay)
+                    continue
+                HEALTH.record(model, True, time.perf_counter() - start)
+                LIMITER.settle(model, reserved, used_tokens(resp))
+                try:
+                    raw = resp.choices[0].message.content or ""
+                    selection = _URLSelection.model_validate_json(raw)
+                except Exception:
+                    continue
                 selected = [u for u in selection.urls if u in valid][:_CRAWL_TOP]
                 if not selected:
                     continue
@@ -117,8 +135,8 @@ def select_urls(query: str, results: list[dict]) -> list[str]:
                     f"response: {resp_chars} chars / {resp_tokens} tok"
                 )
                 return selected
-            except Exception:
-                continue
+        finally:
+            HEALTH.release(all_models)
 
     except Exception:
         pass
@@ -0,0 +1,235 @@
+"""Disk spill for very large batch crawls — bounded memory at any batch size.
+
+:func:`~websearch_bot._crawl.ascrape_many` normally keeps every page in a
+list, joins them into one string and compresses that, so a batch of
+thousands of URLs needs all of its content in RAM several times over.
+Above :data:`THRESHOLD` URLs the batch runs in spill mode instead:
+
+1. URLs are crawled in windows of :data:`WINDOW`; the next window starts
+   only once the previous one is written out (backpressure);
+2. each window's pages are appended to a :class:`SpillStore` — a temporary
+   SQLite file — and dropped from memory;
+3. :func:`acondense` reads the pages back in groups of about
+   :data:`_GROUP_CHARS`, compresses each group to its share of the budget
+   (at most two groups in memory at a time), and writes the summaries back;
+4. the summaries are joined into the final document.
+
+Peak memory is therefore about one window plus two groups, however many
+URLs the batch has.
+
+Environment:
+    WEBSEARCH_SPILL_THRESHOLD: Batches with more URLs than this spill to disk
+        (default 500).
+    WEBSEARCH_SPILL_WINDOW: URLs crawled per window (default 100).
+    WEBSEARCH_SPILL_DIR: Directory for the temporary spill files (default:
+        the system temp directory).
+
+Example:
+    >>> with SpillStore() as store:
+    ...     store.append([(url, markdown), ...])
+    ...     raw, stats = await acondense(store, 100_000, join)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import sqlite3
+import tempfile
+import threading
+from collections.abc import Callable, Iterator
+
+from ._incremental import condense
+from ._llm import acompress_text
+
+__all__ = ["THRESHOLD", "WINDOW", "SpillStore", "acondense"]
+
+THRESHOLD: int = int(os.getenv("WEBSEARCH_SPILL_THRESHOLD", "500"))
+WINDOW: int = max(int(os.getenv("WEBSEARCH_SPILL_WINDOW", "100")), 1)
+_SPILL_DIR: str | None = os.getenv("WEBSEARCH_SPILL_DIR") or None
+
+# Pages are read back and compressed in groups of about this many characters.
+_GROUP_CHARS = 400_000
+# Rows fetched per query when reading pages back.
+_READ_BATCH = 64
+
+Join = Callable[[list[tuple[str, str]]], str]
+
+
+class SpillStore:
+    """Append-only ``(url, markdown)`` store in a temporary SQLite file.
+
+    The file is created on construction and deleted by :meth:`close` (or on
+    leaving the ``with`` block).  Methods are blocking and thread-safe;
+    async callers wrap them in :func:`asyncio.to_thread`.
+
+    Args:
+        directory: Where to create the file (default ``WEBSEARCH_SPILL_DIR``
+            or the system temp directory).
+    """
+
+    def __init__(self, directory: str | None = None) -> None:
+        fd, self.path = tempfile.mkstemp(
+            prefix="websearch-spill-", suffix=".sqlite3", dir=directory or _SPILL_DIR
+        )
+        os.close(fd)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        # Scratch data: no journal, no fsync.
+        self._conn.execute("PRAGMA journal_mode=OFF")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute(
+            "CREATE TABLE pages (seq INTEGER PRIMARY KEY, url TEXT NOT NULL, "
+            "markdown TEXT NOT NULL, chars INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE TABLE groups (seq INTEGER PRIMARY KEY, text TEXT NOT NULL)")
+        self.pages = 0
+        self.chars = 0
+
+    def append(self, pages: list[tuple[str, str]]) -> None:
+        """Write *pages* after the ones already stored."""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO pages (url, markdown, chars) VALUES (?, ?, ?)",
+                [(url, md, len(md)) for url, md in pages],
+            )
+            self._conn.commit()
+        self.pages += len(pages)
+        self.chars += sum(len(md) for _, md in pages)
+
+    def urls(self) -> list[str]:
+        """Stored URLs in order (the Markdown stays on disk)."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT url FROM pages ORDER BY seq")]
+
+    def iter_pages(self) -> Iterator[tuple[str, str]]:
+        """Yield the stored pages in order, reading a few rows at a time."""
+        last = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT seq, url, markdown FROM pages WHERE seq > ? ORDER BY seq LIMIT ?",
+                    (last, _READ_BATCH),
+                ).fetchall()
+            if not rows:
+                return
+            last = rows[-1][0]
+            for _, url, md in rows:
+                yield url, md
+
+    def iter_groups(self, max_chars: int) -> Iterator[list[tuple[str, str]]]:
+        """Yield consecutive pages in groups of about *max_chars* characters."""
+        group: list[tuple[str, str]] = []
+        size = 0
+        for url, md in self.iter_pages():
+            if group and size + len(md) > max_chars:
+                yield group
+                group, size = [], 0
+            group.append((url, md))
+            size += len(md)
+        if group:
+            yield group
+
+    def put_summary(self, index: int, text: str) -> None:
+        """Store the condensed text of group *index*."""
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO groups VALUES (?, ?)", (index, text))
+            self._conn.commit()
+
+    def iter_summaries(self) -> Iterator[str]:
+        """Yield the stored group summaries in order."""
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM groups").fetchone()[0]
+        for index in range(count):
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT text FROM groups WHERE seq = ?", (index,)
+                ).fetchone()
+            if row and row[0]:
+                yield row[0]
+
+    def close(self) -> None:
+        """Close and delete the spill file."""
+        with self._lock:
+            self._conn.close()
+        with contextlib.suppress(OSError):
+            os.unlink(self.path)
+
+    def __enter__(self) -> SpillStore:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+async def acondense(
+    store: SpillStore,
+    max_chars: int,
+    join: Join,
+    incremental: bool = False,
+    query: str | None = None,
+) -> tuple[str, dict[str, int]]:
+    """Fit the pages in *store* into *max_chars*, holding only a few groups in memory.
+
+    Args:
+        store: Spilled pages, in output order.
+        max_chars: Character budget for the whole document.
+        join: Joins ``(url, markdown)`` pairs into text (adds the source
+            headings); the output is this function applied group by group.
+        incremental: Condense groups with
+            :func:`~websearch_bot._incremental.condense` so unchanged pages
+            reuse their stored summaries.
+        query: Passed to :func:`~websearch_bot._llm.acompress_text` (not
+            used with *incremental*).
+
+    Returns:
+        The joined (and, over budget, compressed) text and frontmatter
+        counters: ``llm_calls``, plus ``pages_changed`` / ``pages_reused``
+        when *incremental*.
+    """
+    one, two = join([("", "")]), join([("", ""), ("", "")])
+    separator = two[len(one):len(two) - len(one)]
+    frames = len(join([(u, "") for u in await asyncio.to_thread(store.urls)]))
+    budget = max(max_chars - frames, 1)
+    total = store.chars or 1
+    over_budget = total > budget
+    stats: dict[str, int] = {"llm_calls": 0}
+    if incremental:
+        stats.update(pages_changed=0, pages_reused=0)
+
+    async def _one(index: int, group: list[tuple[str, str]]) -> None:
+        if incremental:
+            share = max(budget * sum(len(md) for _, md in group) // total, 1)
+            pages, counts = await condense(group, share)
+            for key, value in counts.items():
+                stats[key] += value
+            text = join(pages)
+        elif over_budget:
+            raw = join(group)
+            share = max(max_chars * len(raw) // (total + frames), 1)
+            text, calls, _ = await acompress_text(raw, share, query=query)
+            stats["llm_calls"] += calls
+        else:
+            text = join(group)
+        await asyncio.to_thread(store.put_summary, index, text)
+
+    # Backpressure: read the next group only once a slot is free.
+    in_flight: set[asyncio.Task] = set()
+    groups = store.iter_groups(_GROUP_CHARS)
+    index = 0
+    while True:
+        group = await asyncio.to_thread(next, groups, None)
+        if group is None:
+            break
+        if len(in_flight) >= 2:
+            done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+        in_flight.add(asyncio.create_task(_one(index, group)))
+        index += 1
+    if in_flight:
+        await asyncio.gather(*in_flight)
+
+    summaries = await asyncio.to_thread(lambda: list(store.iter_summaries()))
+    return separator.join(summaries), stats